@@ -1,14 +1,5 @@
-from typing import Generator
-from sqlalchemy.orm import Session
-from ..db.session import engine
+from ..db.session import get_db
 
-def get_db_session() -> Generator[Session, None, None]:
-    """
-    Dépendance pour obtenir une session de base de données.
-    La session est automatiquement fermée à la fin de la requête.
-    """
-    session = Session(engine)
-    try:
-        yield session
-    finally:
-        session.close() 
+# Dépendance des endpoints de app/api : même session factory (et même pool) que get_db.
+# Un alias plutôt qu'une fonction distincte, pour qu'un override de get_db s'applique aussi ici.
+get_db_session = get_db
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query 
 from sqlalchemy.orm import Session
 from sqlalchemy import inspect, text
+from typing import Optional
 import logging
-from ...db.session import engine
+from ...db.session import engine, get_pool_stats
 from ...db.models.base import Base
+from ...db.partitioning import apply_daily_stats_partitioning
 from ..dependencies import get_db_session
-from ...services.data_extraction import extract_and_load_datasets
-from ...db.session import get_db
+from ...services.data_extraction import extract_and_load_datasets, calculate_overall_stats
+from ...services.daily_rollup import rebuild_daily_rollup
+from ...services.cache import invalidate_stats_cache
+from ...services.etl_jobs import EtlJob, etl_jobs
 
 # Configurer le logger
 logger = logging.getLogger(__name__)
@@ -53,7 +57,9 @@ async def initialize_database(
         # Création des tables dans la base de données
         logger.info("Création des tables...")
         Base.metadata.create_all(bind=engine)
+        apply_daily_stats_partitioning(engine)
         logger.info("Tables créées avec succès")
+        invalidate_stats_cache()
         
         return {
             "success": True,
@@ -67,56 +73,129 @@ async def initialize_database(
             detail=f"Erreur lors de l'initialisation de la base de données: {str(e)}"
         )
 
-@router.get("/extract-data")
-async def extract_data():
+def run_etl_job(db: Session, job: EtlJob, reset: bool = False, workers: Optional[int] = None, incremental: bool = True):
+    """Corps d'un job ETL : suppression éventuelle des données puis extraction et chargement."""
+    # Suppression des données existantes si demandé
+    if reset:
+        logger.info("Suppression des données existantes...")
+        from ...db.repositories import epidemic_repository
+        job.check_cancelled()
+        # Supprimer toutes les épidémies existantes et leurs statistiques en une transaction
+        deleted = epidemic_repository.delete_epidemics(db)
+        logger.info(f"Données existantes supprimées avec succès ({deleted} épidémies)")
+        invalidate_stats_cache()
+
+    # Extraire et charger les données depuis Kaggle
+    logger.info("Extraction et chargement des données depuis Kaggle...")
+    # Après une suppression, tous les fichiers doivent être rechargés
+    result = extract_and_load_datasets(db, workers=workers, incremental=incremental and not reset, progress=job)
+    logger.info("Données chargées avec succès")
+    return result
+
+@router.get("/extract-data", status_code=202)
+def extract_data(
+    incremental: bool = Query(False, description="Si true, ignore les fichiers inchangés depuis le dernier chargement")
+):
     """
-    Endpoint pour extraire les données des sources externes.
+    Lance l'extraction des données des sources externes en tâche de fond.
+    Par défaut, tous les fichiers sont rechargés, comme avant le chargement incrémental.
+    Le suivi se fait via /admin/etl-jobs/{job_id}.
     """
-    try:
-        db = next(get_db())
-        try:
-            result = extract_and_load_datasets(db)
-            return {"status": "success", "message": "Data extraction completed", "details": result}
-        finally:
-            db.close()
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    params = {"incremental": incremental}
+    job = etl_jobs.submit(lambda db, job: run_etl_job(db, job, **params), params)
+    return {"status": "queued", "message": "Extraction des données lancée", "job_id": job.id}
 
-@router.post("/run-etl", response_model=dict)
-async def run_etl(
-    background_tasks: BackgroundTasks, 
+@router.post("/run-etl", response_model=dict, status_code=202)
+def run_etl(
     reset: bool = Query(False, description="Si true, supprime les données existantes avant d'en charger de nouvelles"),
-    db: Session = Depends(get_db_session)
+    workers: Optional[int] = Query(
+        None, ge=0, description="Workers de lecture/nettoyage des CSV (1 = séquentiel, 0 = un par cœur)"
+    ),
+    incremental: bool = Query(True, description="Si true, ignore les fichiers inchangés depuis le dernier chargement")
 ):
     """
-    Lance le processus ETL pour charger les données.
+    Lance le processus ETL en tâche de fond et retourne immédiatement l'identifiant du job.
     Si reset=true, supprime les données existantes avant d'en charger de nouvelles.
+    workers permet de paralléliser la lecture et le nettoyage des fichiers.
+    L'avancement par fichier est consultable via /admin/etl-jobs/{job_id}.
     """
-    try:
-        # Suppression des données existantes si demandé
-        if reset:
-            logger.info("Suppression des données existantes...")
-            from ...db.repositories import epidemic_repository
-            # Supprimer toutes les épidémies existantes
-            epidemics = epidemic_repository.get_epidemics(db, skip=0, limit=1000)
-            for epidemic in epidemics:
-                epidemic_repository.delete_epidemic(db, epidemic_id=epidemic.id)
-            logger.info("Données existantes supprimées avec succès")
+    params = {"reset": reset, "workers": workers, "incremental": incremental}
+    job = etl_jobs.submit(lambda db, job: run_etl_job(db, job, **params), params)
+    return {
+        "success": True,
+        "message": "Processus ETL lancé",
+        "reset": reset,
+        "job_id": job.id,
+        "status": job.status
+    }
 
-        # Extraire et charger les données depuis Kaggle
-        logger.info("Extraction et chargement des données depuis Kaggle...")
-        result = extract_and_load_datasets(db)
-        logger.info("Données chargées avec succès")
+@router.get("/etl-jobs", response_model=list)
+def list_etl_jobs():
+    """
+    Liste les jobs ETL en cours et récents, du plus récent au plus ancien.
+    """
+    return [job.to_dict() for job in etl_jobs.list()]
 
-        return {
-            "success": True,
-            "message": "Données chargées avec succès! Processus ETL complété.",
-            "reset": reset,
-            "details": result
-        }
+@router.get("/etl-jobs/{job_id}", response_model=dict)
+def get_etl_job(job_id: str):
+    """
+    État d'un job ETL : statut, lignes lues et chargées, débit par fichier.
+    """
+    job = etl_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job ETL non trouvé")
+    return job.to_dict()
+
+@router.post("/etl-jobs/{job_id}/cancel", response_model=dict)
+def cancel_etl_job(job_id: str):
+    """
+    Demande l'annulation d'un job ETL ; le chargement s'arrête au prochain chunk ou fichier.
+    """
+    job = etl_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job ETL non trouvé")
+    return job.to_dict()
+
+
+@router.post("/rebuild-overall-stats", response_model=dict)
+def rebuild_overall_stats(db: Session = Depends(get_db_session)):
+    """
+    Reconstruit entièrement les statistiques globales et les totaux dénormalisés des épidémies
+    à partir des statistiques quotidiennes. L'ETL les maintient lot par lot (sauf transmission_rate,
+    recalculé uniquement ici) ; cette action sert à les resynchroniser.
+    """
+    try:
+        calculate_overall_stats(db)
+        invalidate_stats_cache()
+        return {"success": True, "message": "Statistiques globales reconstruites"}
     except Exception as e:
-        logger.error(f"Erreur lors du chargement des données: {str(e)}")
+        logger.error(f"Erreur lors de la reconstruction des statistiques globales: {str(e)}")
         raise HTTPException(
             status_code=500,
-            detail=f"Erreur lors du chargement des données: {str(e)}"
+            detail=f"Erreur lors de la reconstruction des statistiques globales: {str(e)}"
         )
+
+@router.post("/rebuild-daily-rollup", response_model=dict)
+def rebuild_daily_rollup_table(db: Session = Depends(get_db_session)):
+    """
+    Reconstruit entièrement le cumul quotidien daily_global_rollup utilisé par le tableau de bord.
+    L'ETL le rafraîchit uniquement pour les dates modifiées.
+    """
+    try:
+        rebuild_daily_rollup(db)
+        invalidate_stats_cache()
+        return {"success": True, "message": "Cumul quotidien reconstruit"}
+    except Exception as e:
+        logger.error(f"Erreur lors de la reconstruction du cumul quotidien: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erreur lors de la reconstruction du cumul quotidien: {str(e)}"
+        )
+
+@router.get("/db-pool", response_model=dict)
+def get_db_pool_stats():
+    """
+    État des pools de connexions (taille, connexions prises, débordement) et
+    métriques de checkout : attente moyenne et maximale, timeouts.
+    """
+    return get_pool_stats()
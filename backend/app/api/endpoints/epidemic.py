@@ -13,6 +13,7 @@ from ..schemas import (
     Response
 )
 from ..dependencies import get_db_session
+from ...services.cache import invalidate_stats_cache
 
 router = APIRouter()
 
@@ -29,7 +30,9 @@ def create_epidemic(
     - end_date: End date of the epidemic
     - type: Type of the epidemic
     """
-    return epidemic_repository.create_epidemic(db=db, epidemic=epidemic)
+    db_epidemic = epidemic_repository.create_epidemic(db=db, epidemic=epidemic)
+    invalidate_stats_cache()
+    return db_epidemic
 
 @router.get("/", response_model=List[Epidemic])
 def read_epidemics(
@@ -72,29 +75,13 @@ def get_epidemic_stats(db: Session = Depends(get_db_session)):
     - average transmission rate
     - average mortality rate
     """
-    epidemics = epidemic_repository.get_epidemics(db, skip=0, limit=1000)
-    
-    total_epidemics = len(epidemics)
-    
-    if total_epidemics == 0:
-        return {
-            "totalPandemics": 0,
-            "activePandemics": 0,
-            "averageTransmissionRate": 0,
-            "averageMortalityRate": 0
-        }
-    
-    active_epidemics = sum(1 for e in epidemics if e.end_date is None)
-    
-    # Calcul des moyennes
-    avg_transmission = sum(e.transmission_rate for e in epidemics) / total_epidemics
-    avg_mortality = sum(e.mortality_rate for e in epidemics) / total_epidemics
+    aggregates = epidemic_repository.get_epidemic_aggregates(db)
     
     return {
-        "totalPandemics": total_epidemics,
-        "activePandemics": active_epidemics,
-        "averageTransmissionRate": avg_transmission,
-        "averageMortalityRate": avg_mortality
+        "totalPandemics": aggregates["total"],
+        "activePandemics": aggregates["active"],
+        "averageTransmissionRate": aggregates["average_transmission_rate"],
+        "averageMortalityRate": aggregates["average_mortality_rate"]
     }
 
 @router.get("/filters", response_model=dict)
@@ -202,6 +189,7 @@ def update_epidemic(
     db_epidemic = epidemic_repository.update_epidemic(db, epidemic_id=epidemic_id, epidemic=epidemic)
     if db_epidemic is None:
         raise HTTPException(status_code=404, detail="Epidemic not found")
+    invalidate_stats_cache()
     return db_epidemic
 
 @router.delete("/{epidemic_id}", response_model=Response)
@@ -212,4 +200,5 @@ def delete_epidemic(epidemic_id: int, db: Session = Depends(get_db_session)):
     success = epidemic_repository.delete_epidemic(db, epidemic_id=epidemic_id)
     if not success:
         raise HTTPException(status_code=404, detail="Epidemic not found")
+    invalidate_stats_cache()
     return {"status": "success", "message": "Epidemic deleted successfully"} 
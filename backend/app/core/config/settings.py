@@ -1,6 +1,13 @@
 from pydantic_settings import BaseSettings
 import os
 
+# Pilote synchrone -> pilote asynchrone équivalent
+ASYNC_DRIVERS = {
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "mysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://"
+}
+
 class Settings(BaseSettings):
     # API Configuration
     API_V1_STR: str = "/api/v1"
@@ -10,12 +17,20 @@ class Settings(BaseSettings):
 
     # Database Configuration
     DATABASE_URL: str | None = None
+    ASYNC_DATABASE_URL: str | None = None  # par défaut, dérivée de DATABASE_URL
     DB_USER: str = os.getenv("DB_USER", "user")
     DB_PASSWORD: str = os.getenv("DB_PASSWORD", "password")
     DB_HOST: str = os.getenv("DB_HOST", "mysql_db")
     DB_PORT: str = os.getenv("DB_PORT", "3306")
     DB_NAME: str = os.getenv("DB_NAME", "pandemics_db")
 
+    # Pool de connexions (moteurs synchrone et asynchrone)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))  # secondes d'attente max d'une connexion
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
     # CORS
     BACKEND_CORS_ORIGINS: list = ["*"]
 
@@ -30,6 +45,44 @@ class Settings(BaseSettings):
     ENABLE_DATAVIZ: bool = os.getenv("ENABLE_DATAVIZ", "false").lower() == "true"
     # ---------------------------------------
 
+    # ETL
+    ETL_BATCH_SIZE: int = int(os.getenv("ETL_BATCH_SIZE", "1000"))
+    ETL_BATCH_MAX_RETRIES: int = int(os.getenv("ETL_BATCH_MAX_RETRIES", "3"))
+    ETL_CHUNK_SIZE: int = int(os.getenv("ETL_CHUNK_SIZE", "100000"))  # 0 = lecture du fichier en une fois
+    ETL_INCREMENTAL: bool = os.getenv("ETL_INCREMENTAL", "true").lower() == "true"
+    ETL_WORKERS: int = int(os.getenv("ETL_WORKERS", "1"))  # 1 = séquentiel, 0 = un worker par cœur
+    ETL_PARALLEL_QUEUE_CHUNKS: int = int(os.getenv("ETL_PARALLEL_QUEUE_CHUNKS", "4"))  # chunks nettoyés en attente d'écriture
+    ETL_JOB_WORKERS: int = int(os.getenv("ETL_JOB_WORKERS", "1"))  # jobs ETL exécutés simultanément
+    ETL_JOB_HISTORY: int = int(os.getenv("ETL_JOB_HISTORY", "20"))  # jobs terminés conservés pour /admin/etl-jobs
+    ETL_PROFILE_DIR: str | None = os.getenv("ETL_PROFILE_DIR")  # dossier des profils JSON des runs (désactivé si vide)
+    ETL_CPROFILE_FILE: str | None = os.getenv("ETL_CPROFILE_FILE")  # nom d'un CSV à profiler avec cProfile
+
+    # Cache des statistiques du tableau de bord
+    STATS_CACHE_TTL: float = float(os.getenv("STATS_CACHE_TTL", "60"))  # secondes, 0 = désactivé
+    STATS_CACHE_MAX_ENTRIES: int = int(os.getenv("STATS_CACHE_MAX_ENTRIES", "128"))
+    # Requêtes d'agrégat du tableau de bord exécutées en parallèle : délai par requête avant repli
+    DASHBOARD_QUERY_TIMEOUT: float = float(os.getenv("DASHBOARD_QUERY_TIMEOUT", "10"))  # secondes, 0 = sans limite
+
+    # Métriques par route exposées sur /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # GET /daily-stats
+    DAILY_STATS_PAGE_SIZE: int = int(os.getenv("DAILY_STATS_PAGE_SIZE", "1000"))
+    DAILY_STATS_MAX_PAGE_SIZE: int = int(os.getenv("DAILY_STATS_MAX_PAGE_SIZE", "10000"))
+    DAILY_STATS_STREAM_CHUNK_SIZE: int = int(os.getenv("DAILY_STATS_STREAM_CHUNK_SIZE", "5000"))
+
+    # Clé primaire de daily_stats : surrogate (id) ou natural (id_epidemic, id_loc, date, MySQL uniquement)
+    DAILY_STATS_PRIMARY_KEY: str = os.getenv("DAILY_STATS_PRIMARY_KEY", "surrogate")
+
+    # Partitionnement de daily_stats (MySQL) : none, date (RANGE par mois) ou source (LIST par source)
+    DAILY_STATS_PARTITIONING: str = os.getenv("DAILY_STATS_PARTITIONING", "none")
+    DAILY_STATS_PARTITION_START: str = os.getenv("DAILY_STATS_PARTITION_START", "2020-01-01")  # première partition mensuelle
+    DAILY_STATS_PARTITION_MONTHS_AHEAD: int = int(os.getenv("DAILY_STATS_PARTITION_MONTHS_AHEAD", "12"))
+
+    # Export Parquet / Arrow de daily_stats
+    EXPORT_ROW_GROUP_SIZE: int = int(os.getenv("EXPORT_ROW_GROUP_SIZE", "100000"))
+    EXPORT_PARQUET_COMPRESSION: str = os.getenv("EXPORT_PARQUET_COMPRESSION", "zstd")
+
     @property
     def SQLALCHEMY_DATABASE_URL(self) -> str:
         """Construit l'URL finale pour SQLAlchemy."""
@@ -37,6 +90,17 @@ class Settings(BaseSettings):
             return self.DATABASE_URL
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URL(self) -> str:
+        """URL équivalente avec un pilote asynchrone (aiomysql, aiosqlite)."""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+        url = self.SQLALCHEMY_DATABASE_URL
+        for prefix, async_prefix in ASYNC_DRIVERS.items():
+            if url.startswith(prefix):
+                return async_prefix + url[len(prefix):]
+        return url
+
     class Config:
         case_sensitive = True
 
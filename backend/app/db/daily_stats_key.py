@@ -0,0 +1,113 @@
+"""
+Conversion d'une table daily_stats existante entre les deux clés primaires de
+DAILY_STATS_PRIMARY_KEY (MySQL uniquement) :
+
+- surrogate : PRIMARY KEY (id), index unique idx_unique_daily (id_epidemic, id_loc, date) ;
+- natural   : PRIMARY KEY (id_epidemic, id_loc, date), id reste AUTO_INCREMENT et indexé.
+
+La conversion tient en un seul ALTER TABLE : InnoDB recopie la table dans l'ordre de la nouvelle
+clé, les lignes existantes sont conservées et idx_unique_daily garantit l'absence de doublons.
+Elle tient compte du partitionnement DAILY_STATS_PARTITIONING : chaque clé unique doit
+contenir la colonne de partitionnement (id_source en mode source).
+"""
+import logging
+from typing import List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from ..core.config.settings import settings
+from .partitioning import TABLE, current_partitioning
+
+logger = logging.getLogger(__name__)
+
+KEY_LAYOUTS = ("surrogate", "natural")
+NATURAL_KEY = ["id_epidemic", "id_loc", "date"]
+
+def key_layout(bind: Connection) -> Optional[str]:
+    """Clé primaire effective de daily_stats ("surrogate", "natural") ou None sans table."""
+    primary_key = inspect(bind).get_pk_constraint(TABLE)["constrained_columns"]
+    if not primary_key:
+        return None
+    return "surrogate" if primary_key[0] == "id" else "natural"
+
+def key_migration_statement(target: str, partitioning: Optional[str] = None) -> str:
+    """ALTER TABLE qui convertit daily_stats vers la clé primaire target."""
+    source_key = ["id_source"] if partitioning == "source" else []
+    if target == "natural":
+        changes = [
+            "DROP PRIMARY KEY",
+            f"ADD PRIMARY KEY ({', '.join(NATURAL_KEY + source_key)})",
+            # AUTO_INCREMENT exige un index dont id est la première colonne
+            "ADD INDEX idx_daily_id (id)",
+            "DROP INDEX idx_unique_daily",
+            "DROP INDEX idx_daily_epidemic",
+            "DROP INDEX idx_daily_date",
+            "ADD INDEX idx_daily_date_cover (date, id_epidemic, new_cases, new_deaths, active)"
+        ]
+    elif target == "surrogate":
+        partition_key = {"date": ["date"], "source": ["id_source"]}.get(partitioning, [])
+        changes = [
+            "DROP PRIMARY KEY",
+            f"ADD PRIMARY KEY ({', '.join(['id'] + partition_key)})",
+            f"ADD UNIQUE INDEX idx_unique_daily ({', '.join(NATURAL_KEY + source_key)})",
+            "ADD INDEX idx_daily_epidemic (id_epidemic)",
+            "ADD INDEX idx_daily_date (date)",
+            "DROP INDEX idx_daily_date_cover",
+            "DROP INDEX idx_daily_id"
+        ]
+    else:
+        raise ValueError(f"DAILY_STATS_PRIMARY_KEY doit valoir {', '.join(KEY_LAYOUTS)} : {target}")
+    return f"ALTER TABLE {TABLE} " + ", ".join(changes)
+
+def migrate_daily_stats_key(engine: Engine, target: Optional[str] = None) -> bool:
+    """
+    Convertit daily_stats vers la clé primaire target (DAILY_STATS_PRIMARY_KEY par défaut).
+    Retourne True si la table a été modifiée.
+    """
+    target = (target or settings.DAILY_STATS_PRIMARY_KEY).lower()
+    if target not in KEY_LAYOUTS:
+        raise ValueError(f"DAILY_STATS_PRIMARY_KEY doit valoir {', '.join(KEY_LAYOUTS)} : {target}")
+    if engine.dialect.name != "mysql":
+        logger.info(f"Conversion de la clé primaire de {TABLE} ignorée : disponible uniquement avec MySQL")
+        return False
+
+    with engine.begin() as conn:
+        current = key_layout(conn)
+        if current is None or current == target:
+            return False
+        logger.info(f"Conversion de la clé primaire de {TABLE} : {current} -> {target} (la table est recopiée)...")
+        conn.execute(text(key_migration_statement(target, current_partitioning(conn))))
+    logger.info(f"Clé primaire de {TABLE} convertie en {target}")
+    return True
+
+def validate_daily_stats_key(engine: Engine) -> None:
+    """
+    Refuse de démarrer avec un DAILY_STATS_PRIMARY_KEY inconnu ou avec la clé naturelle hors
+    MySQL : id n'y serait pas auto-incrémenté (l'ALTER after_create ne s'exécute que sur MySQL)
+    et toute insertion dans daily_stats échouerait.
+    """
+    target = settings.DAILY_STATS_PRIMARY_KEY.lower()
+    if target not in KEY_LAYOUTS:
+        raise RuntimeError(f"DAILY_STATS_PRIMARY_KEY doit valoir {', '.join(KEY_LAYOUTS)} : {target}")
+    if target == "natural" and engine.dialect.name != "mysql":
+        raise RuntimeError(
+            f"DAILY_STATS_PRIMARY_KEY=natural nécessite MySQL (base {engine.dialect.name}) : "
+            f"utiliser DAILY_STATS_PRIMARY_KEY=surrogate"
+        )
+
+def check_daily_stats_key(engine: Engine) -> List[str]:
+    """Avertissements si la table existante ne correspond pas à DAILY_STATS_PRIMARY_KEY."""
+    target = settings.DAILY_STATS_PRIMARY_KEY.lower()
+    warnings = []
+    if engine.dialect.name == "mysql":
+        with engine.connect() as conn:
+            current = key_layout(conn)
+        if current is not None and current != target:
+            warnings.append(
+                f"La clé primaire de {TABLE} est {current} alors que DAILY_STATS_PRIMARY_KEY={target} : "
+                f"lancer python -m app.db.scripts.migrate_daily_stats_key"
+            )
+    for warning in warnings:
+        logger.warning(warning)
+    return warnings
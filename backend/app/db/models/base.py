@@ -1,9 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Float, ForeignKey, Index
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, DateTime, Float, ForeignKey, Index, DDL, FetchedValue, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 
+from ...core.config.settings import settings
+
 Base = declarative_base()
 
+# Clé primaire de daily_stats (DAILY_STATS_PRIMARY_KEY) :
+# - "surrogate" : id auto-incrémenté, la clé naturelle est l'index unique idx_unique_daily ;
+# - "natural"   : (id_epidemic, id_loc, date), clé ordonnée d'InnoDB. Les lignes d'une série
+#   temporelle sont contiguës et se lisent sans repasser par la clé primaire ; id reste
+#   auto-incrémenté et indexé pour GET /daily-stats et PUT /daily-stats/{id} (MySQL uniquement).
+# Conversion d'une table existante : python -m app.db.scripts.migrate_daily_stats_key
+DAILY_STATS_NATURAL_KEY = settings.DAILY_STATS_PRIMARY_KEY == "natural"
+
 class Epidemic(Base):
     __tablename__ = "epidemic"
     
@@ -22,6 +32,15 @@ class Epidemic(Base):
     
     daily_stats = relationship("DailyStats", back_populates="epidemic")
     overall_stats = relationship("OverallStats", back_populates="epidemic")
+    daily_rollup = relationship("DailyGlobalRollup", back_populates="epidemic")
+    
+    # Index (tri, id) pour la pagination par curseur de GET /epidemics
+    __table_args__ = (
+        Index('idx_epidemic_name', name, id),
+        Index('idx_epidemic_total_cases', total_cases, id),
+        Index('idx_epidemic_total_deaths', total_deaths, id),
+        Index('idx_epidemic_start_date', start_date, id)
+    )
 
 class Localisation(Base):
     __tablename__ = "localisation"
@@ -42,17 +61,38 @@ class DataSource(Base):
     url = Column(String(500), nullable=False)
     
     daily_stats = relationship("DailyStats", back_populates="source")
+    files = relationship("DataSourceFile", back_populates="source")
     
     __table_args__ = (Index('idx_source_type', source_type),)
 
+class DataSourceFile(Base):
+    __tablename__ = "data_source_file"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    id_source = Column(Integer, ForeignKey('data_source.id', ondelete='CASCADE', name='fk_data_source_file_source'), nullable=False)
+    file_name = Column(String(255), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+    content_hash = Column(String(64), nullable=False)
+    row_count = Column(Integer, default=0)
+    last_date = Column(Date)
+    loaded_at = Column(DateTime)
+    
+    source = relationship("DataSource", back_populates="files")
+    
+    __table_args__ = (Index('idx_unique_source_file', id_source, file_name, unique=True),)
+
 class DailyStats(Base):
     __tablename__ = "daily_stats"
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    id_epidemic = Column(Integer, ForeignKey('epidemic.id', ondelete='CASCADE', name='fk_daily_stats_epidemic'), nullable=False)
+    if DAILY_STATS_NATURAL_KEY:
+        id = Column(Integer, nullable=False, server_default=FetchedValue())
+    else:
+        id = Column(Integer, primary_key=True, autoincrement=True)
+    id_epidemic = Column(Integer, ForeignKey('epidemic.id', ondelete='CASCADE', name='fk_daily_stats_epidemic'), nullable=False, primary_key=DAILY_STATS_NATURAL_KEY)
     id_source = Column(Integer, ForeignKey('data_source.id', ondelete='CASCADE', name='fk_daily_stats_source'), nullable=False)
-    id_loc = Column(Integer, ForeignKey('localisation.id', ondelete='CASCADE', name='fk_daily_stats_loc'), nullable=False)
-    date = Column(Date, nullable=False)
+    id_loc = Column(Integer, ForeignKey('localisation.id', ondelete='CASCADE', name='fk_daily_stats_loc'), nullable=False, primary_key=DAILY_STATS_NATURAL_KEY)
+    date = Column(Date, nullable=False, primary_key=DAILY_STATS_NATURAL_KEY)
     cases = Column(Integer, default=0)
     active = Column(Integer, default=0)
     deaths = Column(Integer, default=0)
@@ -65,12 +105,28 @@ class DailyStats(Base):
     source = relationship("DataSource", back_populates="daily_stats")
     location = relationship("Localisation", back_populates="daily_stats")
     
-    __table_args__ = (
-        Index('idx_unique_daily', id_epidemic, id_loc, date, unique=True),
-        Index('idx_daily_epidemic', id_epidemic),
-        Index('idx_daily_loc', id_loc),
-        Index('idx_daily_date', date)
-    )
+    if DAILY_STATS_NATURAL_KEY:
+        # Les index secondaires d'InnoDB contiennent la clé primaire : idx_daily_date_cover
+        # couvre les lectures par date (dernière date, cumul quotidien) sans accès à la table
+        __table_args__ = (
+            Index('idx_daily_id', id),
+            Index('idx_daily_loc', id_loc),
+            Index('idx_daily_date_cover', date, id_epidemic, new_cases, new_deaths, active)
+        )
+    else:
+        __table_args__ = (
+            Index('idx_unique_daily', id_epidemic, id_loc, date, unique=True),
+            Index('idx_daily_epidemic', id_epidemic),
+            Index('idx_daily_loc', id_loc),
+            Index('idx_daily_date', date)
+        )
+
+
+if DAILY_STATS_NATURAL_KEY:
+    # create_all n'émet AUTO_INCREMENT que pour une clé primaire entière à une colonne
+    event.listen(DailyStats.__table__, "after_create", DDL(
+        "ALTER TABLE daily_stats MODIFY id INTEGER NOT NULL AUTO_INCREMENT"
+    ).execute_if(dialect="mysql"))
 
 class OverallStats(Base):
     __tablename__ = "overall_stats"
@@ -83,5 +139,22 @@ class OverallStats(Base):
     
     epidemic = relationship("Epidemic", back_populates="overall_stats")
     
-    __table_args__ = (Index('idx_overall_epidemic', id_epidemic),) 
-    
\ No newline at end of file
+    __table_args__ = (Index('idx_overall_epidemic', id_epidemic),)
+
+class DailyGlobalRollup(Base):
+    """Agrégat quotidien par épidémie (toutes localisations), rafraîchi par l'ETL."""
+    __tablename__ = "daily_global_rollup"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    id_epidemic = Column(Integer, ForeignKey('epidemic.id', ondelete='CASCADE', name='fk_daily_rollup_epidemic'), nullable=False)
+    date = Column(Date, nullable=False)
+    new_cases = Column(BigInteger, default=0)
+    new_deaths = Column(BigInteger, default=0)
+    active = Column(BigInteger, default=0)
+    
+    epidemic = relationship("Epidemic", back_populates="daily_rollup")
+    
+    __table_args__ = (
+        Index('idx_unique_daily_rollup', id_epidemic, date, unique=True),
+        Index('idx_daily_rollup_date', date)
+    )
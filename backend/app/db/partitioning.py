@@ -0,0 +1,240 @@
+"""
+Partitionnement optionnel de daily_stats (MySQL uniquement), choisi par DAILY_STATS_PARTITIONING :
+
+- date   : RANGE COLUMNS(date), une partition par mois. Les requêtes filtrées sur une plage de
+           dates ne lisent que les partitions concernées (partition pruning).
+- source : LIST(id_source), une partition par source de données. La réinitialisation d'une
+           source devient un TRUNCATE PARTITION (opération de métadonnées) au lieu d'un DELETE.
+           Chaque source doit être créée par data_source_repository.create_data_source, qui
+           ajoute sa partition.
+
+MySQL impose que chaque clé unique contienne les colonnes de partitionnement et refuse les clés
+étrangères sur une table partitionnée :
+
+- la clé primaire devient (id, date) ou (id, id_source) (la clé naturelle de
+  DAILY_STATS_PRIMARY_KEY=natural contient déjà date, id_source lui est ajouté en mode source) ;
+- en mode source, idx_unique_daily inclut id_source : l'upsert ne fusionne plus que les lignes
+  d'une même source, et deux sources qui alimentent le même couple (épidémie, localisation, date)
+  produisent deux lignes (l'ETL associe une épidémie à chaque source, ce cas ne s'y présente pas) ;
+- les clés étrangères de daily_stats sont supprimées : la suppression d'une épidémie retire
+  explicitement ses statistiques (epidemic_repository.delete_epidemics, utilisée aussi par
+  DELETE /epidemics/{id}). Localisations et sources ne sont supprimées par aucun chemin de
+  l'application.
+
+La conversion d'une table existante la recopie.
+"""
+import logging
+from datetime import date
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..core.config.settings import settings
+from .models.base import DailyStats
+
+logger = logging.getLogger(__name__)
+
+PARTITIONING_MODES = ("none", "date", "source")
+TABLE = DailyStats.__tablename__
+PAST_PARTITION = "p_past"
+FUTURE_PARTITION = "p_future"
+
+# PARTITION_METHOD de information_schema.PARTITIONS pour chaque mode
+_METHODS = {"RANGE COLUMNS": "date", "LIST": "source"}
+
+Executor = Union[Session, Connection]
+
+def _dialect_name(bind: Executor) -> str:
+    dialect = getattr(bind, "dialect", None) or bind.get_bind().dialect
+    return dialect.name
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def source_partition_name(source_id: int) -> str:
+    return f"p_src_{int(source_id)}"
+
+def month_partitions(start: date, until: date) -> List[str]:
+    """Une partition par mois, du mois de start au mois de until inclus."""
+    partitions = []
+    month = start.replace(day=1)
+    while month <= until:
+        following = _next_month(month)
+        partitions.append(f"PARTITION p{month:%Y%m} VALUES LESS THAN ('{following:%Y-%m-%d}')")
+        month = following
+    return partitions
+
+def date_partition_clause(start: date, until: date) -> str:
+    partitions = [
+        f"PARTITION {PAST_PARTITION} VALUES LESS THAN ('{start.replace(day=1):%Y-%m-%d}')",
+        *month_partitions(start, until),
+        f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)"
+    ]
+    return "PARTITION BY RANGE COLUMNS(date) (\n    " + ",\n    ".join(partitions) + "\n)"
+
+def source_partition_clause(source_ids: Iterable[int]) -> str:
+    # LIST exige au moins une partition : p_src_0 tient lieu de partition vide sans source
+    partitions = [
+        f"PARTITION {source_partition_name(source_id)} VALUES IN ({int(source_id)})"
+        for source_id in sorted(set(source_ids)) or [0]
+    ]
+    return "PARTITION BY LIST(id_source) (\n    " + ",\n    ".join(partitions) + "\n)"
+
+def daily_key_includes_source(bind: Executor) -> bool:
+    """
+    Vrai si la clé unique de daily_stats contient id_source (mode source, MySQL) : l'upsert
+    ne fusionne alors que les lignes d'une même source.
+    """
+    return settings.DAILY_STATS_PARTITIONING.lower() == "source" and _dialect_name(bind) == "mysql"
+
+def partitioning_statements(
+    mode: str,
+    foreign_keys: Iterable[str],
+    source_ids: Iterable[int] = (),
+    start: Optional[date] = None,
+    until: Optional[date] = None,
+    natural_key: bool = False
+) -> List[str]:
+    """
+    Instructions DDL qui convertissent daily_stats (non partitionnée) au mode demandé.
+    natural_key : la clé primaire est (id_epidemic, id_loc, date) (DAILY_STATS_PRIMARY_KEY=natural).
+    """
+    statements = [f"ALTER TABLE {TABLE} DROP FOREIGN KEY {name}" for name in foreign_keys]
+    if mode == "date":
+        # La clé naturelle contient déjà date
+        if not natural_key:
+            statements.append(f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, date)")
+        statements.append(f"ALTER TABLE {TABLE} {date_partition_clause(start, until)}")
+    elif mode == "source":
+        if natural_key:
+            statements.append(
+                f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id_epidemic, id_loc, date, id_source)"
+            )
+        else:
+            statements.append(
+                f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, id_source), "
+                f"DROP INDEX idx_unique_daily, ADD UNIQUE INDEX idx_unique_daily (id_epidemic, id_loc, date, id_source)"
+            )
+        statements.append(f"ALTER TABLE {TABLE} {source_partition_clause(source_ids)}")
+    else:
+        raise ValueError(f"Mode de partitionnement inconnu : {mode}")
+    return statements
+
+def extend_date_partitions_statement(partition_names: Iterable[str], until: date) -> Optional[str]:
+    """
+    REORGANIZE de p_future qui ajoute les partitions mensuelles manquantes jusqu'au mois de until ;
+    None si elles existent déjà.
+    """
+    months = [name[1:] for name in partition_names if name[1:].isdigit()]
+    if not months:
+        return None
+    last = max(months)
+    following = _next_month(date(int(last[:4]), int(last[4:]), 1))
+    partitions = month_partitions(following, until)
+    if not partitions:
+        return None
+    partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return f"ALTER TABLE {TABLE} REORGANIZE PARTITION {FUTURE_PARTITION} INTO (\n    " + ",\n    ".join(partitions) + "\n)"
+
+def partition_names(bind: Executor) -> List[str]:
+    if _dialect_name(bind) != "mysql":
+        return []
+    rows = bind.execute(text(
+        "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL "
+        "ORDER BY PARTITION_ORDINAL_POSITION"
+    ), {"table": TABLE})
+    return [row[0] for row in rows]
+
+def current_partitioning(bind: Executor) -> Optional[str]:
+    """Mode de partitionnement effectif de daily_stats ("date", "source") ou None."""
+    if _dialect_name(bind) != "mysql":
+        return None
+    method = bind.execute(text(
+        "SELECT PARTITION_METHOD FROM information_schema.PARTITIONS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL LIMIT 1"
+    ), {"table": TABLE}).scalar()
+    return _METHODS.get(method)
+
+def apply_daily_stats_partitioning(
+    engine: Engine, mode: Optional[str] = None, today: Optional[date] = None
+) -> Optional[str]:
+    """
+    Applique DAILY_STATS_PARTITIONING à daily_stats au démarrage ; en mode date, ajoute les
+    partitions mensuelles des DAILY_STATS_PARTITION_MONTHS_AHEAD prochains mois.
+    Sans effet hors MySQL. Retourne le mode effectif.
+    """
+    mode = (mode or settings.DAILY_STATS_PARTITIONING).lower()
+    if mode not in PARTITIONING_MODES:
+        raise ValueError(f"DAILY_STATS_PARTITIONING doit valoir {', '.join(PARTITIONING_MODES)} : {mode}")
+    if mode == "none":
+        return None
+    if engine.dialect.name != "mysql":
+        logger.info(f"Partitionnement de {TABLE} ignoré : disponible uniquement avec MySQL")
+        return None
+
+    until = _add_months(today or date.today(), settings.DAILY_STATS_PARTITION_MONTHS_AHEAD)
+    with engine.begin() as conn:
+        current = current_partitioning(conn)
+        if current is None:
+            logger.info(f"Partitionnement de {TABLE} en mode {mode} (la table est recopiée)...")
+            inspector = inspect(conn)
+            foreign_keys = [fk["name"] for fk in inspector.get_foreign_keys(TABLE) if fk.get("name")]
+            natural_key = inspector.get_pk_constraint(TABLE)["constrained_columns"][:1] != ["id"]
+            source_ids = conn.execute(text("SELECT id FROM data_source")).scalars().all()
+            start = date.fromisoformat(settings.DAILY_STATS_PARTITION_START)
+            for statement in partitioning_statements(mode, foreign_keys, source_ids, start, until, natural_key):
+                conn.execute(text(statement))
+            logger.info(f"{TABLE} partitionnée en mode {mode}")
+            return mode
+        if current != mode:
+            logger.warning(
+                f"{TABLE} est déjà partitionnée en mode {current} : passage au mode {mode} ignoré "
+                f"(ALTER TABLE {TABLE} REMOVE PARTITIONING pour repartir d'une table non partitionnée)"
+            )
+        elif mode == "date":
+            statement = extend_date_partitions_statement(partition_names(conn), until)
+            if statement:
+                conn.execute(text(statement))
+                logger.info(f"Partitions mensuelles de {TABLE} ajoutées jusqu'au {until}")
+    return current
+
+def ensure_source_partition(db: Session, source_id: int) -> bool:
+    """
+    Ajoute la partition d'une nouvelle source en mode source : sans elle, MySQL refuse
+    l'insertion des lignes de la source. Retourne True si la partition a été créée.
+    """
+    if current_partitioning(db) != "source":
+        return False
+    name = source_partition_name(source_id)
+    if name in partition_names(db):
+        return False
+    db.execute(text(f"ALTER TABLE {TABLE} ADD PARTITION (PARTITION {name} VALUES IN ({int(source_id)}))"))
+    db.commit()
+    logger.info(f"Partition {name} ajoutée à {TABLE}")
+    return True
+
+def truncate_source_partition(db: Session, epidemic_id: int, source_id: int) -> bool:
+    """
+    Vide la partition de la source par TRUNCATE PARTITION si elle ne contient que des lignes
+    de l'épidémie. Retourne False si la suppression doit passer par un DELETE classique.
+    Le TRUNCATE valide implicitement la transaction en cours.
+    """
+    if current_partitioning(db) != "source":
+        return False
+    name = source_partition_name(source_id)
+    other_epidemic = db.execute(
+        text(f"SELECT 1 FROM {TABLE} PARTITION ({name}) WHERE id_epidemic <> :epidemic_id LIMIT 1"),
+        {"epidemic_id": epidemic_id}
+    ).first()
+    if other_epidemic:
+        return False
+    db.execute(text(f"ALTER TABLE {TABLE} TRUNCATE PARTITION {name}"))
+    logger.info(f"Partition {name} de {TABLE} vidée par TRUNCATE PARTITION")
+    return True
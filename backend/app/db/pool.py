@@ -0,0 +1,76 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+class PoolMetrics:
+    """
+    Compteurs d'un pool de connexions : nombre de checkouts, temps d'attente
+    pour obtenir une connexion et nombre de dépassements de DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_total": round(self.wait_total, 6),
+                "wait_avg": round(self.wait_total / attempts, 6) if attempts else 0.0,
+                "wait_max": round(self.wait_max, 6)
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "timeout": pool.timeout()
+            })
+        return data
+
+class _InstrumentedPoolMixin:
+    """Mesure l'attente de chaque checkout ; metrics est fixé par instrumented_pool_class."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            logger.warning(f"Pool {self.metrics.name} saturé : {self.status()}")
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+def instrumented_pool_class(metrics: PoolMetrics, is_async: bool = False) -> type:
+    """
+    Classe de pool propre à un moteur et liée à ses métriques ; les pools recréés
+    par engine.dispose() réutilisent la même classe, donc les mêmes compteurs.
+    """
+    base = AsyncAdaptedQueuePool if is_async else QueuePool
+    return type(f"Instrumented{base.__name__}", (_InstrumentedPoolMixin, base), {"metrics": metrics})
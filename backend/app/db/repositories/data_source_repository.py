@@ -0,0 +1,25 @@
+from sqlalchemy.orm import Session
+from typing import Dict, Any
+import logging
+
+from ..models.base import DataSource
+from ..partitioning import ensure_source_partition
+
+logger = logging.getLogger(__name__)
+
+def create_data_source(db: Session, data_source_data: Dict[str, Any]) -> DataSource:
+    """
+    Crée une source de données et, en mode DAILY_STATS_PARTITIONING=source, sa partition
+    de daily_stats : toute création de source doit passer par ici.
+    """
+    try:
+        data_source = DataSource(**data_source_data)
+        db.add(data_source)
+        db.commit()
+        db.refresh(data_source)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur lors de la création de la source de données: {str(e)}")
+        raise
+    ensure_source_partition(db, data_source.id)
+    return data_source
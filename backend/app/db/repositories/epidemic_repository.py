@@ -1,9 +1,9 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
-from sqlalchemy import desc, func
+from sqlalchemy import case, delete, desc, func, select
 import logging
 
-from ..models.base import Epidemic, DailyStats, Localisation, OverallStats
+from ..models.base import DailyGlobalRollup, DataSourceFile, Epidemic, DailyStats, Localisation, OverallStats
 from ...api.schemas import (
     EpidemicCreate,
     EpidemicUpdate
@@ -25,6 +25,14 @@ def get_epidemic(db: Session, epidemic_id: int) -> Optional[Epidemic]:
         logger.error(f"Erreur lors de la récupération de l'épidémie {epidemic_id}: {str(e)}")
         raise
 
+def _filter_criteria(filters: Optional[Dict[str, Any]]) -> list:
+    """Critères d'égalité sur les colonnes d'Epidemic ; les clés inconnues et les valeurs None sont ignorées."""
+    return [
+        getattr(Epidemic, key) == value
+        for key, value in (filters or {}).items()
+        if hasattr(Epidemic, key) and value is not None
+    ]
+
 def get_epidemics(
     db: Session,
     skip: int = 0,
@@ -35,14 +43,7 @@ def get_epidemics(
     Récupère la liste des épidémies avec pagination et filtres optionnels.
     """
     try:
-        query = db.query(Epidemic)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(Epidemic, key) and value is not None:
-                    query = query.filter(getattr(Epidemic, key) == value)
-        
-        return query.offset(skip).limit(limit).all()
+        return db.query(Epidemic).filter(*_filter_criteria(filters)).offset(skip).limit(limit).all()
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des épidémies: {str(e)}")
         raise
@@ -66,17 +67,7 @@ def update_epidemic(
         raise
 
 def delete_epidemic(db: Session, epidemic_id: int) -> bool:
-    try:
-        db_epidemic = db.query(Epidemic).filter(Epidemic.id == epidemic_id).first()
-        if db_epidemic:
-            db.delete(db_epidemic)
-            db.commit()
-            return True
-        return False
-    except Exception as e:
-        db.rollback()
-        logger.error(f"Erreur lors de la suppression de l'épidémie {epidemic_id}: {str(e)}")
-        raise
+    return delete_epidemics(db, {"id": epidemic_id}) > 0
 
 def get_epidemic_daily_stats(db: Session, epidemic_id: int) -> List[DailyStats]:
     """
@@ -131,37 +122,119 @@ def count_epidemics(db: Session) -> int:
     """
     return db.query(func.count(Epidemic.id)).scalar()
 
+def get_epidemic_aggregates(db: Session, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Agrégats des épidémies calculés en une seule requête : nombre total, nombre d'épidémies
+    actives (sans date de fin), taux moyens et totaux dénormalisés de cas et de décès.
+    """
+    row = db.query(
+        func.count(Epidemic.id).label('total'),
+        func.sum(case((Epidemic.end_date.is_(None), 1), else_=0)).label('active'),
+        func.avg(Epidemic.transmission_rate).label('average_transmission_rate'),
+        func.avg(Epidemic.mortality_rate).label('average_mortality_rate'),
+        func.sum(Epidemic.total_cases).label('total_cases'),
+        func.sum(Epidemic.total_deaths).label('total_deaths')
+    ).filter(*_filter_criteria(filters)).one()
+    return {
+        "total": row.total or 0,
+        "active": int(row.active or 0),
+        "average_transmission_rate": float(row.average_transmission_rate or 0),
+        "average_mortality_rate": float(row.average_mortality_rate or 0),
+        "total_cases": int(row.total_cases or 0),
+        "total_deaths": int(row.total_deaths or 0)
+    }
+
+def delete_epidemics(db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Supprime en quelques requêtes DELETE ... WHERE toutes les épidémies correspondant aux filtres
+    (toutes si aucun filtre) et leurs données dépendantes, en une seule transaction.
+    Les tables filles sont vidées explicitement : MySQL les supprimerait par ON DELETE CASCADE,
+    mais SQLite n'applique pas les clés étrangères par défaut.
+    Les empreintes des fichiers des sources concernées sont aussi supprimées : sans elles,
+    l'ETL incrémental ignorerait ces fichiers « inchangés » et ne rechargerait jamais les données.
+    Retourne le nombre d'épidémies supprimées.
+    """
+    criteria = _filter_criteria(filters)
+    selected = select(Epidemic.id).where(*criteria)
+    try:
+        sources = select(DailyStats.id_source).where(DailyStats.id_epidemic.in_(selected)).distinct()
+        db.execute(
+            delete(DataSourceFile).where(DataSourceFile.id_source.in_(sources)).execution_options(synchronize_session=False)
+        )
+        for model in (DailyStats, OverallStats, DailyGlobalRollup):
+            db.execute(delete(model).where(model.id_epidemic.in_(selected)).execution_options(synchronize_session=False))
+        # "fetch" retire les épidémies supprimées de la session : leurs identifiants peuvent être réattribués
+        deleted = db.execute(delete(Epidemic).where(*criteria).execution_options(synchronize_session="fetch")).rowcount
+        db.commit()
+        return deleted
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur lors de la suppression des épidémies: {str(e)}")
+        raise
+
+
+DETAILED_DAILY_STATS_LIMIT = 30
+
+def _location_data(loc: Localisation) -> Dict[str, Any]:
+    return {
+        "id": loc.id,
+        "country": loc.country,
+        "region": loc.region,
+        "iso_code": loc.iso_code
+    }
+
 def get_detailed_epidemic_data(db: Session, skip: int = 0, limit: int = 20) -> List[Dict]:
     """
     Récupère des données détaillées sur les épidémies, incluant statistiques quotidiennes,
-    informations géographiques et sources de données
+    informations géographiques et sources de données.
+    Toutes les épidémies de la page sont chargées en quatre requêtes, quelle que soit la taille de la page.
     """
     # Récupérer les épidémies de base
     epidemics = db.query(Epidemic).offset(skip).limit(limit).all()
-    
+    if not epidemics:
+        return []
+    epidemic_ids = [epidemic.id for epidemic in epidemics]
+
+    # Statistiques quotidiennes les plus récentes : les 30 dernières de chaque épidémie
+    ranked = db.query(
+        DailyStats.id.label("id"),
+        func.row_number().over(
+            partition_by=DailyStats.id_epidemic,
+            order_by=(desc(DailyStats.date), desc(DailyStats.id))
+        ).label("rank")
+    ).filter(DailyStats.id_epidemic.in_(epidemic_ids)).subquery()
+    latest_rows = db.query(DailyStats, Localisation)\
+        .join(ranked, ranked.c.id == DailyStats.id)\
+        .join(Localisation, Localisation.id == DailyStats.id_loc)\
+        .filter(ranked.c.rank <= DETAILED_DAILY_STATS_LIMIT)\
+        .order_by(DailyStats.id_epidemic, desc(DailyStats.date), desc(DailyStats.id))\
+        .all()
+    latest_stats: Dict[int, List] = {}
+    for stat, location in latest_rows:
+        latest_stats.setdefault(stat.id_epidemic, []).append((stat, location))
+
+    # Statistiques globales
+    overall_stats: Dict[int, OverallStats] = {}
+    for stats in db.query(OverallStats)\
+            .filter(OverallStats.id_epidemic.in_(epidemic_ids))\
+            .order_by(OverallStats.id):
+        overall_stats.setdefault(stats.id_epidemic, stats)
+
+    # Toutes les locations affectées par ces épidémies
+    affected_locations: Dict[int, List[Localisation]] = {}
+    for epidemic_id, location in db.query(DailyStats.id_epidemic, Localisation)\
+            .join(DailyStats, DailyStats.id_loc == Localisation.id)\
+            .filter(DailyStats.id_epidemic.in_(epidemic_ids))\
+            .distinct()\
+            .order_by(DailyStats.id_epidemic, Localisation.id):
+        affected_locations.setdefault(epidemic_id, []).append(location)
+
     # Préparer le résultat
     result = []
-    
+
     for epidemic in epidemics:
-        # Récupérer les statistiques quotidiennes les plus récentes
-        latest_stats = db.query(DailyStats)\
-            .filter(DailyStats.id_epidemic == epidemic.id)\
-            .order_by(desc(DailyStats.date))\
-            .limit(30)\
-            .all()
-        
-        # Récupérer les statistiques globales
-        overall_stats = db.query(OverallStats)\
-            .filter(OverallStats.id_epidemic == epidemic.id)\
-            .first()
-        
-        # Récupérer toutes les locations affectées par cette épidémie
-        affected_locations = db.query(Localisation)\
-            .join(DailyStats, DailyStats.id_loc == Localisation.id)\
-            .filter(DailyStats.id_epidemic == epidemic.id)\
-            .distinct()\
-            .all()
-        
+        overall = overall_stats.get(epidemic.id)
+
         # Construire l'objet de données détaillées
         epidemic_data = {
             "id": epidemic.id,
@@ -179,9 +252,9 @@ def get_detailed_epidemic_data(db: Session, skip: int = 0, limit: int = 20) -> L
             
             # Statistiques globales
             "overall_stats": {
-                "total_cases": overall_stats.total_cases if overall_stats else 0,
-                "total_deaths": overall_stats.total_deaths if overall_stats else 0,
-                "fatality_ratio": overall_stats.fatality_ratio if overall_stats else 0.0
+                "total_cases": overall.total_cases if overall else 0,
+                "total_deaths": overall.total_deaths if overall else 0,
+                "fatality_ratio": overall.fatality_ratio if overall else 0.0
             },
             
             # Données quotidiennes
@@ -194,21 +267,11 @@ def get_detailed_epidemic_data(db: Session, skip: int = 0, limit: int = 20) -> L
                 "new_cases": stat.new_cases,
                 "new_deaths": stat.new_deaths,
                 "new_recovered": stat.new_recovered,
-                "location": {
-                    "id": stat.location.id,
-                    "country": stat.location.country,
-                    "region": stat.location.region,
-                    "iso_code": stat.location.iso_code
-                }
-            } for stat in latest_stats],
+                "location": _location_data(location)
+            } for stat, location in latest_stats.get(epidemic.id, [])],
             
             # Toutes les locations affectées
-            "affected_locations": [{
-                "id": loc.id,
-                "country": loc.country,
-                "region": loc.region,
-                "iso_code": loc.iso_code
-            } for loc in affected_locations]
+            "affected_locations": [_location_data(loc) for loc in affected_locations.get(epidemic.id, [])]
         }
         
         result.append(epidemic_data)
@@ -220,9 +283,10 @@ def get_epidemic_statistics(db: Session) -> Dict[str, Any]:
     Récupère les statistiques globales sur les épidémies.
     """
     try:
-        total_epidemics = db.query(func.count(Epidemic.id)).scalar()
-        total_cases = db.query(func.sum(Epidemic.total_cases)).scalar() or 0
-        total_deaths = db.query(func.sum(Epidemic.total_deaths)).scalar() or 0
+        aggregates = get_epidemic_aggregates(db)
+        total_epidemics = aggregates["total"]
+        total_cases = aggregates["total_cases"]
+        total_deaths = aggregates["total_deaths"]
         
         # Calculer le taux de mortalité moyen
         mortality_rate = (total_deaths / total_cases * 100) if total_cases > 0 else 0
@@ -7,6 +7,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.session import engine
 from app.db.models.base import Base
+from app.db.daily_stats_key import validate_daily_stats_key
+from app.db.partitioning import apply_daily_stats_partitioning
 
 # Configurer le logger
 logging.basicConfig(level=logging.INFO)
@@ -17,9 +19,11 @@ def init_db():
     Initialise la base de données en créant toutes les tables définies dans les modèles
     """
     try:
+        validate_daily_stats_key(engine)
         # Création des tables via SQLAlchemy ORM
         logger.info("Création des tables via SQLAlchemy ORM...")
         Base.metadata.create_all(bind=engine)
+        apply_daily_stats_partitioning(engine)
         logger.info("✅ Base de données initialisée avec succès.")
     except Exception as e:
         logger.error(f"❌ Erreur lors de l'initialisation de la base de données : {str(e)}")
@@ -0,0 +1,32 @@
+"""
+Convertit la table daily_stats existante vers la clé primaire DAILY_STATS_PRIMARY_KEY :
+
+    DAILY_STATS_PRIMARY_KEY=natural python -m app.db.scripts.migrate_daily_stats_key
+    python -m app.db.scripts.migrate_daily_stats_key surrogate
+
+La table est recopiée par MySQL : à lancer hors des heures de charge, application arrêtée
+ou en lecture seule.
+"""
+import logging
+import sys
+
+from app.db.session import engine
+from app.db.daily_stats_key import migrate_daily_stats_key
+
+logger = logging.getLogger(__name__)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    target = argv[0] if argv else None
+    try:
+        if migrate_daily_stats_key(engine, target):
+            logger.info("✅ Clé primaire de daily_stats convertie.")
+        else:
+            logger.info("Aucune conversion nécessaire.")
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de la conversion de la clé primaire de daily_stats : {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    main()
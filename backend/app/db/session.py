@@ -1,20 +1,61 @@
 import pymysql
 pymysql.install_as_MySQLdb()
 
+from typing import Any, Dict, Optional
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config.settings import settings
+from app.db.pool import PoolMetrics, instrumented_pool_class
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=False
-)
+def _engine_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> Dict[str, Any]:
+    """Options communes des moteurs : taille, débordement, timeout et recyclage du pool issus de Settings."""
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "echo": False}
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # SQLite en mémoire : une seule connexion possible, pas de pool à dimensionner
+        return options
+    options.update(
+        poolclass=instrumented_pool_class(metrics, is_async=is_async),
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
+    return options
+
+def create_db_engine(url: Optional[str] = None, metrics: Optional[PoolMetrics] = None):
+    """Crée un moteur synchrone dont le pool est configuré par Settings et instrumenté."""
+    url = url or settings.SQLALCHEMY_DATABASE_URL
+    return create_engine(url, **_engine_options(url, metrics or PoolMetrics("sync")))
+
+def create_async_db_engine(url: Optional[str] = None, metrics: Optional[PoolMetrics] = None):
+    """Équivalent asynchrone de create_db_engine."""
+    url = url or settings.SQLALCHEMY_ASYNC_DATABASE_URL
+    return create_async_engine(url, **_engine_options(url, metrics or PoolMetrics("async"), is_async=True))
+
+
+sync_pool_metrics = PoolMetrics("sync")
+async_pool_metrics = PoolMetrics("async")
+
+engine = create_db_engine(metrics=sync_pool_metrics)
 
 # Création de la session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Moteur asynchrone pour les routes de lecture : la requête attend MySQL sans bloquer un thread
+async_engine = create_async_db_engine(metrics=async_pool_metrics)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+def get_pool_stats() -> Dict[str, Any]:
+    """État et métriques des pools de connexions synchrone et asynchrone."""
+    return {
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+        "async": async_pool_metrics.snapshot(async_engine.pool)
+    }
+
 def get_db():
     """
     Fonction pour obtenir une session de base de données
@@ -24,3 +65,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """
+    Fonction pour obtenir une session asynchrone de base de données
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,13 +1,18 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import logging
 from sqlalchemy import inspect
 
 from .core.config.settings import settings
-from .db.session import engine
+from .db.session import engine, SessionLocal
 from .db.models.base import Base
-from .routes import stats, epidemics, dashboard, daily_stats, locations, data_sources
+from .db.partitioning import apply_daily_stats_partitioning
+from .db.daily_stats_key import check_daily_stats_key, validate_daily_stats_key
+from .routes import stats, epidemics, dashboard, daily_stats, daily_stats_export, locations, data_sources
 from .api.endpoints import admin
+from .services.daily_rollup import rebuild_daily_rollup
+from .services.request_metrics import RequestMetricsMiddleware, request_metrics
 
 # --- optionnel ---
 try:
@@ -35,15 +40,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Métriques par route : latence, nombre de requêtes SQL, temps en base, lignes renvoyées
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # --- Démarrage de l'application ---
 @app.on_event("startup")
 async def startup_db_client():
+    # Configuration invalide : le démarrage échoue au lieu de créer une table inutilisable
+    validate_daily_stats_key(engine)
     try:
         inspector = inspect(engine)
         existing_tables = set(inspector.get_table_names())
-        required_tables = {"epidemic", "data_source", "localisation", "daily_stats", "overall_stats"}
+        required_tables = {
+            "epidemic", "data_source", "localisation", "daily_stats", "overall_stats", "data_source_file",
+            "daily_global_rollup"
+        }
 
         if not required_tables.issubset(existing_tables):
             missing_tables = required_tables - existing_tables
@@ -51,8 +66,18 @@ async def startup_db_client():
             logger.info("Initialisation des tables de la base de données...")
             Base.metadata.create_all(bind=engine)
             logger.info("Tables initialisées avec succès")
+
+            # Alimente le cumul quotidien à partir des données déjà chargées
+            if "daily_global_rollup" in missing_tables and "daily_stats" in existing_tables:
+                with SessionLocal() as db:
+                    rebuild_daily_rollup(db)
+                logger.info("Cumul quotidien daily_global_rollup initialisé")
         else:
             logger.info("Toutes les tables requises existent déjà dans la base de données")
+
+        # Clé primaire (DAILY_STATS_PRIMARY_KEY) et partitionnement optionnel de daily_stats
+        check_daily_stats_key(engine)
+        apply_daily_stats_partitioning(engine)
     except Exception as e:
         logger.error(f"Erreur lors de l'initialisation des tables: {str(e)}")
 
@@ -79,6 +104,11 @@ app.include_router(
     prefix=f"{settings.API_V1_STR}/admin",
     tags=["Administration"]
 )
+app.include_router(
+    daily_stats_export.router,
+    prefix=f"{settings.API_V1_STR}/daily-stats/export",
+    tags=["Statistiques quotidiennes"]
+)
 app.include_router(
     daily_stats.router,
     prefix=f"{settings.API_V1_STR}/daily-stats",
@@ -136,3 +166,8 @@ def test_db():
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Métriques par route au format texte Prometheus."""
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,22 +1,139 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..db.session import get_db
+from ..db.session import get_async_db, get_db
 from ..db.models.base import DailyStats
+from ..core.config.settings import settings
+from ..utils.pagination import decode_cursor, encode_cursor
+from typing import AsyncIterator, List, Optional
+from collections import defaultdict
+from datetime import date
+import csv
+import io
+import json
 import logging
 from ..api.schemas import DailyStatsUpdate
+from ..services.cache import invalidate_stats_cache
+from ..services.daily_rollup import refresh_daily_rollup
+from ..services.overall_stats import apply_overall_stats_deltas, compute_deleted_deltas
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+DAILY_STATS_FIELDS = [column.name for column in DailyStats.__table__.columns]
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return DAILY_STATS_FIELDS
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in DAILY_STATS_FIELDS]
+    if unknown:
+        raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+    return selected
+
+def _build_query(fields: List[str], epidemic_id, location_id, start_date, end_date, after_id):
+    """Requête triée par id (clé primaire) : chaque page est une recherche sur l'index."""
+    columns = [DailyStats.id] + [getattr(DailyStats, field) for field in fields if field != "id"]
+    stmt = select(*columns).order_by(DailyStats.id)
+    if epidemic_id is not None:
+        stmt = stmt.where(DailyStats.id_epidemic == epidemic_id)
+    if location_id is not None:
+        stmt = stmt.where(DailyStats.id_loc == location_id)
+    if start_date is not None:
+        stmt = stmt.where(DailyStats.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(DailyStats.date <= end_date)
+    if after_id is not None:
+        stmt = stmt.where(DailyStats.id > after_id)
+    return stmt
+
+def _row_to_dict(row, fields: List[str]) -> dict:
+    mapping = row._mapping
+    return {
+        field: mapping[field].isoformat() if isinstance(mapping[field], date) else mapping[field]
+        for field in fields
+    }
+
+async def _stream_rows(db: AsyncSession, stmt, fields: List[str], format: str) -> AsyncIterator[str]:
+    """
+    Lit les lignes par paquets via un curseur côté serveur et les sérialise au fil de l'eau.
+    La session est refermée ici : la dépendance get_async_db a déjà rendu la main avant l'envoi du corps.
+    """
+    try:
+        result = await db.stream(
+            stmt,
+            execution_options={"stream_results": True, "yield_per": settings.DAILY_STATS_STREAM_CHUNK_SIZE}
+        )
+        if format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            async for rows in result.partitions():
+                for row in rows:
+                    writer.writerow(_row_to_dict(row, fields).values())
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+        else:
+            async for rows in result.partitions():
+                yield "".join(json.dumps(_row_to_dict(row, fields)) + "\n" for row in rows)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'export des statistiques quotidiennes: {str(e)}")
+        raise
+    finally:
+        await db.close()
+
 @router.get("")
 @router.get("/")
-def get_daily_stats(db: Session = Depends(get_db)):
-    """Get all daily statistics."""
+async def get_daily_stats(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    epidemic_id: Optional[int] = None,
+    location_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    fields: Optional[str] = Query(None, description="Colonnes à renvoyer, séparées par des virgules (toutes par défaut)"),
+    limit: Optional[int] = Query(None, ge=1, description="Taille de page (json) ou nombre maximal de lignes (ndjson/csv)"),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (en-tête X-Next-Cursor)"),
+    format: str = Query("json", pattern="^(json|ndjson|csv)$")
+):
+    """
+    Récupère les statistiques quotidiennes, filtrées et paginées par curseur sur l'id.
+    En json, renvoie une page (next_cursor dans l'en-tête X-Next-Cursor) ; en ndjson ou csv,
+    renvoie toutes les lignes en flux, lues par paquets : la mémoire utilisée ne dépend pas du volume.
+    """
+    try:
+        selected = _parse_fields(fields)
+        after_id = None
+        if cursor:
+            payload = decode_cursor(cursor)
+            if "id" not in payload:
+                raise ValueError("Curseur invalide")
+            after_id = int(payload["id"])
+        stmt = _build_query(selected, epidemic_id, location_id, start_date, end_date, after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format in STREAM_MEDIA_TYPES:
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return StreamingResponse(_stream_rows(db, stmt, selected, format), media_type=STREAM_MEDIA_TYPES[format])
+
     try:
-        daily_stats = db.query(DailyStats).all()
-        if not daily_stats:
-            return []
-        return daily_stats
+        page_size = min(limit or settings.DAILY_STATS_PAGE_SIZE, settings.DAILY_STATS_MAX_PAGE_SIZE)
+        rows = (await db.execute(stmt.limit(page_size + 1))).all()
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            response.headers["X-Next-Cursor"] = encode_cursor({"id": rows[-1].id})
+        return [_row_to_dict(row, selected) for row in rows]
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des statistiques quotidiennes: {str(e)}")
         return []
@@ -48,12 +165,27 @@ def update_daily_stats(stats_id: int, stats_update: DailyStatsUpdate, db: Sessio
                     detail=f"Le champ {field} est requis"
                 )
 
+        previous_key = (db_stats.id_epidemic, db_stats.date)
+        # Variation des totaux : l'ancienne ligne est retirée, la nouvelle ajoutée
+        deltas = compute_deleted_deltas(db, DailyStats.id == stats_id)
         for field, value in update_data.items():
             setattr(db_stats, field, value)
+        added = deltas.setdefault(db_stats.id_epidemic, [0, 0])
+        added[0] += db_stats.cases or 0
+        added[1] += db_stats.deaths or 0
 
         try:
+            db.flush()
+            # Totaux dénormalisés de l'épidémie (et de l'ancienne si la ligne change d'épidémie)
+            apply_overall_stats_deltas(db, deltas)
+            # Cumul quotidien de l'ancien et du nouveau couple (épidémie, date)
+            affected_dates = defaultdict(set)
+            for epidemic_id, day in (previous_key, (db_stats.id_epidemic, db_stats.date)):
+                affected_dates[epidemic_id].add(day)
+            refresh_daily_rollup(db, affected_dates)
             db.commit()
             db.refresh(db_stats)
+            invalidate_stats_cache()
             return db_stats
         except Exception as e:
             db.rollback()
@@ -0,0 +1,135 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ..db.session import get_db
+from ..db.models.base import DailyStats, Epidemic, Localisation
+from ..core.config.settings import settings
+from typing import Iterator, Optional
+from datetime import date
+import logging
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+EXPORT_COLUMNS = [
+    ("date", DailyStats.date, pa.date32()),
+    ("id_epidemic", DailyStats.id_epidemic, pa.int32()),
+    ("epidemic", Epidemic.name, pa.string()),
+    ("id_loc", DailyStats.id_loc, pa.int32()),
+    ("country", Localisation.country, pa.string()),
+    ("region", Localisation.region, pa.string()),
+    ("iso_code", Localisation.iso_code, pa.string()),
+    ("cases", DailyStats.cases, pa.int64()),
+    ("active", DailyStats.active, pa.int64()),
+    ("deaths", DailyStats.deaths, pa.int64()),
+    ("recovered", DailyStats.recovered, pa.int64()),
+    ("new_cases", DailyStats.new_cases, pa.int64()),
+    ("new_deaths", DailyStats.new_deaths, pa.int64()),
+    ("new_recovered", DailyStats.new_recovered, pa.int64())
+]
+EXPORT_SCHEMA = pa.schema([(name, arrow_type) for name, _, arrow_type in EXPORT_COLUMNS])
+
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows")
+}
+
+class _ChunkSink:
+    """Fichier en écriture seule dont on récupère les octets au fur et à mesure (tell() reste absolu)."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _build_query(epidemic_id, start_date, end_date):
+    stmt = (
+        select(*[column for _, column, _ in EXPORT_COLUMNS])
+        .join(Epidemic, Epidemic.id == DailyStats.id_epidemic)
+        .join(Localisation, Localisation.id == DailyStats.id_loc)
+        .order_by(DailyStats.id)
+    )
+    if epidemic_id is not None:
+        stmt = stmt.where(DailyStats.id_epidemic == epidemic_id)
+    if start_date is not None:
+        stmt = stmt.where(DailyStats.date >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(DailyStats.date <= end_date)
+    return stmt
+
+def _to_record_batch(rows) -> pa.RecordBatch:
+    columns = list(zip(*rows)) if rows else [()] * len(EXPORT_COLUMNS)
+    return pa.record_batch(
+        [pa.array(values, type=field.type) for values, field in zip(columns, EXPORT_SCHEMA)],
+        schema=EXPORT_SCHEMA
+    )
+
+def _stream_export(db: Session, stmt, format: str) -> Iterator[bytes]:
+    """
+    Lit daily_stats par paquets de EXPORT_ROW_GROUP_SIZE lignes via un curseur côté serveur ;
+    chaque paquet devient un row group Parquet (ou un batch Arrow) envoyé aussitôt.
+    """
+    sink = _ChunkSink()
+    output = pa.PythonFile(sink, mode="w")
+    if format == "parquet":
+        writer = pq.ParquetWriter(output, EXPORT_SCHEMA, compression=settings.EXPORT_PARQUET_COMPRESSION)
+    else:
+        writer = pa.ipc.new_stream(output, EXPORT_SCHEMA)
+    try:
+        result = db.execute(
+            stmt,
+            execution_options={"stream_results": True, "yield_per": settings.EXPORT_ROW_GROUP_SIZE}
+        )
+        for rows in result.partitions():
+            writer.write_batch(_to_record_batch(rows))
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
+    except Exception as e:
+        logger.error(f"Erreur lors de l'export des statistiques quotidiennes: {str(e)}")
+        raise
+    finally:
+        db.close()
+
+@router.get("")
+@router.get("/")
+def export_daily_stats(
+    db: Session = Depends(get_db),
+    format: str = Query("parquet", pattern="^(parquet|arrow)$"),
+    epidemic_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None
+):
+    """
+    Exporte les statistiques quotidiennes (avec noms d'épidémie et de localisation)
+    au format Parquet ou Arrow IPC (flux), en streaming.
+    """
+    media_type, extension = EXPORT_FORMATS[format]
+    stmt = _build_query(epidemic_id, start_date, end_date)
+    return StreamingResponse(
+        _stream_export(db, stmt, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="daily_stats.{extension}"'}
+    )
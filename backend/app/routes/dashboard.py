@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from ..db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from ..db.session import get_async_db
 from ..db.models.base import Epidemic, DailyStats
 from datetime import datetime
 import logging
@@ -11,23 +11,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/overview")
-def get_dashboard_overview(db: Session = Depends(get_db)):
+async def get_dashboard_overview(db: AsyncSession = Depends(get_async_db)):
     """
     Récupère les données générales pour l'analyse détaillée.
     """
     try:
         # Statistiques des épidémies
-        total_pandemics = db.query(Epidemic).count()
-        active_pandemics = db.query(Epidemic).filter(Epidemic.end_date is None).count()
+        total_pandemics = await db.scalar(select(func.count(Epidemic.id)))
+        active_pandemics = await db.scalar(select(func.count(Epidemic.id)).where(Epidemic.end_date is None))
 
         # Calcul des taux moyens
-        latest_stats = db.query(
+        latest_stats = (await db.execute(select(
             func.avg(DailyStats.new_cases * 100.0 / func.nullif(DailyStats.cases, 0)).label('transmission_rate'),
             func.avg(DailyStats.deaths * 100.0 / func.nullif(DailyStats.cases, 0)).label('mortality_rate')
-        ).first()
+        ))).first()
 
         # Récupération des dernières statistiques
-        latest_data = db.query(DailyStats).order_by(DailyStats.date.desc()).first()
+        latest_data = await db.scalar(select(DailyStats).order_by(DailyStats.date.desc()).limit(1))
 
         return {
             "totalPandemics": total_pandemics,
@@ -49,16 +49,17 @@ def get_dashboard_overview(db: Session = Depends(get_db)):
         )
 
 @router.get("/trends")
-def get_dashboard_trends(db: Session = Depends(get_db)):
+async def get_dashboard_trends(db: AsyncSession = Depends(get_async_db)):
     """
     Récupère les tendances pour l'analyse détaillée.
     """
     try:
         # Récupération des statistiques des 7 derniers jours
-        recent_stats = db.query(DailyStats)\
-            .order_by(DailyStats.date.desc())\
-            .limit(7)\
-            .all()
+        recent_stats = (await db.scalars(
+            select(DailyStats)
+            .order_by(DailyStats.date.desc())
+            .limit(7)
+        )).all()
 
         return {
             "dailyStats": [
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from ..db.session import get_db
-from ..db.models.base import Epidemic, DailyStats
+from sqlalchemy import func, desc, select
+from ..db.session import get_async_db, get_db
+from ..db.models.base import Epidemic, DailyGlobalRollup
+from ..db.repositories import epidemic_repository
+from ..services.cache import invalidate_stats_cache, stats_cache
+from ..services.dashboard_queries import DashboardQueryExecutor
+from ..utils.pagination import decode_cursor, encode_cursor, keyset_filter
 from typing import Optional
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -49,6 +54,7 @@ def create_epidemic(epidemic: EpidemicCreate, db: Session = Depends(get_db)):
         db.add(db_epidemic)
         db.commit()
         db.refresh(db_epidemic)
+        invalidate_stats_cache()
         return db_epidemic
     except Exception as e:
         logger.error(f"Erreur lors de la création de l'épidémie: {str(e)}")
@@ -84,6 +90,7 @@ def update_epidemic(epidemic_id: int, epidemic: EpidemicUpdate, db: Session = De
 
         db.commit()
         db.refresh(db_epidemic)
+        invalidate_stats_cache()
         return db_epidemic
     except HTTPException:
         raise
@@ -101,15 +108,15 @@ def delete_epidemic(epidemic_id: int, db: Session = Depends(get_db)):
     Supprime une épidémie.
     """
     try:
-        db_epidemic = db.query(Epidemic).filter(Epidemic.id == epidemic_id).first()
-        if not db_epidemic:
+        # Statistiques, cumul et OverallStats supprimés explicitement : daily_stats partitionnée
+        # n'a plus de clés étrangères en cascade
+        if not epidemic_repository.delete_epidemic(db, epidemic_id):
             raise HTTPException(
                 status_code=404,
                 detail="Épidémie non trouvée"
             )
 
-        db.delete(db_epidemic)
-        db.commit()
+        invalidate_stats_cache()
         return None
     except HTTPException:
         raise
@@ -121,78 +128,118 @@ def delete_epidemic(epidemic_id: int, db: Session = Depends(get_db)):
             detail="Erreur lors de la suppression de l'épidémie"
         )
 
+
+SORT_COLUMNS = {
+    "name": "name",
+    "cases": "total_cases",
+    "deaths": "total_deaths",
+    "date": "start_date"
+}
+
+def _cursor_value(epidemic: Epidemic, sort_field: str):
+    value = getattr(epidemic, sort_field)
+    return value.isoformat() if isinstance(value, date) else value
+
+def _parse_cursor(cursor: str, sort_field: str, sort_desc: bool):
+    """Retourne (valeur de tri, id) de la dernière ligne de la page précédente."""
+    payload = decode_cursor(cursor)
+    if payload.get("s") != sort_field or payload.get("d") != sort_desc or "id" not in payload:
+        raise ValueError("Curseur incompatible avec le tri demandé")
+    value = payload.get("v")
+    if sort_field == "start_date" and value is not None:
+        value = date.fromisoformat(value)
+    return value, int(payload["id"])
+
 @router.get("")
 @router.get("/")
-def get_epidemics(
-    db: Session = Depends(get_db),
+async def get_epidemics(
+    db: AsyncSession = Depends(get_async_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
     search: Optional[str] = None,
     type: Optional[str] = None,
     country: Optional[str] = None,
     sort_by: Optional[str] = "name",
-    sort_desc: bool = False
+    sort_desc: bool = False,
+    cursor: Optional[str] = Query(
+        None, description="Curseur de pagination (next_cursor de la page précédente, vide pour la première page)"
+    )
 ):
     """
     Récupère la liste des épidémies avec pagination et filtrage.
+    Avec cursor, la pagination se fait par recherche sur l'index (tri, id) au lieu d'un OFFSET :
+    chaque page coûte le même prix quelle que soit sa position.
+    Le total est une estimation mise en cache, invalidée à chaque écriture.
     """
     try:
         # Construire la requête de base
-        query = db.query(Epidemic)
+        query = select(Epidemic)
 
         # Appliquer les filtres
         if search:
             search_term = f"%{search}%"
-            query = query.filter(
+            query = query.where(
                 (Epidemic.name.ilike(search_term))
                 | (Epidemic.type.ilike(search_term))
                 | (Epidemic.country.ilike(search_term))
             )
         
         if type and type != "all":
-            query = query.filter(Epidemic.type == type)
+            query = query.where(Epidemic.type == type)
             
         if country and country != "all":
-            query = query.filter(Epidemic.country == country)
-
-        # Appliquer le tri
-        if sort_by:
-            sort_column = getattr(Epidemic, {
-                "name": "name",
-                "cases": "total_cases",
-                "deaths": "total_deaths",
-                "date": "start_date"
-            }.get(sort_by, "name"))
-            
-            if sort_desc:
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(sort_column)
+            query = query.where(Epidemic.country == country)
+
+        # Nombre total d'éléments (mis en cache)
+        count_query = select(func.count()).select_from(query.subquery())
+        total = await stats_cache.get_or_set_async(
+            ("epidemics_count", search, type, country), lambda: db.scalar(count_query)
+        )
 
-        # Calculer le nombre total d'éléments
-        total = query.count()
+        # Appliquer le tri, avec l'id comme départage pour un ordre stable
+        sort_field = SORT_COLUMNS.get(sort_by or "name", "name")
+        sort_column = getattr(Epidemic, sort_field)
+        if sort_desc:
+            query = query.order_by(desc(sort_column), desc(Epidemic.id))
+        else:
+            query = query.order_by(sort_column, Epidemic.id)
 
         # Appliquer la pagination
-        epidemics = query.offset(skip).limit(limit).all()
+        if cursor:
+            value, last_id = _parse_cursor(cursor, sort_field, sort_desc)
+            query = query.where(keyset_filter(sort_column, Epidemic.id, value, last_id, sort_desc))
+        elif cursor is None:
+            query = query.offset(skip)
+        rows = (await db.scalars(query.limit(limit + 1))).all()
+        epidemics = rows[:limit]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = epidemics[-1]
+            next_cursor = encode_cursor({"s": sort_field, "d": sort_desc, "v": _cursor_value(last, sort_field), "id": last.id})
 
         # Préparer la réponse
         return {
             "items": epidemics,
             "total": total,
-            "page": skip // limit + 1,
-            "pages": (total + limit - 1) // limit
+            "page": skip // limit + 1 if cursor is None else None,
+            "pages": (total + limit - 1) // limit,
+            "next_cursor": next_cursor
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des épidémies: {str(e)}")
         return {
             "items": [],
             "total": 0,
             "page": 1,
-            "pages": 1
+            "pages": 1,
+            "next_cursor": None
         }
 
 @router.get("/stats/dashboard")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Récupère les statistiques agrégées pour le tableau de bord.
     """
@@ -225,70 +272,91 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
             "top_active_epidemics": []
         }
 
-        # Vérifier si la table est vide
-        has_data = db.query(Epidemic).first() is not None
-        if not has_data:
-            return empty_response
+        async def total_stats_query(session):
+            return (await session.execute(select(
+                func.sum(Epidemic.total_cases).label("total_cases"),
+                func.sum(Epidemic.total_deaths).label("total_deaths"),
+                func.count(Epidemic.id).label("total_epidemics")
+            ))).first()
+
+        async def active_epidemics_query(session):
+            return await session.scalar(select(func.count(Epidemic.id)).where(
+                Epidemic.end_date.is_(None)
+            )) or 0
+
+        async def type_stats_query(session):
+            return (await session.execute(select(
+                Epidemic.type,
+                func.sum(Epidemic.total_cases).label("cases"),
+                func.sum(Epidemic.total_deaths).label("deaths")
+            ).group_by(Epidemic.type))).all()
+
+        async def geo_stats_query(session):
+            return (await session.execute(select(
+                Epidemic.country,
+                func.sum(Epidemic.total_cases).label("cases"),
+                func.sum(Epidemic.total_deaths).label("deaths")
+            ).group_by(Epidemic.country))).all()
 
-        # Statistiques globales
-        total_stats = db.query(
-            func.sum(Epidemic.total_cases).label("total_cases"),
-            func.sum(Epidemic.total_deaths).label("total_deaths"),
-            func.count(Epidemic.id).label("total_epidemics")
-        ).first()
+        async def daily_evolution_query(session):
+            # Évolution dans le temps (30 derniers jours)
+            thirty_days_ago = datetime.now() - timedelta(days=30)
+            return (await session.execute(select(
+                DailyGlobalRollup.date,
+                func.sum(DailyGlobalRollup.new_cases).label("new_cases"),
+                func.sum(DailyGlobalRollup.new_deaths).label("new_deaths"),
+                func.sum(DailyGlobalRollup.active).label("active_cases")
+            ).where(
+                DailyGlobalRollup.date >= thirty_days_ago.date()
+            ).group_by(
+                DailyGlobalRollup.date
+            ).order_by(
+                DailyGlobalRollup.date
+            ))).all()
 
+        async def top_epidemics_query(session):
+            # Top 5 des épidémies les plus actives
+            return (await session.scalars(select(
+                Epidemic
+            ).where(
+                Epidemic.end_date.is_(None)
+            ).order_by(
+                desc(Epidemic.total_cases)
+            ).limit(5))).all()
+
+        # Requêtes indépendantes exécutées en parallèle, chacune sur sa propre connexion
+        result = await DashboardQueryExecutor.for_session(db).run({
+            "total_stats": total_stats_query,
+            "active_epidemics": active_epidemics_query,
+            "type_stats": type_stats_query,
+            "geo_stats": geo_stats_query,
+            "daily_evolution": daily_evolution_query,
+            "top_epidemics": top_epidemics_query
+        }, {
+            "total_stats": None,
+            "active_epidemics": 0,
+            "type_stats": [],
+            "geo_stats": [],
+            "daily_evolution": [],
+            "top_epidemics": []
+        })
+        total_stats = result.values["total_stats"]
+        active_epidemics = result.values["active_epidemics"]
+        type_stats = result.values["type_stats"]
+        geo_stats = result.values["geo_stats"]
+        daily_evolution = result.values["daily_evolution"]
+        top_epidemics = result.values["top_epidemics"]
+
+        # Table vide (ou statistiques globales indisponibles)
         if not total_stats or total_stats.total_cases is None:
             return empty_response
 
-        # Compter les épidémies actives séparément
-        active_epidemics = db.query(func.count(Epidemic.id)).filter(
-            Epidemic.end_date.is_(None)
-        ).scalar() or 0
-
-        # Tendances par type
-        type_stats = db.query(
-            Epidemic.type,
-            func.sum(Epidemic.total_cases).label("cases"),
-            func.sum(Epidemic.total_deaths).label("deaths")
-        ).group_by(Epidemic.type).all()
-
-        # Tendances géographiques
-        geo_stats = db.query(
-            Epidemic.country,
-            func.sum(Epidemic.total_cases).label("cases"),
-            func.sum(Epidemic.total_deaths).label("deaths")
-        ).group_by(Epidemic.country).all()
-
-        # Évolution dans le temps (30 derniers jours)
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        daily_evolution = db.query(
-            DailyStats.date,
-            func.sum(DailyStats.new_cases).label("new_cases"),
-            func.sum(DailyStats.new_deaths).label("new_deaths"),
-            func.sum(DailyStats.active).label("active_cases")
-        ).filter(
-            DailyStats.date >= thirty_days_ago
-        ).group_by(
-            DailyStats.date
-        ).order_by(
-            DailyStats.date
-        ).all()
-
-        # Top 5 des épidémies les plus actives
-        top_epidemics = db.query(
-            Epidemic
-        ).filter(
-            Epidemic.end_date.is_(None)
-        ).order_by(
-            desc(Epidemic.total_cases)
-        ).limit(5).all()
-
         # Calcul du taux de mortalité avec vérification de division par zéro
         total_cases = total_stats.total_cases or 0
         total_deaths = total_stats.total_deaths or 0
         mortality_rate = (total_deaths / total_cases * 100) if total_cases > 0 else 0
 
-        return {
+        response = {
             "global_stats": {
                 "total_cases": total_cases,
                 "total_deaths": total_deaths,
@@ -334,6 +402,9 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
                 } for epidemic in (top_epidemics if top_epidemics else [])
             ]
         }
+        if result.partial:
+            response["partial"] = result.failed
+        return response
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des statistiques du tableau de bord: {str(e)}")
         return empty_response
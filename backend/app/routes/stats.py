@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..db.session import get_db
-from ..services.stats_service import StatsService
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..db.session import get_async_db
+from ..services.stats_service import DASHBOARD_FALLBACKS, DASHBOARD_SECTIONS, StatsService
+from ..services.cache import stats_cache
+from ..services.dashboard_queries import DashboardQueryExecutor, sync_query
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,16 +11,34 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/dashboard")
-def get_dashboard_stats(db: Session = Depends(get_db)):
+async def get_dashboard_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Récupère toutes les statistiques pour le tableau de bord
     """
     try:
-        stats_service = StatsService(db)
-        return stats_service.get_dashboard_stats()
+        async def compute():
+            # StatsService est synchrone : run_sync l'exécute sur une connexion asynchrone par section
+            queries = {
+                name: sync_query(lambda session, name=name: StatsService(session).get_section(name))
+                for name in DASHBOARD_SECTIONS
+            }
+            result = await DashboardQueryExecutor.for_session(db).run(queries, DASHBOARD_FALLBACKS)
+            if result.partial:
+                return {**result.values, "partial": result.failed}
+            return result.values
+
+        # Une réponse partielle n'est pas mise en cache : la requête suivante retente les sections en échec
+        return await stats_cache.get_or_set_async("dashboard", compute, cache_if=lambda value: "partial" not in value)
     except Exception as e:
         logger.error(f"Erreur lors de la récupération des statistiques du tableau de bord: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Erreur lors de la récupération des statistiques du tableau de bord"
-        ) 
\ No newline at end of file
+        )
+
+@router.get("/cache")
+def get_stats_cache_info():
+    """
+    Récupère l'état du cache des statistiques (version des données, hits, misses)
+    """
+    return stats_cache.stats()
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..core.config.settings import settings
+
+class ResponseCache:
+    """
+    Cache LRU en mémoire avec durée de vie (TTL) et numéro de version des données.
+    Chaque écriture en base (ETL, endpoints d'écriture) incrémente la version, ce qui
+    invalide immédiatement toutes les entrées du processus ; le TTL borne la fraîcheur
+    pour les autres processus (workers uvicorn) qui ne voient pas l'invalidation.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Verrou de calcul par clé et nombre d'appels qui le détiennent ou l'attendent ; supprimé
+        # par le dernier d'entre eux, les clés (recherches libres) ne s'accumulent pas hors du LRU
+        self._key_locks: Dict[Hashable, List] = {}
+        self._async_key_locks: Dict[Hashable, List] = {}
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            version, expires_at, value = entry
+            if version != self.version or expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def _store(self, key: Hashable, value: Any, version: int) -> None:
+        with self._lock:
+            # Données modifiées pendant le calcul : on ne met pas en cache un résultat déjà périmé
+            if version != self.version:
+                return
+            self._entries[key] = (version, time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _acquire_key_lock(self, locks: Dict[Hashable, List], key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = locks.get(key)
+            if entry is None:
+                entry = locks[key] = [factory(), 0]
+            entry[1] += 1
+            return entry[0]
+
+    def _release_key_lock(self, locks: Dict[Hashable, List], key: Hashable) -> None:
+        with self._lock:
+            entry = locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del locks[key]
+
+    def get_or_set(
+        self, key: Hashable, compute: Callable[[], Any], cache_if: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Retourne la valeur en cache ou la calcule ; un seul calcul à la fois par clé.
+        Si cache_if est fourni, la valeur calculée n'est conservée que s'il renvoie True.
+        """
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return compute()
+
+        found, value = self._lookup(key)
+        if not found:
+            key_lock = self._acquire_key_lock(self._key_locks, key, threading.Lock)
+            try:
+                with key_lock:
+                    found, value = self._lookup(key)
+                    if not found:
+                        version = self.version
+                        value = compute()
+                        if cache_if is None or cache_if(value):
+                            self._store(key, value, version)
+            finally:
+                self._release_key_lock(self._key_locks, key)
+
+        self._count(found)
+        return value
+
+    async def get_or_set_async(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        cache_if: Optional[Callable[[Any], bool]] = None
+    ) -> Any:
+        """
+        Variante de get_or_set pour les routes asynchrones : compute est une coroutine,
+        et l'attente d'un calcul en cours ne bloque pas la boucle d'événements.
+        """
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return await compute()
+
+        found, value = self._lookup(key)
+        if not found:
+            key_lock = self._acquire_key_lock(self._async_key_locks, key, asyncio.Lock)
+            try:
+                async with key_lock:
+                    found, value = self._lookup(key)
+                    if not found:
+                        version = self.version
+                        value = await compute()
+                        if cache_if is None or cache_if(value):
+                            self._store(key, value, version)
+            finally:
+                self._release_key_lock(self._async_key_locks, key)
+
+        self._count(found)
+        return value
+
+    def _count(self, found: bool) -> None:
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def invalidate(self) -> None:
+        """Incrémente la version des données et vide le cache."""
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "version": self.version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0
+            }
+
+
+stats_cache = ResponseCache(ttl=settings.STATS_CACHE_TTL, max_entries=settings.STATS_CACHE_MAX_ENTRIES)
+
+def invalidate_stats_cache() -> None:
+    """À appeler après toute modification des données servies par StatsService."""
+    stats_cache.invalidate()
@@ -0,0 +1,66 @@
+import logging
+from datetime import date
+from typing import Dict, Iterable
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from ..db.models.base import DailyStats, DailyGlobalRollup
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale des listes IN sur les dates
+DATES_PER_STATEMENT = 500
+
+ROLLUP_COLUMNS = ['id_epidemic', 'date', 'new_cases', 'new_deaths', 'active']
+
+def _rollup_select(*criteria):
+    return select(
+        DailyStats.id_epidemic,
+        DailyStats.date,
+        func.sum(DailyStats.new_cases),
+        func.sum(DailyStats.new_deaths),
+        func.sum(DailyStats.active)
+    ).where(*criteria).group_by(DailyStats.id_epidemic, DailyStats.date)
+
+def refresh_daily_rollup(db: Session, affected_dates: Dict[int, Iterable[date]]) -> int:
+    """
+    Recalcule daily_global_rollup pour les seules dates modifiées de chaque épidémie.
+    Retourne le nombre de couples (épidémie, date) rafraîchis.
+    """
+    refreshed = 0
+    try:
+        for epidemic_id, dates in affected_dates.items():
+            dates = sorted(set(dates))
+            for start in range(0, len(dates), DATES_PER_STATEMENT):
+                window = dates[start:start + DATES_PER_STATEMENT]
+                db.execute(delete(DailyGlobalRollup).where(
+                    DailyGlobalRollup.id_epidemic == epidemic_id,
+                    DailyGlobalRollup.date.in_(window)
+                ))
+                db.execute(insert(DailyGlobalRollup).from_select(
+                    ROLLUP_COLUMNS,
+                    _rollup_select(DailyStats.id_epidemic == epidemic_id, DailyStats.date.in_(window))
+                ))
+            db.commit()
+            refreshed += len(dates)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur lors du rafraîchissement de daily_global_rollup: {e}")
+        raise
+
+    logger.info(f"daily_global_rollup rafraîchi pour {refreshed} dates")
+    return refreshed
+
+def rebuild_daily_rollup(db: Session) -> None:
+    """
+    Reconstruit entièrement daily_global_rollup à partir de daily_stats.
+    """
+    try:
+        db.execute(delete(DailyGlobalRollup))
+        db.execute(insert(DailyGlobalRollup).from_select(ROLLUP_COLUMNS, _rollup_select()))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur lors de la reconstruction de daily_global_rollup: {e}")
+        raise
@@ -0,0 +1,69 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DashboardQuery = Callable[[AsyncSession], Awaitable[Any]]
+
+def sync_query(func: Callable[[Session], Any]) -> DashboardQuery:
+    """Adapte une requête écrite pour une Session synchrone (StatsService) à l'exécuteur."""
+    return lambda session: session.run_sync(func)
+
+class DashboardQueryResult:
+    """Valeur de chaque section ; failed liste les sections remplacées par leur valeur de repli."""
+
+    def __init__(self, values: Dict[str, Any], failed: List[str]):
+        self.values = values
+        self.failed = failed
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.failed)
+
+class DashboardQueryExecutor:
+    """
+    Exécute en parallèle des requêtes d'agrégat indépendantes, chacune dans sa propre
+    session et donc sur sa propre connexion du pool : la latence d'un tableau de bord
+    tend vers celle de la requête la plus lente plutôt que vers leur somme.
+    Une requête en erreur ou qui dépasse DASHBOARD_QUERY_TIMEOUT est remplacée par sa
+    valeur de repli ; le tableau de bord est alors servi partiellement.
+    """
+
+    def __init__(self, bind: AsyncEngine | AsyncConnection, timeout: Optional[float] = None):
+        self.bind = bind
+        self.timeout = settings.DASHBOARD_QUERY_TIMEOUT if timeout is None else timeout
+
+    @classmethod
+    def for_session(cls, db: AsyncSession, timeout: Optional[float] = None) -> "DashboardQueryExecutor":
+        """Exécuteur lié au même moteur que la session de la requête HTTP."""
+        return cls(db.bind, timeout)
+
+    async def run(self, queries: Dict[str, DashboardQuery], fallbacks: Dict[str, Any]) -> DashboardQueryResult:
+        names = list(queries)
+        outcomes = await asyncio.gather(
+            *(self._run_query(queries[name]) for name in names), return_exceptions=True
+        )
+        values, failed = {}, []
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                if isinstance(outcome, asyncio.TimeoutError):
+                    logger.warning(f"Requête du tableau de bord {name} interrompue après {self.timeout}s")
+                else:
+                    logger.error(f"Erreur de la requête du tableau de bord {name}: {outcome}")
+                values[name] = fallbacks[name]
+                failed.append(name)
+            else:
+                values[name] = outcome
+        return DashboardQueryResult(values, failed)
+
+    async def _run_query(self, query: DashboardQuery) -> Any:
+        async with AsyncSession(self.bind, autoflush=False, expire_on_commit=False) as session:
+            if self.timeout and self.timeout > 0:
+                return await asyncio.wait_for(query(session), self.timeout)
+            return await query(session)
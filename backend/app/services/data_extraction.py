@@ -2,16 +2,34 @@ import os
 import pandas as pd
 import logging
 import glob
-from time import sleep
+import multiprocessing
+from itertools import count
+from time import perf_counter, sleep
 import backoff
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from kagglehub import dataset_download
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import date, datetime
 
-from ..db.models.base import Epidemic, DailyStats, Localisation, DataSource, OverallStats
+from ..db.models.base import Epidemic, DailyStats, Localisation, DataSource
+from ..db.partitioning import truncate_source_partition
+from ..db.repositories.data_source_repository import create_data_source
+from ..core.config.settings import settings
 from ..utils.data_cleaning import clean_dataset
+from .location_resolver import REGION_COLUMNS, ISO_CODE_COLUMNS
+from .etl_profiler import EtlProfiler, cprofiled
+from .load_context import LoadCancelled, LoadContext, LoadProgress
+from .daily_rollup import refresh_daily_rollup
+from .cache import invalidate_stats_cache
+from .overall_stats import (
+    apply_overall_stats_deltas, compute_batch_deltas, compute_deleted_deltas, refresh_epidemic_totals
+)
+from .file_tracking import FILE_APPENDED, FILE_UNCHANGED, check_file, record_file
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +39,9 @@ KAGGLE_DATASETS = {
     "corona": "imdevskp/corona-virus-report",
 }
 
+DAILY_STATS_VALUE_FIELDS = ('cases', 'deaths', 'recovered', 'active', 'new_cases', 'new_deaths', 'new_recovered')
+LOADED_COLUMNS = ('date', 'location') + REGION_COLUMNS + ISO_CODE_COLUMNS + DAILY_STATS_VALUE_FIELDS
+
 @backoff.on_exception(backoff.expo, (SQLAlchemyError, OperationalError), max_tries=5)
 def get_or_create_location(db: Session, location_data) -> int:
     try:
@@ -101,31 +122,182 @@ def insert_or_update_single_stat(db: Session, stats: dict) -> bool:
         logger.error(f"Erreur lors de l'insertion/update d'une stat: {e}")
         return False
 
-@backoff.on_exception(backoff.expo, (SQLAlchemyError, OperationalError), max_tries=5)
-def insert_or_update_stats(db: Session, daily_stats: list) -> int:
-    processed = 0
+def normalize_stat_date(value) -> date:
+    """Convertit une date (chaîne ISO, datetime, Timestamp) en objet date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return pd.Timestamp(value).date()
+
+def prepare_stats_batch(daily_stats: list) -> list:
+    """
+    Valide et normalise un lot de statistiques avant l'upsert.
+    Les doublons sur la clé (épidémie, localisation, date) sont fusionnés, la dernière valeur l'emporte.
+    """
+    rows = {}
     for stats in daily_stats:
         if not validate_stats_fields(stats):
             continue
+        row = {
+            'id_epidemic': int(stats['id_epidemic']),
+            'id_source': int(stats['id_source']),
+            'id_loc': int(stats['id_loc']),
+            'date': normalize_stat_date(stats['date']),
+        }
+        for field in DAILY_STATS_VALUE_FIELDS:
+            value = stats.get(field, 0)
+            row[field] = int(value) if pd.notna(value) else 0
+        rows[(row['id_epidemic'], row['id_loc'], row['date'])] = row
+    return list(rows.values())
 
-        max_retries = 3
-        retry_count = 0
+def build_stats_upsert(db: Session, rows: list):
+    """
+    Construit une requête d'upsert multi-lignes sur idx_unique_daily selon le dialecte.
+    Retourne None si le dialecte n'est pas supporté.
+    """
+    table = DailyStats.__table__
+    update_fields = ('id_source',) + DAILY_STATS_VALUE_FIELDS
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql_insert(table).values(rows)
+        return stmt.on_duplicate_key_update({field: stmt.inserted[field] for field in update_fields})
+    if dialect == "sqlite":
+        stmt = sqlite_insert(table).values(rows)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.id_epidemic, table.c.id_loc, table.c.date],
+            set_={field: stmt.excluded[field] for field in update_fields}
+        )
+    return None
+
+@backoff.on_exception(backoff.expo, OperationalError, max_tries=lambda: settings.ETL_BATCH_MAX_RETRIES)
+def upsert_stats_batch(db: Session, rows: list) -> int:
+    """
+    Écrit un lot de statistiques en une seule requête et un seul commit.
+    Les OverallStats sont mises à jour dans la même transaction à partir des variations du lot.
+    Le lot entier est rejoué en cas d'erreur transitoire (deadlock, connexion perdue).
+    """
+    stmt = build_stats_upsert(db, rows)
+    if stmt is None:
+        logger.warning(f"Upsert groupé non supporté pour {db.get_bind().dialect.name}, insertion ligne par ligne")
+        deltas = compute_batch_deltas(db, rows)
+        processed = sum(1 for row in rows if insert_or_update_single_stat(db, row))
+        apply_overall_stats_deltas(db, deltas)
+        db.commit()
+        return processed
 
-        while retry_count < max_retries:
-            success = insert_or_update_single_stat(db, stats)
-            if success:
-                processed += 1
-                break
-            else:
-                retry_count += 1
-                if retry_count == max_retries:
-                    logger.error(f"Échec après {max_retries} tentatives pour: {stats}")
-                sleep(2 ** retry_count)
+    try:
+        deltas = compute_batch_deltas(db, rows)
+        db.execute(stmt)
+        apply_overall_stats_deltas(db, deltas)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(rows)
+
+def insert_or_update_stats(db: Session, daily_stats: list, batch_size: Optional[int] = None) -> int:
+    """
+    Insère ou met à jour les statistiques quotidiennes par lots de batch_size lignes.
+    """
+    batch_size = batch_size or settings.ETL_BATCH_SIZE
+    processed = 0
+
+    for start in range(0, len(daily_stats), batch_size):
+        rows = prepare_stats_batch(daily_stats[start:start + batch_size])
+        if not rows:
+            continue
+        try:
+            processed += upsert_stats_batch(db, rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Échec du lot {start // batch_size + 1} ({len(rows)} lignes): {e}")
+
+    return processed
+
+def build_stats_frame(
+    data: pd.DataFrame, epidemic_id: int, source_id: int, location_ids: pd.Series
+) -> pd.DataFrame:
+    """
+    Construit en colonnes les enregistrements DailyStats à partir d'un dataset nettoyé
+    et des ids de localisation déjà résolus (LocationResolver.resolve).
+    """
+    frame = pd.DataFrame({
+        'id_epidemic': epidemic_id,
+        'id_source': source_id,
+        'id_loc': location_ids,
+        'date': pd.to_datetime(data['date'], errors='coerce'),
+    }, index=data.index)
+    for field in DAILY_STATS_VALUE_FIELDS:
+        if field in data.columns:
+            frame[field] = pd.to_numeric(data[field], errors='coerce').fillna(0).astype('int64')
+        else:
+            frame[field] = 0
+
+    missing = frame['id_loc'].isna() | frame['date'].isna()
+    if missing.any():
+        logger.error(f"{int(missing.sum())} lignes ignorées (localisation ou date invalide)")
+        frame = frame[~missing]
+
+    frame['id_loc'] = frame['id_loc'].astype('int64')
+    frame['date'] = frame['date'].dt.normalize()
+    return frame.drop_duplicates(subset=['id_epidemic', 'id_loc', 'date'], keep='last')
+
+def iter_stats_batches(frame: pd.DataFrame, batch_size: int):
+    """
+    Découpe un DataFrame DailyStats en lots d'enregistrements (types Python natifs).
+    """
+    columns = list(frame.columns)
+    for start in range(0, len(frame), batch_size):
+        chunk = frame.iloc[start:start + batch_size]
+        values = []
+        for col in columns:
+            array = chunk[col].to_numpy()
+            if col == 'date':
+                array = array.astype('datetime64[D]')
+            values.append(array.tolist())
+        yield [dict(zip(columns, row)) for row in zip(*values)]
+
+def load_stats_frame(db: Session, frame: pd.DataFrame, batch_size: Optional[int] = None) -> int:
+    """
+    Charge un DataFrame déjà validé par lots, sans repasser par la validation ligne à ligne.
+    Un lot en échec (après les reprises d'upsert_stats_batch) interrompt le chargement : les lots
+    précédents restent écrits et le fichier n'est pas marqué comme chargé, il sera rejoué.
+    Retourne le nombre de lignes écrites.
+    """
+    batch_size = batch_size or settings.ETL_BATCH_SIZE
+    processed = 0
+
+    for index, rows in enumerate(iter_stats_batches(frame, batch_size)):
+        try:
+            processed += upsert_stats_batch(db, rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Échec du lot {index + 1} ({len(rows)} lignes, {processed} lignes déjà écrites): {e}")
+            raise
 
     return processed
 
 @backoff.on_exception(backoff.expo, Exception, max_tries=5)
-def process_generic_data(db: Session, data: pd.DataFrame, source_id: int, epidemic_name: str, reset: bool = False) -> None:
+def process_generic_data(
+    db: Session,
+    data: pd.DataFrame,
+    source_id: int,
+    epidemic_name: str,
+    reset: bool = False,
+    context: Optional[LoadContext] = None
+) -> int:
+    """
+    Charge un dataset nettoyé dans daily_stats et retourne le nombre de lignes écrites.
+    Les totaux de l'épidémie et ses OverallStats sont mis à jour avec chaque lot. Sans contexte
+    de run, daily_global_rollup est rafraîchi immédiatement ; avec un contexte, les dates sont
+    accumulées et rafraîchies une seule fois en fin de run.
+    """
+    standalone = context is None
+    if standalone:
+        context = LoadContext(db)
+
     try:
         epidemic = db.query(Epidemic).filter(Epidemic.name == epidemic_name).first()
 
@@ -143,108 +315,534 @@ def process_generic_data(db: Session, data: pd.DataFrame, source_id: int, epidem
 
         if reset:
             try:
-                db.query(DailyStats).filter(
-                    DailyStats.id_epidemic == epidemic_id,
-                    DailyStats.id_source == source_id
-                ).delete()
+                criteria = (DailyStats.id_epidemic == epidemic_id, DailyStats.id_source == source_id)
+                context.mark_dates(epidemic_id, [row.date for row in db.query(DailyStats.date).filter(*criteria).distinct()])
+                deltas = compute_deleted_deltas(db, *criteria)
+                # En mode DAILY_STATS_PARTITIONING=source, la partition de la source est vidée sans DELETE
+                if not truncate_source_partition(db, epidemic_id, source_id):
+                    db.query(DailyStats).filter(*criteria).delete()
+                apply_overall_stats_deltas(db, deltas)
                 db.commit()
             except Exception as e:
                 db.rollback()
                 logger.error(f"Erreur lors de la suppression des anciennes données: {e}")
                 raise
 
-        daily_stats = []
-        for _, row in data.iterrows():
-            try:
-                location_id = get_or_create_location(db, row['location'] if isinstance(row['location'], str) else row)
-                if not location_id:
-                    logger.error(f"Location non trouvée/créée pour: {row['location']}")
-                    continue
-
-                stats = {
-                    'id_epidemic': epidemic_id,
-                    'id_source': source_id,
-                    'id_loc': location_id,
-                    'date': row['date'],
-                    'cases': row.get('cases', 0) if hasattr(row, 'get') else 0,
-                    'deaths': row.get('deaths', 0) if hasattr(row, 'get') else 0,
-                    'recovered': row.get('recovered', 0) if hasattr(row, 'get') else 0,
-                    'active': row.get('active', 0) if hasattr(row, 'get') else 0,
-                    'new_cases': row.get('new_cases', 0) if hasattr(row, 'get') else 0,
-                    'new_deaths': row.get('new_deaths', 0) if hasattr(row, 'get') else 0,
-                    'new_recovered': row.get('new_recovered', 0) if hasattr(row, 'get') else 0
-                }
-                daily_stats.append(stats)
-
-            except Exception as e:
-                logger.error(f"Erreur lors du traitement de la ligne: {e}")
-                continue
-
-        if daily_stats:
-            processed = insert_or_update_stats(db, daily_stats)
-            logger.info(f"Nombre d'enregistrements traités: {processed}")
-        else:
+        with context.profiler.stage("locations", rows=len(data)):
+            location_ids = context.location_resolver.resolve(data)
+        with context.profiler.stage("prepare", rows=len(data)):
+            frame = build_stats_frame(data, epidemic_id, source_id, location_ids)
+        processed = 0
+        if frame.empty:
             logger.warning("Aucune donnée à traiter")
+        else:
+            with context.profiler.stage("db_write", rows=len(frame)):
+                processed = load_stats_frame(db, frame)
+            context.mark_dates(epidemic_id, frame['date'].dt.date.unique())
+            logger.info(f"Nombre d'enregistrements traités: {processed}")
 
+        if standalone:
+            refresh_daily_rollup(db, context.affected_dates)
+            invalidate_stats_cache()
+
+        return processed
     except Exception as e:
         logger.error(f"Erreur lors du traitement des données: {e}")
         raise
 
 @backoff.on_exception(backoff.expo, (SQLAlchemyError, OperationalError), max_tries=5)
 def calculate_overall_stats(db: Session):
+    """
+    Reconstruit entièrement les OverallStats et les totaux dénormalisés des épidémies
+    à partir de daily_stats, transmission_rate compris. L'ETL maintient les totaux lot par lot :
+    cette reconstruction n'est lancée que sur demande explicite (endpoint d'administration).
+    """
     try:
-        epidemics = db.query(Epidemic).all()
-        for epidemic in epidemics:
-            stats = db.query(
-                func.sum(DailyStats.cases).label('total_cases'),
-                func.sum(DailyStats.deaths).label('total_deaths')
-            ).filter(DailyStats.id_epidemic == epidemic.id).first()
-
-            if stats:
-                total_cases = stats.total_cases or 0
-                total_deaths = stats.total_deaths or 0
-                fatality_ratio = (total_deaths / total_cases * 100) if total_cases > 0 else 0
-
-                overall_stats = db.query(OverallStats).filter_by(id_epidemic=epidemic.id).first()
-                if not overall_stats:
-                    overall_stats = OverallStats(id_epidemic=epidemic.id)
-                    db.add(overall_stats)
-
-                overall_stats.total_cases = total_cases
-                overall_stats.total_deaths = total_deaths
-                overall_stats.fatality_ratio = fatality_ratio
-                db.commit()
+        refresh_epidemic_totals(db, [epidemic_id for epidemic_id, in db.query(Epidemic.id)])
+        db.commit()
     except Exception as e:
         logger.error(f"Erreur stats globales: {e}")
         db.rollback()
         raise
 
-def extract_and_load_datasets(db: Session):
+def read_csv_chunks(file: str, chunk_size: Optional[int] = None):
+    """
+    Lit un CSV par chunks de chunk_size lignes (ou en une fois si chunk_size <= 0).
+    """
+    chunk_size = settings.ETL_CHUNK_SIZE if chunk_size is None else chunk_size
+    if chunk_size <= 0:
+        yield pd.read_csv(file)
+        return
+    with pd.read_csv(file, chunksize=chunk_size) as reader:
+        yield from reader
+
+def load_csv_file(
+    db: Session,
+    file: str,
+    dataset_type: str,
+    source_id: int,
+    context: LoadContext,
+    chunk_size: Optional[int] = None,
+    min_date: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Lit, nettoie et charge un CSV chunk par chunk : la mémoire reste bornée par la taille d'un chunk.
+    L'état par localisation est conservé entre chunks pour le calcul de new_cases / new_deaths.
+    Si min_date est fourni, seules les lignes à partir de cette date sont chargées.
+    Retourne le nombre de lignes lues, le nombre de lignes chargées et la dernière date du fichier.
+    """
+    file_name = os.path.basename(file)
+    state = {}
+    summary = {"rows": 0, "loaded": 0, "last_date": None}
+
+    chunks = read_csv_chunks(file, chunk_size)
+    for index in count():
+        start = perf_counter()
+        chunk = next(chunks, None)
+        if chunk is None:
+            break
+        context.profiler.add_stage("read_csv", perf_counter() - start, len(chunk))
+        context.progress.check_cancelled()
+        with context.profiler.stage("clean", rows=len(chunk)):
+            chunk = clean_dataset(chunk, dataset_type=dataset_type, file_name=file_name, state=state)
+        summary["rows"] += len(chunk)
+        summary["last_date"] = max_date(chunk, summary["last_date"])
+        context.progress.rows_parsed(file_name, len(chunk))
+
+        chunk = filter_from_date(chunk, min_date)
+        if chunk.empty:
+            continue
+        loaded = process_generic_data(db, chunk, source_id, dataset_type, reset=False, context=context)
+        summary["loaded"] += loaded
+        context.progress.rows_loaded(file_name, loaded)
+        logger.info(f"Chunk {index + 1} de {file_name} chargé ({summary['loaded']} lignes au total)")
+
+    return summary
+
+def max_date(data: pd.DataFrame, current: Optional[date] = None) -> Optional[date]:
+    """Dernière date d'un dataset nettoyé, comparée à la valeur courante."""
+    if data.empty or data['date'].isna().all():
+        return current
+    last = data['date'].max().date()
+    return last if current is None or last > current else current
+
+def filter_from_date(data: pd.DataFrame, min_date: Optional[date]) -> pd.DataFrame:
+    """Ne conserve que les lignes datées de min_date ou après (rechargement incrémental)."""
+    if min_date is None:
+        return data
+    return data[data['date'] >= pd.Timestamp(min_date)]
+
+def plan_file_load(db: Session, source_id: int, file: str, incremental: bool) -> Tuple[bool, Optional[date], Dict]:
+    """
+    Décide comment charger un fichier d'après son empreinte.
+    Retourne (à charger, date minimale à charger, empreinte courante).
+    """
+    status, fingerprint, tracked = check_file(db, source_id, file)
+    if not incremental:
+        return True, None, fingerprint
+
+    if status == FILE_UNCHANGED:
+        if fingerprint["mtime_ns"] != tracked.mtime_ns:
+            record_file(db, source_id, file, fingerprint, tracked.row_count, tracked.last_date)
+        logger.info(f"Fichier {file} inchangé depuis le dernier chargement, ignoré")
+        return False, None, fingerprint
+
+    if status == FILE_APPENDED and tracked.last_date:
+        logger.info(f"Fichier {file} complété depuis le dernier chargement, reprise à partir du {tracked.last_date}")
+        return True, tracked.last_date, fingerprint
+
+    return True, None, fingerprint
+
+def get_or_create_data_source(db: Session, name: str, path: str) -> DataSource:
+    data_source = db.query(DataSource).filter_by(source_type=name).first()
+    if not data_source:
+        logger.info(f"Création d'une nouvelle source de données pour {name}")
+        data_source = create_data_source(db, {
+            "source_type": name,
+            "reference": path,
+            "url": f"https://www.kaggle.com/datasets/{path}"
+        })
+        logger.info(f"Source de données créée avec l'ID {data_source.id}")
+    else:
+        logger.info(f"Source de données existante trouvée pour {name} (ID: {data_source.id})")
+    return data_source
+
+def load_file_with_retries(
+    db: Session,
+    file: str,
+    dataset_type: str,
+    source_id: int,
+    context: LoadContext,
+    chunk_size: Optional[int] = None,
+    max_retries: int = 3,
+    incremental: bool = True
+) -> Dict[str, Any]:
+    """
+    Charge un fichier en mode séquentiel et renvoie son entrée de résultat.
+    """
+    file_name = os.path.basename(file)
+    file_retry_count = 0
+    context.progress.file_started(file_name)
+    while True:
+        try:
+            logger.info(f"Traitement du fichier {file}")
+            should_load, min_date, fingerprint = plan_file_load(db, source_id, file, incremental)
+            if not should_load:
+                context.progress.file_finished(file_name, "skipped")
+                return {"dataset": dataset_type, "file": file_name, "rows": 0, "status": "skipped"}
+
+            with context.profiler.track(dataset_type, file_name):
+                summary = load_csv_file(db, file, dataset_type, source_id, context, chunk_size, min_date)
+                record_file(db, source_id, file, fingerprint, summary["rows"], summary["last_date"])
+            logger.info(f"Traitement terminé pour {file}: {summary['loaded']} lignes traitées")
+            context.progress.file_finished(file_name, "success")
+            return {
+                "dataset": dataset_type, "file": file_name, "rows": summary["loaded"], "status": "success",
+                "profile": context.profiler.file_profile(dataset_type, file_name)
+            }
+        except LoadCancelled:
+            context.progress.file_finished(file_name, "cancelled")
+            raise
+        except Exception as e:
+            file_retry_count += 1
+            if file_retry_count == max_retries:
+                logger.error(f"Erreur fichier {file} après {max_retries} tentatives: {e}")
+                context.progress.file_finished(file_name, "error")
+                return {"dataset": dataset_type, "file": file_name, "error": str(e), "status": "error"}
+            logger.warning(f"Tentative {file_retry_count}/{max_retries} échouée pour {file}: {e}")
+            sleep(2 ** file_retry_count)
+
+
+# File bornée des chunks nettoyés vers l'écrivain et signal d'arrêt, transmis à chaque worker
+# du pool par _init_parse_worker
+_chunk_queue = None
+_cancel_event = None
+
+# Attente maximale d'un chunk avant de vérifier l'état des workers et l'annulation
+PARALLEL_POLL_SECONDS = 0.1
+
+def _init_parse_worker(chunk_queue, cancel_event) -> None:
+    global _chunk_queue, _cancel_event
+    _chunk_queue, _cancel_event = chunk_queue, cancel_event
+    # À l'arrêt du pool, un worker ne doit pas attendre que l'écrivain lise les chunks
+    # d'un fichier abandonné
+    chunk_queue.cancel_join_thread()
+
+def parse_and_clean_file(
+    file: str,
+    dataset_type: str,
+    chunk_size: Optional[int] = None,
+    job_key: Optional[Tuple[int, int]] = None,
+    cprofile_path: Optional[str] = None
+) -> int:
+    """
+    Lit et nettoie un CSV chunk par chunk, sans accès à la base (exécuté dans un processus worker).
+    Chaque chunk nettoyé est envoyé à l'écrivain dès qu'il est prêt par la file bornée du pool,
+    avec ses durées de lecture et de nettoyage : le worker ne garde qu'un chunk en mémoire et
+    se bloque tant que l'écrivain a ETL_PARALLEL_QUEUE_CHUNKS chunks en attente.
+    Seules les colonnes utiles au chargement sont transmises. Retourne le nombre de chunks envoyés.
+    cprofile_path : dump cProfile de la lecture et du nettoyage dans le worker (ETL_CPROFILE_FILE).
+    """
+    file_name = os.path.basename(file)
+    state = {}
+    sent = 0
+    reader = read_csv_chunks(file, chunk_size)
+    with cprofiled(cprofile_path):
+        while True:
+            if _cancel_event.is_set():
+                raise LoadCancelled(f"Lecture de {file_name} interrompue")
+            start = perf_counter()
+            chunk = next(reader, None)
+            read_seconds = perf_counter() - start
+            if chunk is None:
+                return sent
+            start = perf_counter()
+            chunk = clean_dataset(chunk, dataset_type=dataset_type, file_name=file_name, state=state)
+            stage_seconds = {"read_csv": read_seconds, "clean": perf_counter() - start}
+            _chunk_queue.put((job_key, chunk[[col for col in LOADED_COLUMNS if col in chunk.columns]], stage_seconds))
+            sent += 1
+
+class ParallelFileJob:
+    """
+    Fichier chargé en mode parallèle : tentative en cours et chunks reçus de son worker.
+    Son profil reste ouvert jusqu'à la fin du fichier et cumule les durées de tous ses chunks ;
+    le dump cProfile du processus écrivain couvre donc aussi les chunks des autres fichiers
+    chargés entre-temps, la lecture et le nettoyage étant profilés dans le worker ({fichier}.parse.prof).
+    """
+
+    def __init__(
+        self, name: str, source_id: int, file: str, min_date: Optional[date], fingerprint: Dict, profiler: EtlProfiler
+    ):
+        self.name = name
+        self.source_id = source_id
+        self.file = file
+        self.file_name = os.path.basename(file)
+        self.min_date = min_date
+        self.fingerprint = fingerprint
+        self.profiler = profiler
+        self.profile = profiler.open_file(name, self.file_name)
+        self.attempt = 0
+        self.future = None
+        self.received_chunks = 0
+        self.rows = 0
+        self.loaded = 0
+        self.last_date = None
+
+    def submit(self, executor: ProcessPoolExecutor, index: int, chunk_size: Optional[int]) -> None:
+        """Lance (ou relance) la lecture du fichier ; une relance recharge le fichier depuis le début."""
+        self.attempt += 1
+        self.received_chunks = self.rows = self.loaded = 0
+        self.last_date = None
+        self.future = executor.submit(
+            parse_and_clean_file, self.file, self.name, chunk_size, (index, self.attempt),
+            self.profiler.cprofile_path(self.file_name, ".parse")
+        )
+
+    def close_profile(self) -> None:
+        """Ferme le profil du fichier (une seule fois, quelle que soit l'issue du chargement)."""
+        if self.profile is not None:
+            self.profiler.close_file(self.profile)
+            self.profile = None
+
+def _load_parallel_chunk(
+    db: Session, job: ParallelFileJob, data: pd.DataFrame, stage_seconds: Dict[str, float], context: LoadContext
+) -> None:
+    with context.profiler.attribute(job.profile):
+        for stage, seconds in stage_seconds.items():
+            context.profiler.add_stage(stage, seconds, len(data))
+        context.progress.rows_parsed(job.file_name, len(data))
+        job.rows += len(data)
+        job.last_date = max_date(data, job.last_date)
+        to_load = filter_from_date(data, job.min_date)
+        if not to_load.empty:
+            loaded = process_generic_data(db, to_load, job.source_id, job.name, reset=False, context=context)
+            job.loaded += loaded
+            context.progress.rows_loaded(job.file_name, loaded)
+
+def _receive_chunk(db: Session, chunk_queue, active: Dict[int, ParallelFileJob], context: LoadContext, results: list) -> None:
+    """
+    Charge le prochain chunk de la file. Les chunks d'une tentative abandonnée ou d'un fichier
+    déjà en erreur sont ignorés.
+    """
+    try:
+        (index, attempt), data, stage_seconds = chunk_queue.get(timeout=PARALLEL_POLL_SECONDS)
+    except Empty:
+        return
+    job = active.get(index)
+    if job is None or attempt != job.attempt:
+        return
+    job.received_chunks += 1
+    try:
+        _load_parallel_chunk(db, job, data, stage_seconds, context)
+    except Exception as e:
+        logger.error(f"Erreur lors du chargement de {job.file}: {e}")
+        job.close_profile()
+        results.append({"dataset": job.name, "file": job.file_name, "error": str(e), "status": "error"})
+        context.progress.file_finished(job.file_name, "error")
+        del active[index]
+
+def _stop_workers(executor: ProcessPoolExecutor, chunk_queue, cancel_event, jobs: List[ParallelFileJob]) -> None:
+    """
+    Arrête les lectures en cours et vide la file jusqu'à la fin des workers : un worker bloqué
+    sur la file pleine empêcherait l'arrêt du pool.
+    """
+    cancel_event.set()
+    executor.shutdown(wait=False, cancel_futures=True)
+    while not all(job.future.done() for job in jobs):
+        try:
+            chunk_queue.get(timeout=PARALLEL_POLL_SECONDS)
+        except Empty:
+            pass
+
+def _plan_parallel_jobs(
+    db: Session, jobs: list, context: LoadContext, incremental: bool, results: list
+) -> List[ParallelFileJob]:
+    """Compare l'empreinte de chaque fichier au dernier chargement et retient ceux à (re)charger."""
+    planned = []
+    for name, source_id, file in jobs:
+        try:
+            should_load, min_date, fingerprint = plan_file_load(db, source_id, file, incremental)
+        except Exception as e:
+            logger.error(f"Erreur lors de la lecture de l'empreinte de {file}: {e}")
+            results.append({"dataset": name, "file": os.path.basename(file), "error": str(e), "status": "error"})
+            continue
+        if should_load:
+            planned.append(ParallelFileJob(name, source_id, file, min_date, fingerprint, context.profiler))
+            context.progress.file_started(os.path.basename(file))
+        else:
+            results.append({"dataset": name, "file": os.path.basename(file), "rows": 0, "status": "skipped"})
+            context.progress.file_finished(os.path.basename(file), "skipped")
+    return planned
+
+def _finish_parallel_job(db: Session, job: ParallelFileJob, context: LoadContext, results: list) -> None:
+    """Enregistre l'empreinte d'un fichier dont tous les chunks sont chargés."""
+    try:
+        with context.profiler.attribute(job.profile):
+            record_file(db, job.source_id, job.file, job.fingerprint, job.rows, job.last_date)
+    except Exception as e:
+        logger.error(f"Erreur lors de l'enregistrement de l'empreinte de {job.file}: {e}")
+        results.append({"dataset": job.name, "file": job.file_name, "error": str(e), "status": "error"})
+        context.progress.file_finished(job.file_name, "error")
+        return
+    finally:
+        job.close_profile()
+    results.append({
+        "dataset": job.name, "file": job.file_name, "rows": job.loaded, "status": "success",
+        "profile": context.profiler.file_profile(job.name, job.file_name)
+    })
+    context.progress.file_finished(job.file_name, "success")
+
+def _poll_parallel_job(
+    db: Session,
+    executor: ProcessPoolExecutor,
+    index: int,
+    job: ParallelFileJob,
+    context: LoadContext,
+    results: list,
+    chunk_size: Optional[int],
+    max_retries: int
+) -> bool:
+    """
+    Traite la fin du worker d'un fichier : relance en cas d'échec, enregistrement une fois
+    tous ses chunks chargés. Retourne True quand le fichier est terminé.
+    """
+    if not job.future.done():
+        return False
+    error = job.future.exception()
+    if error is None:
+        if job.received_chunks != job.future.result():
+            # Des chunks du fichier sont encore dans la file
+            return False
+        _finish_parallel_job(db, job, context, results)
+        return True
+    if job.attempt < max_retries:
+        logger.warning(f"Tentative {job.attempt}/{max_retries} échouée pour {job.file}: {error}")
+        job.submit(executor, index, chunk_size)
+        return False
+    logger.error(f"Erreur fichier {job.file} après {max_retries} tentatives: {error}")
+    job.close_profile()
+    results.append({"dataset": job.name, "file": job.file_name, "error": str(error), "status": "error"})
+    context.progress.file_finished(job.file_name, "error")
+    return True
+
+def load_files_in_parallel(
+    db: Session,
+    jobs: list,
+    context: LoadContext,
+    chunk_size: Optional[int] = None,
+    workers: int = 2,
+    max_retries: int = 3,
+    incremental: bool = True
+) -> list:
+    """
+    Lit et nettoie les fichiers dans un pool de processus ; le processus courant est l'unique
+    écrivain et charge chaque chunk en base dès qu'il arrive dans la file des workers.
+    La mémoire est bornée à ETL_PARALLEL_QUEUE_CHUNKS chunks en attente plus un chunk en cours
+    par worker, soit quelques fois ETL_CHUNK_SIZE lignes, quelle que soit la taille des fichiers.
+    jobs est une liste de tuples (dataset, id de source, chemin du fichier).
+    """
+    results = []
+    planned = _plan_parallel_jobs(db, jobs, context, incremental, results)
+    if not planned:
+        return results
+    logger.info(f"Traitement parallèle de {len(planned)} fichiers avec {workers} workers")
+
+    chunk_queue = multiprocessing.Queue(maxsize=max(1, settings.ETL_PARALLEL_QUEUE_CHUNKS))
+    cancel_event = multiprocessing.Event()
+    active = dict(enumerate(planned))
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_parse_worker, initargs=(chunk_queue, cancel_event)
+    ) as executor:
+        for index, job in active.items():
+            job.submit(executor, index, chunk_size)
+        try:
+            while active:
+                context.progress.check_cancelled()
+                _receive_chunk(db, chunk_queue, active, context, results)
+                for index, job in list(active.items()):
+                    if _poll_parallel_job(db, executor, index, job, context, results, chunk_size, max_retries):
+                        del active[index]
+        except BaseException as e:
+            status = "cancelled" if isinstance(e, LoadCancelled) else "error"
+            for job in active.values():
+                context.progress.file_finished(job.file_name, status)
+            raise
+        finally:
+            _stop_workers(executor, chunk_queue, cancel_event, planned)
+            for job in planned:
+                job.close_profile()
+
+    return results
+
+def extract_and_load_datasets(
+    db: Session,
+    chunk_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    incremental: Optional[bool] = None,
+    progress: Optional[LoadProgress] = None
+):
+    """
+    Télécharge et charge tous les datasets Kaggle.
+    workers : 1 = traitement séquentiel, 0 = un worker par cœur, n = n workers de lecture/nettoyage.
+    incremental : ignore les fichiers inchangés depuis le dernier chargement et ne recharge
+    que les nouvelles dates des fichiers complétés.
+    progress : reçoit l'avancement par fichier ; son check_cancelled peut interrompre le run
+    (LoadCancelled), auquel cas les données déjà chargées restent cohérentes avec le cumul quotidien.
+    Le profil du run (durée et débit par étape, pic de RSS du processus, requêtes SQL) est ajouté en dernière
+    entrée des résultats ("etl_profile") et écrit dans ETL_PROFILE_DIR si ce dossier est configuré.
+    """
     results = []
     max_retries = 3
+    context = LoadContext(db, progress)
+    incremental = settings.ETL_INCREMENTAL if incremental is None else incremental
+    workers = settings.ETL_WORKERS if workers is None else workers
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+
+    with context.profiler.activate():
+        try:
+            _load_datasets(db, context, results, chunk_size, workers, max_retries, incremental)
+        finally:
+            # Même en cas d'annulation, le cumul quotidien doit refléter ce qui a été chargé
+            try:
+                with context.profiler.stage("rollup", rows=len(context.affected_dates)):
+                    refresh_daily_rollup(db, context.affected_dates)
+            except Exception as e:
+                logger.error(f"Erreur lors du rafraîchissement du cumul quotidien: {e}")
+                results.append({"dataset": "daily_global_rollup", "status": "error", "error": str(e)})
+
+            invalidate_stats_cache()
 
+    results.append({
+        "dataset": "etl_profile",
+        "status": "success",
+        "profile": context.profiler.summary(),
+        "profile_file": context.profiler.write()
+    })
+    return results
+
+def _load_datasets(
+    db: Session,
+    context: LoadContext,
+    results: list,
+    chunk_size: Optional[int],
+    workers: int,
+    max_retries: int,
+    incremental: bool
+) -> None:
+    """Télécharge chaque dataset puis charge ses fichiers, en séquentiel ou en parallèle."""
+    parallel_jobs = []
     for name, path in KAGGLE_DATASETS.items():
         retry_count = 0
         while retry_count < max_retries:
+            context.progress.check_cancelled()
             try:
                 logger.info(f"Début du traitement du dataset {name} depuis {path}")
-                dataset_path = dataset_download(path)
+                with context.profiler.track(name), context.profiler.stage("download"):
+                    dataset_path = dataset_download(path)
                 logger.info(f"Téléchargement terminé pour {name} -> {dataset_path}")
 
-                data_source = db.query(DataSource).filter_by(source_type=name).first()
-                if not data_source:
-                    logger.info(f"Création d'une nouvelle source de données pour {name}")
-                    data_source = DataSource(
-                        source_type=name,
-                        reference=path,
-                        url=f"https://www.kaggle.com/datasets/{path}"
-                    )
-                    db.add(data_source)
-                    db.commit()
-                    db.refresh(data_source)
-                    logger.info(f"Source de données créée avec l'ID {data_source.id}")
-                else:
-                    logger.info(f"Source de données existante trouvée pour {name} (ID: {data_source.id})")
+                data_source = get_or_create_data_source(db, name, path)
 
                 csv_files = get_csv_files_from_directory(dataset_path)
                 logger.info(f"{len(csv_files)} CSV trouvés pour {name}")
@@ -254,31 +852,17 @@ def extract_and_load_datasets(db: Session):
                     results.append({"dataset": name, "status": "warning", "message": "Aucun fichier CSV trouvé"})
                     break
 
+                if workers > 1:
+                    parallel_jobs.extend((name, data_source.id, file) for file in csv_files)
+                    break
+
                 for file in csv_files:
-                    file_retry_count = 0
-                    while file_retry_count < max_retries:
-                        try:
-                            logger.info(f"Traitement du fichier {file}")
-                            df = pd.read_csv(file)
-                            logger.info(f"Fichier {file} lu avec succès, {len(df)} lignes")
-
-                            df = clean_dataset(df, dataset_type=name, file_name=os.path.basename(file))
-                            logger.info(f"Données nettoyées pour {file}")
-
-                            process_generic_data(db, df, data_source.id, name, reset=False)
-                            logger.info(f"Traitement terminé pour {file}: {len(df)} lignes traitées")
-
-                            results.append({"dataset": name, "file": os.path.basename(file), "rows": len(df), "status": "success"})
-                            break
-                        except Exception as e:
-                            file_retry_count += 1
-                            if file_retry_count == max_retries:
-                                logger.error(f"Erreur fichier {file} après {max_retries} tentatives: {e}")
-                                results.append({"dataset": name, "file": os.path.basename(file), "error": str(e), "status": "error"})
-                            else:
-                                logger.warning(f"Tentative {file_retry_count}/{max_retries} échouée pour {file}: {e}")
-                                sleep(2 ** file_retry_count)
+                    results.append(load_file_with_retries(
+                        db, file, name, data_source.id, context, chunk_size, max_retries, incremental
+                    ))
                 break
+            except LoadCancelled:
+                raise
             except Exception as e:
                 retry_count += 1
                 if retry_count == max_retries:
@@ -288,15 +872,10 @@ def extract_and_load_datasets(db: Session):
                     logger.warning(f"Tentative {retry_count}/{max_retries} échouée pour {name}: {e}")
                     sleep(2 ** retry_count)
 
-    try:
-        logger.info("Calcul des statistiques globales")
-        calculate_overall_stats(db)
-        logger.info("Statistiques globales calculées avec succès")
-    except Exception as e:
-        logger.error(f"Erreur lors du calcul des statistiques globales: {e}")
-        results.append({"dataset": "overall_stats", "status": "error", "error": str(e)})
-
-    return results
+    if parallel_jobs:
+        results.extend(load_files_in_parallel(
+            db, parallel_jobs, context, chunk_size, workers, max_retries, incremental
+        ))
 
 def run_etl(db: Session) -> Dict[str, Any]:
     """
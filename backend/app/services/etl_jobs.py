@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config.settings import settings
+from ..db.session import SessionLocal
+from .load_context import LoadCancelled, LoadProgress
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+class FileProgress:
+    """Avancement d'un fichier : lignes lues et nettoyées, lignes chargées, débit."""
+
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.status = JOB_RUNNING
+        self.rows_parsed = 0
+        self.rows_loaded = 0
+        self.started_at = time.monotonic()
+        self.finished_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "file": self.file_name,
+            "status": self.status,
+            "rows_parsed": self.rows_parsed,
+            "rows_loaded": self.rows_loaded,
+            "elapsed": round(elapsed, 3),
+            "rows_per_second": round(self.rows_loaded / elapsed, 1) if elapsed > 0 else 0.0
+        }
+
+class EtlJob(LoadProgress):
+    """
+    Run ETL soumis en tâche de fond. Reçoit l'avancement du chargement (LoadProgress)
+    et interrompt le run au prochain chunk ou fichier quand l'annulation est demandée.
+    """
+
+    def __init__(self, params: Dict[str, Any]):
+        self.id = uuid.uuid4().hex
+        self.params = params
+        self.status = JOB_QUEUED
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Optional[Any] = None
+        self.error: Optional[str] = None
+        self.files: "OrderedDict[str, FileProgress]" = OrderedDict()
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    # --- LoadProgress ---
+    def file_started(self, file_name: str) -> None:
+        with self._lock:
+            self.files[file_name] = FileProgress(file_name)
+
+    def rows_parsed(self, file_name: str, count: int) -> None:
+        with self._lock:
+            self._file(file_name).rows_parsed += count
+
+    def rows_loaded(self, file_name: str, count: int) -> None:
+        with self._lock:
+            self._file(file_name).rows_loaded += count
+
+    def file_finished(self, file_name: str, status: str) -> None:
+        with self._lock:
+            progress = self._file(file_name)
+            progress.status = status
+            progress.finished_at = time.monotonic()
+
+    def check_cancelled(self) -> None:
+        if self._cancel_event.is_set():
+            raise LoadCancelled(f"Job ETL {self.id} annulé")
+
+    def _file(self, file_name: str) -> FileProgress:
+        if file_name not in self.files:
+            self.files[file_name] = FileProgress(file_name)
+        return self.files[file_name]
+
+    # --- Cycle de vie ---
+    def request_cancel(self) -> None:
+        self._cancel_event.set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            files = [progress.to_dict() for progress in self.files.values()]
+        end = self.finished_at or datetime.now()
+        elapsed = (end - self.started_at).total_seconds() if self.started_at else 0.0
+        rows_loaded = sum(progress["rows_loaded"] for progress in files)
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "params": self.params,
+            "cancel_requested": self.cancel_requested,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "rows_parsed": sum(progress["rows_parsed"] for progress in files),
+            "rows_loaded": rows_loaded,
+            "rows_per_second": round(rows_loaded / elapsed, 1) if elapsed > 0 else 0.0,
+            "files": files,
+            "result": self.result,
+            "error": self.error
+        }
+
+class EtlJobManager:
+    """
+    File de jobs ETL exécutés dans un pool de threads local : la route rend la main
+    immédiatement et la boucle d'événements reste libre pendant le chargement.
+    Chaque job ouvre sa propre session ; les jobs terminés au-delà de ETL_JOB_HISTORY sont oubliés.
+    """
+
+    def __init__(self, max_workers: int, history: int, session_factory: Callable[[], Session] = SessionLocal):
+        self.history = history
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="etl-job")
+        self._jobs: "OrderedDict[str, EtlJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, run: Callable[[Session, EtlJob], Any], params: Optional[Dict[str, Any]] = None) -> EtlJob:
+        """Met en file run(db, job) et retourne le job sans attendre son exécution."""
+        job = EtlJob(params or {})
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._execute, job, run)
+        return job
+
+    def get(self, job_id: str) -> Optional[EtlJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> List[EtlJob]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> Optional[EtlJob]:
+        """Demande l'annulation ; un job en file est annulé avant de démarrer."""
+        job = self.get(job_id)
+        if job is not None and job.status not in FINISHED_STATUSES:
+            job.request_cancel()
+        return job
+
+    def _execute(self, job: EtlJob, run: Callable[[Session, EtlJob], Any]) -> None:
+        if job.cancel_requested:
+            job.status = JOB_CANCELLED
+            job.finished_at = datetime.now()
+            return
+
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now()
+        logger.info(f"Démarrage du job ETL {job.id} ({job.params})")
+        db = self.session_factory()
+        try:
+            job.result = run(db, job)
+            job.status = JOB_SUCCEEDED
+        except LoadCancelled:
+            db.rollback()
+            job.status = JOB_CANCELLED
+            logger.info(f"Job ETL {job.id} annulé")
+        except Exception as e:
+            db.rollback()
+            job.status = JOB_FAILED
+            job.error = str(e)
+            logger.error(f"Échec du job ETL {job.id}: {e}")
+        finally:
+            db.close()
+            job.finished_at = datetime.now()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+
+etl_jobs = EtlJobManager(max_workers=settings.ETL_JOB_WORKERS, history=settings.ETL_JOB_HISTORY)
@@ -0,0 +1,237 @@
+import cProfile
+import json
+import logging
+import os
+import resource
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Profiler du run ETL en cours dans ce thread, utilisé pour compter les allers-retours en base
+_active_profiler: ContextVar[Optional["EtlProfiler"]] = ContextVar("active_etl_profiler", default=None)
+
+def process_max_rss_mb() -> float:
+    """
+    Pic de mémoire résidente (ru_maxrss) du processus depuis son démarrage, ou de ses workers
+    déjà terminés s'il est plus haut, en Mo : ce n'est pas la consommation propre d'un fichier.
+    """
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024  # ru_maxrss : octets sur macOS, Ko ailleurs
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(own, children) / divisor, 1)
+
+class StageTimer:
+    """Temps cumulé, nombre d'appels et lignes traitées d'une étape."""
+
+    __slots__ = ("seconds", "calls", "rows")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.rows = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "seconds": round(self.seconds, 4),
+            "calls": self.calls,
+            "rows": self.rows,
+            "rows_per_second": round(self.rows / self.seconds, 1) if self.seconds > 0 and self.rows else None
+        }
+
+class FileProfile:
+    """Étapes d'un fichier (ou d'un dataset pour le téléchargement) et allers-retours en base."""
+
+    def __init__(self, dataset: str, file_name: Optional[str]):
+        self.dataset = dataset
+        self.file_name = file_name
+        self.stages: "OrderedDict[str, StageTimer]" = OrderedDict()
+        self.db_round_trips = 0
+        self.db_seconds = 0.0
+        self.process_max_rss_mb = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dataset": self.dataset,
+            "file": self.file_name,
+            "stages": {name: timer.to_dict() for name, timer in self.stages.items()},
+            "db_round_trips": self.db_round_trips,
+            "db_seconds": round(self.db_seconds, 4),
+            "process_max_rss_mb": self.process_max_rss_mb
+        }
+
+class EtlProfiler:
+    """
+    Chronomètre les étapes d'un run ETL (download, read_csv, clean, locations, prepare,
+    db_write, rollup) par dataset et par fichier, avec débit, pic de RSS du processus et
+    nombre de requêtes SQL. Le résumé est ajouté aux résultats du run et, si ETL_PROFILE_DIR
+    est défini, écrit dans un fichier JSON.
+    """
+
+    def __init__(self, profile_dir: Optional[str] = None, cprofile_file: Optional[str] = None):
+        self.profile_dir = profile_dir
+        self.cprofile_file = cprofile_file
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._profiles: "OrderedDict[Tuple[str, Optional[str]], FileProfile]" = OrderedDict()
+        self._current: Optional[FileProfile] = None
+        self._cprofiles: Dict[Tuple[str, Optional[str]], cProfile.Profile] = {}
+        self._run = FileProfile("run", None)
+
+    @contextmanager
+    def activate(self):
+        """Rattache les requêtes SQL du thread courant à ce profiler pendant le run."""
+        token = _active_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _active_profiler.reset(token)
+
+    @contextmanager
+    def track(self, dataset: str, file_name: Optional[str] = None):
+        """Les étapes et requêtes SQL exécutées dans ce bloc sont attribuées à (dataset, fichier)."""
+        profile = self.open_file(dataset, file_name)
+        try:
+            with self.attribute(profile):
+                yield profile
+        finally:
+            self.close_file(profile)
+
+    def open_file(self, dataset: str, file_name: Optional[str] = None) -> FileProfile:
+        """
+        Ouvre le profil d'un fichier, et le dump cProfile s'il s'agit de ETL_CPROFILE_FILE.
+        En mode parallèle, le profil reste ouvert du lancement du worker à l'enregistrement
+        du fichier et chaque chunk y est attribué par attribute().
+        """
+        key = (dataset, file_name)
+        if key not in self._profiles:
+            self._profiles[key] = FileProfile(dataset, file_name)
+        if key not in self._cprofiles and self.cprofile_path(file_name):
+            profiler = _start_cprofile(file_name)
+            if profiler is not None:
+                self._cprofiles[key] = profiler
+        return self._profiles[key]
+
+    def close_file(self, profile: FileProfile) -> None:
+        """Ferme le profil ouvert par open_file : écrit le dump cProfile et relève le pic de RSS."""
+        profiler = self._cprofiles.pop((profile.dataset, profile.file_name), None)
+        if profiler is not None:
+            _dump_cprofile(profiler, self.cprofile_path(profile.file_name))
+        profile.process_max_rss_mb = process_max_rss_mb()
+
+    @contextmanager
+    def attribute(self, profile: FileProfile):
+        """Attribue les étapes et requêtes SQL de ce bloc à un profil ouvert par open_file."""
+        previous, self._current = self._current, profile
+        try:
+            yield profile
+        finally:
+            self._current = previous
+
+    def cprofile_path(self, file_name: Optional[str], suffix: str = "") -> Optional[str]:
+        """Chemin du dump cProfile de file_name, None si ce fichier n'est pas à profiler."""
+        if not file_name or file_name != self.cprofile_file:
+            return None
+        return os.path.join(self.profile_dir or ".", f"{file_name}{suffix}.prof")
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start, rows)
+
+    def add_stage(self, name: str, seconds: float, rows: int = 0) -> None:
+        """Ajoute une durée mesurée ailleurs (par exemple dans un processus worker)."""
+        target = self._current or self._run
+        timer = target.stages.setdefault(name, StageTimer())
+        timer.seconds += seconds
+        timer.calls += 1
+        timer.rows += rows
+
+    def record_query(self, seconds: float) -> None:
+        target = self._current or self._run
+        target.db_round_trips += 1
+        target.db_seconds += seconds
+
+    def file_profile(self, dataset: str, file_name: Optional[str]) -> Optional[Dict[str, Any]]:
+        profile = self._profiles.get((dataset, file_name))
+        return profile.to_dict() if profile else None
+
+    def summary(self) -> Dict[str, Any]:
+        profiles = [self._run] + list(self._profiles.values())
+        stages: "OrderedDict[str, StageTimer]" = OrderedDict()
+        for profile in profiles:
+            for name, timer in profile.stages.items():
+                total = stages.setdefault(name, StageTimer())
+                total.seconds += timer.seconds
+                total.calls += timer.calls
+                total.rows += timer.rows
+        return {
+            "started_at": self.started_at.isoformat(),
+            "total_seconds": round(time.perf_counter() - self._start, 4),
+            "process_max_rss_mb": process_max_rss_mb(),
+            "db_round_trips": sum(profile.db_round_trips for profile in profiles),
+            "db_seconds": round(sum(profile.db_seconds for profile in profiles), 4),
+            "stages": {name: timer.to_dict() for name, timer in stages.items()},
+            "run": self._run.to_dict(),
+            "files": [profile.to_dict() for profile in self._profiles.values()]
+        }
+
+    def write(self) -> Optional[str]:
+        """Écrit le résumé dans ETL_PROFILE_DIR et retourne le chemin du fichier."""
+        if not self.profile_dir:
+            return None
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"etl_profile_{self.started_at:%Y%m%d_%H%M%S}.json")
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        logger.info(f"Profil ETL écrit dans {path}")
+        return path
+
+def _start_cprofile(file_name: str) -> Optional[cProfile.Profile]:
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Un autre profiler est déjà actif dans ce thread
+        logger.warning(f"cProfile indisponible pour {file_name}: {e}")
+        return None
+    return profiler
+
+def _dump_cprofile(profiler: cProfile.Profile, path: str) -> None:
+    profiler.disable()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    profiler.dump_stats(path)
+    logger.info(f"Profil cProfile écrit dans {path}")
+
+@contextmanager
+def cprofiled(path: Optional[str]):
+    """Profile ce bloc avec cProfile et écrit le dump dans path ; sans effet si path est None."""
+    profiler = _start_cprofile(os.path.basename(path)) if path else None
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            _dump_cprofile(profiler, path)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _active_profiler.get() is not None:
+        conn.info.setdefault("etl_profiler_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiler = _active_profiler.get()
+    starts = conn.info.get("etl_profiler_start")
+    if profiler is not None and starts:
+        profiler.record_query(time.perf_counter() - starts.pop())
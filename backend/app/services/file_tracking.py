@@ -0,0 +1,95 @@
+import os
+import hashlib
+import logging
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..db.models.base import DataSourceFile
+
+logger = logging.getLogger(__name__)
+
+FILE_NEW = "new"
+FILE_UNCHANGED = "unchanged"
+FILE_APPENDED = "appended"
+FILE_MODIFIED = "modified"
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+def hash_file(path: str, limit: Optional[int] = None) -> str:
+    """
+    Calcule le SHA-256 d'un fichier, ou de ses limit premiers octets.
+    """
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, "rb") as handle:
+        while remaining is None or remaining > 0:
+            size = HASH_BLOCK_SIZE if remaining is None else min(HASH_BLOCK_SIZE, remaining)
+            block = handle.read(size)
+            if not block:
+                break
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest()
+
+def get_tracked_file(db: Session, source_id: int, file_name: str) -> Optional[DataSourceFile]:
+    return db.query(DataSourceFile).filter(
+        DataSourceFile.id_source == source_id,
+        DataSourceFile.file_name == file_name
+    ).first()
+
+def check_file(db: Session, source_id: int, path: str) -> Tuple[str, Dict, Optional[DataSourceFile]]:
+    """
+    Compare un fichier à l'empreinte enregistrée lors du dernier chargement.
+    Retourne (statut, empreinte courante, enregistrement précédent).
+    Le hash n'est calculé que si la taille ou la date de modification ont changé.
+    """
+    stat = os.stat(path)
+    tracked = get_tracked_file(db, source_id, os.path.basename(path))
+
+    if tracked and tracked.size == stat.st_size and tracked.mtime_ns == stat.st_mtime_ns:
+        fingerprint = {"size": tracked.size, "mtime_ns": tracked.mtime_ns, "content_hash": tracked.content_hash}
+        return FILE_UNCHANGED, fingerprint, tracked
+
+    fingerprint = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "content_hash": hash_file(path)}
+    if tracked is None:
+        return FILE_NEW, fingerprint, None
+    if fingerprint["content_hash"] == tracked.content_hash:
+        return FILE_UNCHANGED, fingerprint, tracked
+    # Fichier en ajout seul : l'ancien contenu est un préfixe du nouveau
+    if stat.st_size > tracked.size and hash_file(path, tracked.size) == tracked.content_hash:
+        return FILE_APPENDED, fingerprint, tracked
+    return FILE_MODIFIED, fingerprint, tracked
+
+def record_file(
+    db: Session,
+    source_id: int,
+    path: str,
+    fingerprint: Dict,
+    row_count: int,
+    last_date: Optional[date]
+) -> DataSourceFile:
+    """
+    Enregistre l'empreinte d'un fichier après un chargement réussi.
+    """
+    file_name = os.path.basename(path)
+    tracked = get_tracked_file(db, source_id, file_name)
+    if tracked is None:
+        tracked = DataSourceFile(id_source=source_id, file_name=file_name)
+        db.add(tracked)
+
+    tracked.size = fingerprint["size"]
+    tracked.mtime_ns = fingerprint["mtime_ns"]
+    tracked.content_hash = fingerprint["content_hash"]
+    tracked.row_count = row_count
+    tracked.last_date = last_date
+    tracked.loaded_at = datetime.now()
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur lors de l'enregistrement de l'empreinte de {file_name}: {e}")
+        raise
+    return tracked
@@ -0,0 +1,49 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..core.config.settings import settings
+from .etl_profiler import EtlProfiler
+from .location_resolver import LocationResolver
+
+class LoadCancelled(Exception):
+    """Levée entre deux fichiers ou deux chunks quand l'annulation d'un run ETL a été demandée."""
+
+class LoadProgress:
+    """
+    Suivi de l'avancement d'un run ETL fichier par fichier. Cette implémentation ne fait rien ;
+    les jobs ETL (services/etl_jobs.py) la surchargent pour exposer la progression et l'annulation.
+    """
+
+    def file_started(self, file_name: str) -> None:
+        pass
+
+    def rows_parsed(self, file_name: str, count: int) -> None:
+        pass
+
+    def rows_loaded(self, file_name: str, count: int) -> None:
+        pass
+
+    def file_finished(self, file_name: str, status: str) -> None:
+        pass
+
+    def check_cancelled(self) -> None:
+        pass
+
+class LoadContext:
+    """
+    État partagé par tous les fichiers d'un même run ETL : cache des localisations,
+    dates modifiées par épidémie, à rafraîchir dans daily_global_rollup en fin de run,
+    suivi de l'avancement et chronométrage des étapes.
+    """
+
+    def __init__(self, db: Session, progress: Optional[LoadProgress] = None, profiler: Optional[EtlProfiler] = None):
+        self.location_resolver = LocationResolver(db)
+        self.affected_dates: Dict[int, Set[date]] = defaultdict(set)
+        self.progress = progress or LoadProgress()
+        self.profiler = profiler or EtlProfiler(settings.ETL_PROFILE_DIR, settings.ETL_CPROFILE_FILE)
+
+    def mark_dates(self, epidemic_id: int, dates: Iterable[date]) -> None:
+        self.affected_dates[epidemic_id].update(dates)
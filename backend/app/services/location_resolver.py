@@ -0,0 +1,138 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import backoff
+import pandas as pd
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from ..db.models.base import Localisation
+
+logger = logging.getLogger(__name__)
+
+REGION_COLUMNS = ('region', 'state', 'province')
+ISO_CODE_COLUMNS = ('iso_code', 'iso', 'code')
+
+LocationKey = Tuple[str, Optional[str], Optional[str]]
+
+def _clean_value(value) -> Optional[str]:
+    if value is None or pd.isna(value):
+        return None
+    return str(value)
+
+class LocationResolver:
+    """
+    Cache mémoire des localisations, partagé entre les fichiers d'un même run ETL.
+    Toutes les localisations sont préchargées une fois ; celles qui manquent sont
+    créées en une seule insertion groupée par fichier.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._by_key: Dict[LocationKey, int] = {}
+        self._by_iso: Dict[str, int] = {}
+        self._by_country: Dict[str, int] = {}
+        self.load()
+
+    def load(self) -> None:
+        """
+        (Re)charge toutes les localisations existantes.
+        """
+        self._by_key.clear()
+        self._by_iso.clear()
+        self._by_country.clear()
+        rows = self.db.query(Localisation.id, Localisation.country, Localisation.region, Localisation.iso_code).all()
+        for row in rows:
+            self._register(row.id, row.country, row.region, row.iso_code)
+        logger.info(f"{len(rows)} localisations préchargées")
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def _register(self, location_id: int, country: str, region: Optional[str], iso_code: Optional[str]) -> None:
+        self._by_key[(country, region, iso_code)] = location_id
+        if iso_code:
+            self._by_iso.setdefault(iso_code, location_id)
+        self._by_country.setdefault(country, location_id)
+
+    def lookup(self, country: str, region: Optional[str] = None, iso_code: Optional[str] = None) -> Optional[int]:
+        """
+        Retrouve une localisation connue : clé complète, puis code ISO, puis nom de pays.
+        """
+        location_id = self._by_key.get((country, region, iso_code))
+        if location_id is None and iso_code:
+            location_id = self._by_iso.get(iso_code)
+        if location_id is None:
+            location_id = self._by_country.get(country)
+        return location_id
+
+    def resolve(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Retourne l'identifiant de localisation de chaque ligne d'un dataset nettoyé.
+        Les localisations inconnues sont créées en une seule fois.
+        """
+        locations = data['location'].fillna("Unknown").astype(str)
+        locations = locations.mask(locations.str.strip() == "", "Unknown")
+
+        details = self._location_details(data, locations)
+        missing = [record for record in details if self.lookup(*record) is None]
+        if missing:
+            self._create(missing)
+
+        location_ids = {record[0]: self.lookup(*record) for record in details}
+        return locations.map(location_ids)
+
+    def _location_details(self, data: pd.DataFrame, locations: pd.Series) -> List[LocationKey]:
+        """
+        Extrait (pays, région, code ISO) pour chaque localisation distincte du dataset.
+        """
+        firsts = ~locations.duplicated()
+        uniques = data.loc[firsts]
+
+        def first_available(columns):
+            columns = [col for col in columns if col in uniques.columns]
+            if not columns:
+                return [None] * len(uniques)
+            return uniques[columns].bfill(axis=1).iloc[:, 0].tolist()
+
+        return [
+            (country, _clean_value(region), _clean_value(iso_code))
+            for country, region, iso_code in zip(
+                locations[firsts].tolist(),
+                first_available(REGION_COLUMNS),
+                first_available(ISO_CODE_COLUMNS)
+            )
+        ]
+
+    @backoff.on_exception(backoff.expo, OperationalError, max_tries=5)
+    def _create(self, records: List[LocationKey]) -> None:
+        """
+        Insère les localisations manquantes en une requête, puis récupère leurs identifiants.
+        """
+        rows = {}
+        used_iso_codes = set(self._by_iso)
+        for country, region, iso_code in records:
+            if country in rows:
+                continue
+            # iso_code est unique en base : on ne le réutilise pas
+            if iso_code in used_iso_codes:
+                iso_code = None
+            if iso_code:
+                used_iso_codes.add(iso_code)
+            rows[country] = {"country": country, "region": region, "iso_code": iso_code}
+
+        try:
+            self.db.execute(insert(Localisation), list(rows.values()))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Erreur lors de la création de {len(rows)} localisations: {e}")
+            raise
+
+        created = self.db.query(Localisation.id, Localisation.country, Localisation.region, Localisation.iso_code)\
+            .filter(Localisation.country.in_(list(rows)))\
+            .all()
+        for row in created:
+            self._register(row.id, row.country, row.region, row.iso_code)
+        logger.info(f"{len(rows)} nouvelles localisations créées")
@@ -0,0 +1,197 @@
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List
+
+from sqlalchemy import bindparam, case, func, insert, tuple_, update
+from sqlalchemy.orm import Session
+
+from ..db.models.base import DailyStats, Epidemic, OverallStats
+from ..db.partitioning import daily_key_includes_source
+
+logger = logging.getLogger(__name__)
+
+# {id_epidemic: [variation des cas, variation des décès]}
+StatsDeltas = Dict[int, List[int]]
+
+def compute_batch_deltas(db: Session, rows: list) -> StatsDeltas:
+    """
+    Calcule, par épidémie, la variation de SUM(cases) / SUM(deaths) qu'entraînera l'upsert d'un lot :
+    nouvelles valeurs du lot moins les valeurs déjà en base pour les mêmes clés.
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for row in rows:
+        deltas[row['id_epidemic']][0] += row.get('cases') or 0
+        deltas[row['id_epidemic']][1] += row.get('deaths') or 0
+
+    # Mêmes colonnes que la clé unique de l'upsert (id_source en plus en mode partitionné par source)
+    key_fields = ['id_epidemic', 'id_loc', 'date']
+    if daily_key_includes_source(db):
+        key_fields.append('id_source')
+    keys = [tuple(row[field] for field in key_fields) for row in rows]
+    existing = db.query(
+        DailyStats.id_epidemic,
+        func.sum(DailyStats.cases).label('cases'),
+        func.sum(DailyStats.deaths).label('deaths')
+    ).filter(
+        tuple_(*(getattr(DailyStats, field) for field in key_fields)).in_(keys)
+    ).group_by(DailyStats.id_epidemic).all()
+
+    for stat in existing:
+        deltas[stat.id_epidemic][0] -= int(stat.cases or 0)
+        deltas[stat.id_epidemic][1] -= int(stat.deaths or 0)
+    return dict(deltas)
+
+def compute_deleted_deltas(db: Session, *criteria) -> StatsDeltas:
+    """
+    Variation négative correspondant à la suppression des DailyStats filtrées par criteria.
+    """
+    removed = db.query(
+        DailyStats.id_epidemic,
+        func.sum(DailyStats.cases).label('cases'),
+        func.sum(DailyStats.deaths).label('deaths')
+    ).filter(*criteria).group_by(DailyStats.id_epidemic).all()
+    return {stat.id_epidemic: [-int(stat.cases or 0), -int(stat.deaths or 0)] for stat in removed}
+
+def apply_overall_stats_deltas(db: Session, deltas: StatsDeltas) -> None:
+    """
+    Applique les variations aux OverallStats et aux totaux dénormalisés des épidémies
+    (total_cases, total_deaths, mortality_rate) dans la transaction courante (sans commit).
+    Une épidémie sans OverallStats est initialisée à partir de ses DailyStats déjà écrites.
+    transmission_rate ne se déduit pas des variations : seul calculate_overall_stats le recalcule.
+    """
+    changed = [epidemic_id for epidemic_id, (cases, deaths) in deltas.items() if cases or deaths]
+    if not changed:
+        return
+
+    for epidemic_id in changed:
+        cases, deaths = deltas[epidemic_id]
+        result = db.execute(
+            update(OverallStats)
+            .where(OverallStats.id_epidemic == epidemic_id)
+            .values(
+                total_cases=func.coalesce(OverallStats.total_cases, 0) + cases,
+                total_deaths=func.coalesce(OverallStats.total_deaths, 0) + deaths
+            )
+            .execution_options(synchronize_session=False)
+        )
+        epidemic_totals = {
+            "total_cases": func.coalesce(Epidemic.total_cases, 0) + cases,
+            "total_deaths": func.coalesce(Epidemic.total_deaths, 0) + deaths
+        }
+        if result.rowcount == 0:
+            totals = db.query(
+                func.sum(DailyStats.cases).label('cases'),
+                func.sum(DailyStats.deaths).label('deaths')
+            ).filter(DailyStats.id_epidemic == epidemic_id).one()
+            db.add(OverallStats(
+                id_epidemic=epidemic_id,
+                total_cases=int(totals.cases or 0),
+                total_deaths=int(totals.deaths or 0)
+            ))
+            epidemic_totals = {"total_cases": int(totals.cases or 0), "total_deaths": int(totals.deaths or 0)}
+        db.execute(
+            update(Epidemic)
+            .where(Epidemic.id == epidemic_id)
+            .values(**epidemic_totals)
+            .execution_options(synchronize_session=False)
+        )
+
+    db.flush()
+    refresh_fatality_ratios(db, changed)
+
+def refresh_fatality_ratios(db: Session, epidemic_ids: list) -> None:
+    """Recalcule fatality_ratio (OverallStats) et mortality_rate (Epidemic) à partir des totaux."""
+    db.execute(
+        update(OverallStats)
+        .where(OverallStats.id_epidemic.in_(epidemic_ids))
+        .values(fatality_ratio=case(
+            (OverallStats.total_cases > 0, OverallStats.total_deaths * 100.0 / OverallStats.total_cases),
+            else_=0.0
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(
+        update(Epidemic)
+        .where(Epidemic.id.in_(epidemic_ids))
+        .values(mortality_rate=case(
+            (Epidemic.total_cases > 0, Epidemic.total_deaths * 100.0 / Epidemic.total_cases),
+            else_=0.0
+        ))
+        .execution_options(synchronize_session=False)
+    )
+
+def refresh_epidemic_totals(db: Session, epidemic_ids: Iterable[int]) -> int:
+    """
+    Recalcule les colonnes dénormalisées des épidémies données (total_cases, total_deaths,
+    mortality_rate, transmission_rate) en une seule requête groupée sur daily_stats, et aligne
+    leurs OverallStats sur les mêmes totaux. Reconstruction complète utilisée par
+    calculate_overall_stats ; l'ETL et PUT /daily-stats/{id} appliquent des variations
+    (apply_overall_stats_deltas). S'exécute dans la transaction courante (sans commit).
+    Retourne le nombre d'épidémies mises à jour.
+    """
+    ids = sorted(set(epidemic_ids))
+    if not ids:
+        return 0
+
+    # Les sessions de l'application n'ont pas d'autoflush : les DailyStats en attente doivent être écrites
+    db.flush()
+    totals = db.query(
+        Epidemic.id,
+        func.sum(DailyStats.cases).label('cases'),
+        func.sum(DailyStats.deaths).label('deaths'),
+        func.avg(DailyStats.new_cases * 100.0 / func.nullif(DailyStats.cases, 0)).label('transmission_rate')
+    ).outerjoin(
+        DailyStats, DailyStats.id_epidemic == Epidemic.id
+    ).filter(Epidemic.id.in_(ids)).group_by(Epidemic.id).all()
+    if not totals:
+        return 0
+
+    values = []
+    for stat in totals:
+        cases, deaths = int(stat.cases or 0), int(stat.deaths or 0)
+        values.append({
+            "b_id": stat.id,
+            "b_cases": cases,
+            "b_deaths": deaths,
+            "b_mortality": (deaths / cases * 100) if cases > 0 else 0.0,
+            "b_transmission": float(stat.transmission_rate or 0)
+        })
+
+    epidemic = Epidemic.__table__
+    db.execute(
+        update(epidemic).where(epidemic.c.id == bindparam("b_id")).values(
+            total_cases=bindparam("b_cases"),
+            total_deaths=bindparam("b_deaths"),
+            mortality_rate=bindparam("b_mortality"),
+            transmission_rate=bindparam("b_transmission")
+        ),
+        values
+    )
+
+    overall = OverallStats.__table__
+    existing = {
+        epidemic_id for epidemic_id, in
+        db.query(OverallStats.id_epidemic).filter(OverallStats.id_epidemic.in_(ids)).distinct()
+    }
+    if existing:
+        db.execute(
+            update(overall).where(overall.c.id_epidemic == bindparam("b_id")).values(
+                total_cases=bindparam("b_cases"),
+                total_deaths=bindparam("b_deaths"),
+                fatality_ratio=bindparam("b_mortality")
+            ),
+            [value for value in values if value["b_id"] in existing]
+        )
+    missing = [value for value in values if value["b_id"] not in existing]
+    if missing:
+        db.execute(insert(overall), [
+            {
+                "id_epidemic": value["b_id"],
+                "total_cases": value["b_cases"],
+                "total_deaths": value["b_deaths"],
+                "fatality_ratio": value["b_mortality"]
+            }
+            for value in missing
+        ])
+
+    return len(values)
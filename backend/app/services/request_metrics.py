@@ -0,0 +1,179 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+class RequestStats:
+    """Requêtes SQL émises pendant le traitement d'une requête HTTP."""
+
+    __slots__ = ("statements", "db_time", "rows")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+
+
+# Statistiques de la requête HTTP en cours ; partagées avec le thread des routes synchrones
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+class _Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+class _RouteMetrics:
+    def __init__(self):
+        self.latency = _Histogram(LATENCY_BUCKETS)
+        self.statements = _Histogram(STATEMENT_BUCKETS)
+        self.db_time = 0.0
+        self.rows = 0
+
+class RequestMetrics:
+    """
+    Métriques par route (méthode, chemin déclaré, statut) : histogrammes de latence et
+    de nombre de requêtes SQL, temps total passé en base et lignes renvoyées.
+    Exposées au format texte Prometheus par render().
+    """
+
+    def __init__(self):
+        self._routes: Dict[Tuple[str, str, str], _RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def start_request(self) -> Tuple[RequestStats, object]:
+        stats = RequestStats()
+        return stats, _current_request.set(stats)
+
+    def end_request(self, token) -> None:
+        _current_request.reset(token)
+
+    def record(self, method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            metrics = self._routes.setdefault(key, _RouteMetrics())
+            metrics.latency.observe(duration)
+            metrics.statements.observe(stats.statements)
+            metrics.db_time += stats.db_time
+            metrics.rows += stats.rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines: List[str] = []
+            self._render_histogram(lines, routes, "http_request_duration_seconds",
+                                   "Durée de traitement des requêtes HTTP", lambda m: m.latency)
+            self._render_histogram(lines, routes, "http_request_sql_statements",
+                                   "Nombre de requêtes SQL par requête HTTP", lambda m: m.statements)
+            lines.append("# HELP http_request_db_seconds_total Temps passé en base par les requêtes HTTP")
+            lines.append("# TYPE http_request_db_seconds_total counter")
+            for key, metrics in routes:
+                lines.append(f"http_request_db_seconds_total{{{_labels(key)}}} {metrics.db_time:.6f}")
+            lines.append("# HELP http_request_db_rows_total Lignes renvoyées par la base aux requêtes HTTP")
+            lines.append("# TYPE http_request_db_rows_total counter")
+            for key, metrics in routes:
+                lines.append(f"http_request_db_rows_total{{{_labels(key)}}} {metrics.rows}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_histogram(lines: List[str], routes, name: str, help_text: str, select) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for key, metrics in routes:
+            histogram = select(metrics)
+            labels = _labels(key)
+            cumulative = 0
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            cumulative += histogram.counts[-1]
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {cumulative}")
+
+class RequestMetricsMiddleware:
+    """
+    Middleware ASGI des métriques par route. La requête est comptabilisée au dernier message
+    http.response.body et non au retour de l'application : les requêtes SQL émises pendant
+    l'envoi d'une réponse en flux (StreamingResponse) sont incluses.
+    """
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = self.metrics.start_request()
+        start = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def record() -> None:
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            # Chemin déclaré de la route (/epidemics/{epidemic_id}) pour borner le nombre de séries
+            route = scope.get("route")
+            self.metrics.record(
+                scope["method"], getattr(route, "path", "unmatched"), status, time.perf_counter() - start, stats
+            )
+
+        async def send_with_metrics(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            self.metrics.end_request(token)
+            # Erreur avant la fin de la réponse : la requête est comptée avec le dernier statut connu
+            record()
+
+def _labels(key: Tuple[str, str, str]) -> str:
+    method, route, status = key
+    route = route.replace("\\", "\\\\").replace('"', '\\"')
+    return f'method="{method}",route="{route}",status="{status}"'
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_request.get() is not None:
+        conn.info.setdefault("request_metrics_start", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    starts = conn.info.get("request_metrics_start")
+    if stats is None or not starts:
+        return
+    stats.statements += 1
+    stats.db_time += time.perf_counter() - starts.pop()
+    # rowcount vaut -1 quand le pilote ne connaît pas le nombre de lignes (curseur côté serveur)
+    if cursor.rowcount and cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+request_metrics = RequestMetrics()
@@ -1,7 +1,31 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func, distinct, desc
 from typing import List, Dict, Any
-from ..db.models.base import Epidemic, DailyStats, Localisation
+from ..db.models.base import Epidemic, DailyStats, DailyGlobalRollup, Localisation
+
+# Sections indépendantes du tableau de bord et méthode qui calcule chacune d'elles
+DASHBOARD_SECTIONS = {
+    "global_stats": "_get_global_stats",
+    "type_distribution": "_get_type_distribution",
+    "geographic_distribution": "_get_geographic_distribution",
+    "daily_evolution": "_get_daily_evolution",
+    "top_active_epidemics": "_get_top_active_epidemics"
+}
+
+# Valeur servie pour une section dont la requête a échoué ou expiré
+DASHBOARD_FALLBACKS = {
+    "global_stats": {
+        "total_cases": 0,
+        "total_deaths": 0,
+        "total_epidemics": 0,
+        "active_epidemics": 0,
+        "mortality_rate": 0.0
+    },
+    "type_distribution": [],
+    "geographic_distribution": [],
+    "daily_evolution": [],
+    "top_active_epidemics": []
+}
 
 class StatsService:
     def __init__(self, db: Session):
@@ -11,13 +35,14 @@ class StatsService:
         """
         Récupère toutes les statistiques pour le tableau de bord
         """
-        return {
-            "global_stats": self._get_global_stats(),
-            "type_distribution": self._get_type_distribution(),
-            "geographic_distribution": self._get_geographic_distribution(),
-            "daily_evolution": self._get_daily_evolution(),
-            "top_active_epidemics": self._get_top_active_epidemics()
-        }
+        return {name: self.get_section(name) for name in DASHBOARD_SECTIONS}
+
+    def get_section(self, name: str) -> Any:
+        """
+        Calcule une seule section du tableau de bord (exécutée en parallèle des autres
+        par DashboardQueryExecutor)
+        """
+        return getattr(self, DASHBOARD_SECTIONS[name])()
 
     def _get_global_stats(self) -> Dict[str, Any]:
         """
@@ -95,25 +120,17 @@ class StatsService:
 
     def _get_daily_evolution(self) -> List[Dict[str, Any]]:
         """
-        Récupère l'évolution quotidienne des cas sur les 30 derniers jours
+        Récupère l'évolution quotidienne des cas depuis le cumul matérialisé daily_global_rollup
         """
-        # Récupérer toutes les dates disponibles
-        dates = self.db.query(
-            DailyStats.date
-        ).distinct().order_by(DailyStats.date.asc()).all()
-        
-        if not dates:
-            return []
-
         results = self.db.query(
-            DailyStats.date,
-            func.sum(DailyStats.new_cases).label('new_cases'),
-            func.sum(DailyStats.new_deaths).label('new_deaths'),
-            func.sum(DailyStats.active).label('active_cases')
+            DailyGlobalRollup.date,
+            func.sum(DailyGlobalRollup.new_cases).label('new_cases'),
+            func.sum(DailyGlobalRollup.new_deaths).label('new_deaths'),
+            func.sum(DailyGlobalRollup.active).label('active_cases')
         ).group_by(
-            DailyStats.date
+            DailyGlobalRollup.date
         ).order_by(
-            DailyStats.date.asc()
+            DailyGlobalRollup.date.asc()
         ).all()
 
         return [
@@ -1,5 +1,6 @@
 import pandas as pd
 from datetime import datetime
+from typing import Dict, Optional
 
 def clean_date_string(date_str):
     """Convertit une chaîne de date en format ISO."""
@@ -25,6 +26,46 @@ def clean_date_string(date_str):
     except ValueError:
         return None
 
+
+DATE_FORMATS = [
+    '%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y',
+    '%d-%m-%Y', '%m-%d-%Y', '%Y/%m/%d', 'ISO8601'
+]
+
+def detect_date_format(values: pd.Series, sample_size: int = 200) -> Optional[str]:
+    """Détecte le format de date d'une colonne à partir d'un échantillon."""
+    sample = values.dropna().astype(str).head(sample_size)
+    if sample.empty:
+        return None
+
+    best_format, best_count = None, 0
+    for fmt in DATE_FORMATS:
+        count = pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum()
+        if count > best_count:
+            best_format, best_count = fmt, count
+        if best_count == len(sample):
+            break
+    return best_format
+
+def normalize_dates(values: pd.Series) -> pd.Series:
+    """
+    Convertit une colonne de dates en datetime64 (à minuit) en un seul appel vectorisé.
+    Seules les lignes qui ne respectent pas le format détecté passent par clean_date_string.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.dt.normalize()
+
+    fmt = detect_date_format(values)
+    if fmt:
+        parsed = pd.to_datetime(values, format=fmt, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+    failed = parsed.isna() & values.notna()
+    if failed.any():
+        parsed[failed] = pd.to_datetime(values[failed].map(clean_date_string), errors='coerce')
+    return parsed.dt.normalize()
+
 def clean_numeric_value(value):
     """Convertit une valeur en entier de manière sécurisée."""
     try:
@@ -82,9 +123,33 @@ def map_columns(df: pd.DataFrame, dataset_type: str) -> pd.DataFrame:
                 break
     return df
 
-def clean_dataset(df: pd.DataFrame, dataset_type: str = None, file_name: str = "") -> pd.DataFrame:
+def diff_by_location(df: pd.DataFrame, column: str, previous: Optional[Dict] = None) -> pd.Series:
+    """
+    Calcule la variation d'une colonne cumulée par localisation.
+    Si previous est fourni, il contient la dernière valeur connue de chaque localisation
+    (chunk précédent) et il est mis à jour avec les dernières valeurs de ce chunk.
+    """
+    grouped = df.groupby('location')[column]
+    diff = grouped.diff()
+
+    if previous:
+        first_rows = diff.isna()
+        diff[first_rows] = df.loc[first_rows, column] - df.loc[first_rows, 'location'].map(previous)
+
+    if previous is not None:
+        previous.update(grouped.last().to_dict())
+
+    return diff.fillna(0).astype(int)
+
+def clean_dataset(
+    df: pd.DataFrame, dataset_type: str = None, file_name: str = "", state: Optional[Dict] = None
+) -> pd.DataFrame:
     """
     Nettoie et normalise le dataset en fonction de son type.
+    Pour un fichier lu par chunks, passer le même dictionnaire state à chaque appel
+    afin que les variations par localisation restent correctes d'un chunk à l'autre.
+    Les colonnes de variation à calculer (new_cases, new_deaths absentes ou vides) sont
+    choisies sur le premier chunk et conservées dans state pour tout le fichier.
     """
     df = handle_special_cases(df, dataset_type, file_name)
 
@@ -93,7 +158,7 @@ def clean_dataset(df: pd.DataFrame, dataset_type: str = None, file_name: str = "
         raise ValueError("Aucune colonne de date trouvée dans le dataset")
     date_col = date_columns[0]
 
-    df['date'] = df[date_col].apply(clean_date_string)
+    df['date'] = normalize_dates(df[date_col])
     df = df.dropna(subset=['date'])
 
     location_columns = [
@@ -107,6 +172,15 @@ def clean_dataset(df: pd.DataFrame, dataset_type: str = None, file_name: str = "
 
     df = map_columns(df, dataset_type)
 
+    derived_columns = state.get('derived_columns') if state is not None else None
+    if derived_columns is None:
+        derived_columns = {
+            target: source for target, source in (('new_cases', 'cases'), ('new_deaths', 'deaths'))
+            if target not in df.columns or df[target].isna().all()
+        }
+        if state is not None:
+            state['derived_columns'] = derived_columns
+
     numeric_columns = ['cases', 'deaths', 'recovered', 'active', 'new_cases', 'new_deaths']
     for col in numeric_columns:
         if col in df.columns:
@@ -118,10 +192,9 @@ def clean_dataset(df: pd.DataFrame, dataset_type: str = None, file_name: str = "
         df['active'] = df['cases'] - df['deaths'] - df['recovered']
         df['active'] = df['active'].clip(lower=0)
 
-    if 'new_cases' not in df.columns or df['new_cases'].isna().all():
-        df['new_cases'] = df.groupby('location')['cases'].diff().fillna(0).astype(int)
-    if 'new_deaths' not in df.columns or df['new_deaths'].isna().all():
-        df['new_deaths'] = df.groupby('location')['deaths'].diff().fillna(0).astype(int)
+    for target, source in derived_columns.items():
+        previous = state.setdefault(source, {}) if state is not None else None
+        df[target] = diff_by_location(df, source, previous)
 
     required_columns = ['date', 'location', 'cases', 'deaths', 'recovered', 'active', 'new_cases', 'new_deaths']
     for col in required_columns:
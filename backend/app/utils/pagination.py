@@ -0,0 +1,36 @@
+import base64
+import json
+from typing import Any, Dict
+
+from sqlalchemy import and_, or_
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """Encode un curseur de pagination opaque (JSON en base64 url-safe)."""
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Décode un curseur produit par encode_cursor ; lève ValueError s'il est invalide."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception as e:
+        raise ValueError(f"Curseur invalide: {e}")
+    if not isinstance(payload, dict):
+        raise ValueError("Curseur invalide")
+    return payload
+
+def keyset_filter(column, id_column, value, last_id: int, descending: bool = False):
+    """
+    Condition de reprise après la ligne (value, last_id) pour un tri sur (column, id_column).
+    Les NULL sont considérés comme les plus petites valeurs (ordre MySQL / SQLite) :
+    en premier en tri croissant, en dernier en tri décroissant.
+    """
+    if not descending:
+        if value is None:
+            return or_(and_(column.is_(None), id_column > last_id), column.isnot(None))
+        return or_(column > value, and_(column == value, id_column > last_id))
+
+    if value is None:
+        return and_(column.is_(None), id_column < last_id)
+    return or_(column < value, and_(column == value, id_column < last_id), column.is_(None))
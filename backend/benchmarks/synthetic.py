@@ -0,0 +1,102 @@
+import os
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+START_DATE = "2020-01-22"
+
+# Nom du fichier principal de chaque dataset Kaggle et colonnes dans leur ordre d'origine
+DATASET_LAYOUTS = {
+    "mpox": ("owid-monkeypox-data.csv", {
+        "location": "location",
+        "iso_code": "iso_code",
+        "date": "date",
+        "total_cases": "cases",
+        "total_deaths": "deaths",
+        "new_cases": "new_cases",
+        "new_deaths": "new_deaths",
+    }),
+    "covid19": ("worldometer_coronavirus_daily_data.csv", {
+        "date": "date",
+        "country": "location",
+        "total_cases": "cases",
+        "new_cases": "new_cases",
+        "active_cases": "active",
+        "total_deaths": "deaths",
+        "new_deaths": "new_deaths",
+        "total_recovered": "recovered",
+    }),
+    "corona": ("full_grouped.csv", {
+        "Date": "date",
+        "Country/Region": "location",
+        "Confirmed": "cases",
+        "Deaths": "deaths",
+        "Recovered": "recovered",
+        "Active": "active",
+        "New cases": "new_cases",
+        "New deaths": "new_deaths",
+        "New recovered": "new_recovered",
+        "WHO Region": "who_region",
+    }),
+}
+
+WHO_REGIONS = ("Africa", "Americas", "Eastern Mediterranean", "Europe", "South-East Asia", "Western Pacific")
+
+def synthetic_series(rows: int, locations: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Séries quotidiennes cumulées pour `locations` localisations (environ rows / locations jours
+    chacune), triées par localisation puis par date comme les fichiers OWID et Worldometer.
+    """
+    rng = np.random.default_rng(seed)
+    locations = max(1, min(locations, rows))
+    days = -(-rows // locations)
+
+    new_cases = rng.poisson(50, size=(locations, days))
+    new_deaths = rng.binomial(new_cases, 0.02)
+    new_recovered = rng.binomial(new_cases, 0.8)
+    cases = new_cases.cumsum(axis=1)
+    deaths = new_deaths.cumsum(axis=1)
+    recovered = new_recovered.cumsum(axis=1)
+
+    names = np.array([f"Country {index:04d}" for index in range(locations)])
+    codes = np.array([f"C{index:04d}" for index in range(locations)])
+    regions = np.array([WHO_REGIONS[index % len(WHO_REGIONS)] for index in range(locations)])
+    dates = pd.date_range(START_DATE, periods=days).strftime("%Y-%m-%d").to_numpy()
+
+    return pd.DataFrame({
+        "location": np.repeat(names, days),
+        "iso_code": np.repeat(codes, days),
+        "who_region": np.repeat(regions, days),
+        "date": np.tile(dates, locations),
+        "cases": cases.ravel(),
+        "deaths": deaths.ravel(),
+        "recovered": recovered.ravel(),
+        "active": (cases - deaths - recovered).ravel(),
+        "new_cases": new_cases.ravel(),
+        "new_deaths": new_deaths.ravel(),
+        "new_recovered": new_recovered.ravel(),
+    }).head(rows)
+
+def generate_dataset(dataset_type: str, rows: int, locations: int, seed: int = 0) -> pd.DataFrame:
+    """Dataset synthétique au format du fichier Kaggle de dataset_type."""
+    _, columns = DATASET_LAYOUTS[dataset_type]
+    series = synthetic_series(rows, locations, seed)
+    return pd.DataFrame({column: series[source] for column, source in columns.items()})
+
+def write_datasets(
+    directory: str, rows: int, locations: int, seed: int = 0, datasets: Iterable[str] = DATASET_LAYOUTS
+) -> Dict[str, str]:
+    """
+    Écrit un CSV par dataset dans directory/<dataset>/, comme après dataset_download.
+    Retourne le chemin du fichier de chaque dataset.
+    """
+    paths = {}
+    for offset, dataset_type in enumerate(datasets):
+        file_name, _ = DATASET_LAYOUTS[dataset_type]
+        dataset_dir = os.path.join(directory, dataset_type)
+        os.makedirs(dataset_dir, exist_ok=True)
+        path = os.path.join(dataset_dir, file_name)
+        generate_dataset(dataset_type, rows, locations, seed + offset).to_csv(path, index=False)
+        paths[dataset_type] = path
+    return paths
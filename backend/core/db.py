@@ -1,27 +1,7 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
-from app.core.config.settings import settings
 
 # Charger les variables d'environnement
 load_dotenv()
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=3600,
-    echo=False
-)
-
-# Créer la session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-def get_db():
-    """
-    Fonction pour obtenir une session de base de données
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Moteur et sessions partagés avec l'application : un seul pool de connexions par processus
+from app.db.session import engine, SessionLocal, get_db  # noqa: E402,F401
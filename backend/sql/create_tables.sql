@@ -25,6 +25,21 @@ CREATE TABLE Data_source (
     INDEX idx_source_type (source_type)
 );
 
+-- Création de la table Data_source_file (empreintes des fichiers chargés par l'ETL)
+CREATE TABLE Data_source_file (
+    id INT PRIMARY KEY AUTO_INCREMENT,
+    id_source INT NOT NULL,
+    file_name VARCHAR(255) NOT NULL,
+    size BIGINT NOT NULL,
+    mtime_ns BIGINT NOT NULL,
+    content_hash VARCHAR(64) NOT NULL,
+    row_count INT DEFAULT 0,
+    last_date DATE,
+    loaded_at DATETIME,
+    FOREIGN KEY (id_source) REFERENCES Data_source(id) ON DELETE CASCADE,
+    UNIQUE KEY idx_unique_source_file (id_source, file_name)
+);
+
 -- Création de la table Daily_stats
 CREATE TABLE Daily_stats (
     id INT PRIMARY KEY AUTO_INCREMENT,
@@ -1,16 +1,22 @@
+import os
+import tempfile
+
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 import pytest
 from datetime import date
 
 from app.main import app
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.db.models.base import Base
 
 # Configuration de la base de données de test
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+# Base SQLite dans un fichier temporaire, partagée par les moteurs synchrone et asynchrone
+SQLALCHEMY_DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLALCHEMY_DATABASE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -20,6 +26,10 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Moteur asynchrone des routes de lecture ; NullPool car chaque requête du TestClient a sa propre boucle
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{SQLALCHEMY_DATABASE_PATH}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Création des tables pour les tests
 Base.metadata.create_all(bind=engine)
 
@@ -30,8 +40,13 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
@@ -115,6 +130,25 @@ def test_filter_epidemics(test_epidemic):
     assert len(data["items"]) > 0
     assert data["items"][0]["type"] == "VIRAL"
 
+def test_cursor_pagination_epidemics(test_epidemic):
+    # Créer trois épidémies portant le même nom pour tester le départage par id
+    for _ in range(3):
+        client.post("/api/v1/epidemics", json={**test_epidemic, "name": "Cursor Epidemic"})
+
+    params = {"search": "Cursor Epidemic", "sort_by": "name", "limit": 2, "cursor": ""}
+    first = client.get("/api/v1/epidemics", params=params).json()
+    assert len(first["items"]) == 2
+    assert first["next_cursor"]
+
+    second = client.get("/api/v1/epidemics", params={**params, "cursor": first["next_cursor"]}).json()
+    assert len(second["items"]) == 1
+    assert second["next_cursor"] is None
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert ids == sorted(set(ids))
+
+    response = client.get("/api/v1/epidemics", params={**params, "cursor": "invalide"})
+    assert response.status_code == 400
+
 def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
@@ -0,0 +1,39 @@
+import json
+
+import pandas as pd
+import pytest
+
+from app.utils.data_cleaning import clean_dataset
+from benchmarks.run import compare_reports, run_benchmarks
+from benchmarks.synthetic import DATASET_LAYOUTS, generate_dataset
+
+
+@pytest.mark.parametrize("dataset_type", list(DATASET_LAYOUTS))
+def test_synthetic_dataset_matches_cleaner(dataset_type):
+    """Test des layouts synthétiques : colonnes reconnues et séries cumulées croissantes."""
+    file_name, _ = DATASET_LAYOUTS[dataset_type]
+    raw = generate_dataset(dataset_type, rows=40, locations=4, seed=1)
+
+    cleaned = clean_dataset(raw, dataset_type=dataset_type, file_name=file_name, state={})
+
+    assert len(cleaned) == 40
+    assert cleaned["location"].nunique() == 4
+    assert pd.api.types.is_datetime64_any_dtype(cleaned["date"])
+    assert (cleaned.groupby("location")["cases"].diff().dropna() >= 0).all()
+
+
+def test_run_benchmarks_writes_report(tmp_path):
+    """Test du banc d'essai complet sur SQLite avec un petit volume."""
+    output = tmp_path / "report.json"
+
+    report = run_benchmarks(rows=30, locations=3, repeat=1, sqlite_url=f"sqlite:///{tmp_path / 'bench.db'}",
+                            output=str(output))
+
+    names = {result["name"] for result in report["results"]}
+    assert {"clean_dataset[mpox]", "process_generic_data[corona].upsert", "calculate_overall_stats",
+            "GET /dashboard/overview", "GET /stats/dashboard"} <= names
+    saved = json.loads(output.read_text())
+    assert saved["params"]["rows"] == 30
+    comparison = compare_reports(report, saved)
+    assert len(comparison) == len(report["results"])
+    assert all(item["ratio"] == 1.0 for item in comparison)
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from app.services.cache import ResponseCache
+
+
+def test_cache_hit_and_invalidation():
+    """Test des hits, misses et de l'invalidation par version."""
+    cache = ResponseCache(ttl=60, max_entries=10)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    assert cache.get_or_set("dashboard", compute) == {"value": 1}
+    assert cache.get_or_set("dashboard", compute) == {"value": 1}
+    cache.invalidate()
+    assert cache.get_or_set("dashboard", compute) == {"value": 2}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["version"]) == (1, 2, 1)
+
+
+def test_cache_ttl_and_lru_bound():
+    """Test de l'expiration (TTL) et de la taille maximale (LRU)."""
+    cache = ResponseCache(ttl=0.05, max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.get_or_set(key, lambda key=key: key)
+    assert cache.stats()["entries"] == 2
+
+    time.sleep(0.06)
+    assert cache.get_or_set("c", lambda: "recomputed") == "recomputed"
+
+
+def test_cache_async_variant():
+    """Test de get_or_set_async : la coroutine n'est exécutée qu'au premier appel."""
+    cache = ResponseCache(ttl=60, max_entries=10)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        return [await cache.get_or_set_async("count", compute) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [1, 1, 1]
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_key_locks_released():
+    """Test des verrous par clé : supprimés après le calcul, même pour des clés de recherche libre."""
+    cache = ResponseCache(ttl=60, max_entries=2)
+
+    async def compute_async():
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def concurrent_lookups():
+        return await asyncio.gather(*(cache.get_or_set_async(("count", "same"), compute_async) for _ in range(5)))
+
+    for index in range(50):
+        cache.get_or_set(("count", f"search {index}"), lambda: index)
+    assert asyncio.run(concurrent_lookups()) == [1] * 5
+
+    assert cache._key_locks == {} and cache._async_key_locks == {}
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app.core.config.settings import settings
+from app.db.daily_stats_key import (
+    check_daily_stats_key,
+    key_layout,
+    key_migration_statement,
+    migrate_daily_stats_key,
+    validate_daily_stats_key,
+)
+from app.db.models.base import Base
+from app.db.partitioning import partitioning_statements
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_natural_key_migration_statement():
+    """Test de la conversion vers la clé naturelle : id reste indexé, index de date couvrant."""
+    statement = key_migration_statement("natural")
+
+    assert statement.startswith("ALTER TABLE daily_stats DROP PRIMARY KEY, ADD PRIMARY KEY (id_epidemic, id_loc, date),")
+    assert "ADD INDEX idx_daily_id (id)" in statement
+    assert "DROP INDEX idx_unique_daily" in statement
+    assert "ADD INDEX idx_daily_date_cover (date, id_epidemic, new_cases, new_deaths, active)" in statement
+    assert "ADD PRIMARY KEY (id_epidemic, id_loc, date, id_source)" in key_migration_statement("natural", "source")
+
+
+def test_surrogate_key_migration_statement():
+    """Test du retour à la clé id : colonnes de partitionnement conservées dans les clés uniques."""
+    assert "ADD PRIMARY KEY (id)," in key_migration_statement("surrogate")
+    assert "ADD PRIMARY KEY (id, date)" in key_migration_statement("surrogate", "date")
+    statement = key_migration_statement("surrogate", "source")
+    assert "ADD PRIMARY KEY (id, id_source)" in statement
+    assert "ADD UNIQUE INDEX idx_unique_daily (id_epidemic, id_loc, date, id_source)" in statement
+    with pytest.raises(ValueError):
+        key_migration_statement("uuid")
+
+
+def test_partitioning_statements_with_natural_key():
+    """Test du partitionnement d'une table à clé naturelle : date y figure déjà, id_source est ajouté."""
+    date_statements = partitioning_statements("date", [], start=date(2020, 1, 1), until=date(2020, 1, 31), natural_key=True)
+    assert len(date_statements) == 1
+    assert date_statements[0].startswith("ALTER TABLE daily_stats PARTITION BY RANGE COLUMNS(date)")
+
+    source_statements = partitioning_statements("source", [], source_ids=[1], natural_key=True)
+    assert source_statements[0] == "ALTER TABLE daily_stats DROP PRIMARY KEY, ADD PRIMARY KEY (id_epidemic, id_loc, date, id_source)"
+
+
+def test_migration_is_noop_outside_mysql(tmp_path):
+    """Test sur SQLite : clé id détectée, conversion ignorée."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'key.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        assert key_layout(conn) == "surrogate"
+    assert migrate_daily_stats_key(engine, "natural") is False
+    assert inspect(engine).get_pk_constraint("daily_stats")["constrained_columns"] == ["id"]
+    assert check_daily_stats_key(engine) == []
+    engine.dispose()
+
+
+def test_natural_key_rejected_outside_mysql(monkeypatch):
+    """Test de la validation au démarrage : clé naturelle refusée sur SQLite, valeur inconnue refusée."""
+    engine = create_engine("sqlite://")
+    validate_daily_stats_key(engine)
+
+    monkeypatch.setattr(settings, "DAILY_STATS_PRIMARY_KEY", "natural")
+    with pytest.raises(RuntimeError, match="nécessite MySQL"):
+        validate_daily_stats_key(engine)
+    monkeypatch.setattr(settings, "DAILY_STATS_PRIMARY_KEY", "uuid")
+    with pytest.raises(RuntimeError):
+        validate_daily_stats_key(engine)
+
+
+def test_natural_key_model_ddl():
+    """Test du modèle en mode natural : clé primaire naturelle, id auto-incrémenté sur MySQL."""
+    script = (
+        "from sqlalchemy import inspect\n"
+        "from sqlalchemy.dialects import mysql\n"
+        "from sqlalchemy.schema import CreateTable\n"
+        "from app.db.models.base import DailyStats\n"
+        "print(CreateTable(DailyStats.__table__).compile(dialect=mysql.dialect()))\n"
+        "print([column.name for column in inspect(DailyStats).primary_key])\n"
+        "print(sorted(index.name for index in DailyStats.__table__.indexes))\n"
+    )
+    env = dict(os.environ, DAILY_STATS_PRIMARY_KEY="natural")
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+
+    assert "PRIMARY KEY (id_epidemic, id_loc, date)" in output
+    assert "AUTO_INCREMENT" not in output  # ajouté par l'événement after_create
+    assert "['id_epidemic', 'id_loc', 'date']" in output
+    assert "['idx_daily_date_cover', 'idx_daily_id', 'idx_daily_loc']" in output
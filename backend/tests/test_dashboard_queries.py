@@ -0,0 +1,84 @@
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.models.base import Base, DailyStats, DataSource, Epidemic, Localisation
+from app.services.dashboard_queries import DashboardQueryExecutor, sync_query
+from app.services.stats_service import DASHBOARD_FALLBACKS, DASHBOARD_SECTIONS, StatsService
+
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "dashboard.db")
+engine = create_engine(f"sqlite:///{DATABASE_PATH}")
+Base.metadata.create_all(bind=engine)
+
+
+def _run(queries, fallbacks, timeout=None):
+    async def run():
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{DATABASE_PATH}", poolclass=NullPool)
+        try:
+            return await DashboardQueryExecutor(async_engine, timeout).run(queries, fallbacks)
+        finally:
+            await async_engine.dispose()
+    return asyncio.run(run())
+
+
+def _slow(value, delay):
+    async def query(session):
+        await asyncio.sleep(delay)
+        return value + (await session.scalar(select(1)))
+    return query
+
+
+def test_queries_run_concurrently():
+    """Test de l'exécution parallèle : durée proche de la requête la plus lente."""
+    start = time.perf_counter()
+    result = _run({name: _slow(index, 0.2) for index, name in enumerate("abcd")}, dict.fromkeys("abcd"))
+
+    assert time.perf_counter() - start < 0.6
+    assert result.values == {"a": 1, "b": 2, "c": 3, "d": 4}
+    assert not result.partial
+
+
+def test_failed_or_slow_queries_fall_back():
+    """Test du repli par section sur erreur et sur dépassement du délai."""
+    async def failing(session):
+        raise RuntimeError("boom")
+
+    result = _run(
+        {"ok": _slow(0, 0), "slow": _slow(0, 1), "error": failing},
+        {"ok": None, "slow": [], "error": {"total": 0}},
+        timeout=0.1
+    )
+
+    assert result.values == {"ok": 1, "slow": [], "error": {"total": 0}}
+    assert sorted(result.failed) == ["error", "slow"]
+
+
+def test_stats_service_sections_match_sequential():
+    """Test des sections StatsService exécutées en parallèle contre le calcul séquentiel."""
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        epidemic = Epidemic(name="Concurrent Epidemic", type="virus")
+        location = Localisation(country="Concurrentland")
+        source = DataSource(source_type="dashboard-test", url="http://example.com")
+        db.add_all([epidemic, location, source])
+        db.flush()
+        db.add(DailyStats(id_epidemic=epidemic.id, id_loc=location.id, id_source=source.id,
+                          date=date(2021, 6, 1), cases=10, deaths=1))
+        db.commit()
+        expected = StatsService(db).get_dashboard_stats()
+
+    queries = {
+        name: sync_query(lambda session, name=name: StatsService(session).get_section(name))
+        for name in DASHBOARD_SECTIONS
+    }
+    result = _run(queries, DASHBOARD_FALLBACKS)
+
+    assert result.values == expected
+    assert result.values["global_stats"]["total_cases"] == 10
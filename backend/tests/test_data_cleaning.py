@@ -0,0 +1,65 @@
+import pandas as pd
+
+from app.utils.data_cleaning import clean_dataset, detect_date_format, normalize_dates
+
+
+def _raw_dataset():
+    return pd.DataFrame({
+        "date": ["2020-01-01", "2020-01-01", "2020-01-02", "2020-01-02", "2020-01-03", "2020-01-03"],
+        "location": ["A", "B", "A", "B", "A", "B"],
+        "total_cases": [1, 10, 4, 15, 9, 15],
+        "total_deaths": [0, 1, 1, 2, 1, 4],
+    })
+
+
+def test_clean_dataset_derives_new_cases():
+    """Test du calcul des nouveaux cas par localisation."""
+    df = clean_dataset(_raw_dataset(), dataset_type="mpox")
+    by_row = df.sort_index()
+    assert by_row["new_cases"].tolist() == [0, 0, 3, 5, 5, 0]
+    assert by_row["new_deaths"].tolist() == [0, 0, 1, 1, 0, 2]
+
+
+def test_clean_dataset_chunks_carry_state():
+    """Test du nettoyage par chunks : l'état par localisation est conservé."""
+    raw = _raw_dataset()
+    expected = clean_dataset(raw.copy(), dataset_type="mpox").sort_index()
+
+    state = {}
+    chunks = [clean_dataset(raw.iloc[start:start + 2].copy(), dataset_type="mpox", state=state) for start in (0, 2, 4)]
+    streamed = pd.concat(chunks).sort_index()
+
+    assert streamed["new_cases"].tolist() == expected["new_cases"].tolist()
+    assert streamed["new_deaths"].tolist() == expected["new_deaths"].tolist()
+
+
+def test_clean_dataset_derived_columns_fixed_per_file():
+    """Test du nettoyage par chunks : les colonnes dérivées sont choisies une fois pour tout le fichier."""
+    raw = pd.DataFrame({
+        "date": ["2020-01-01", "2020-01-01", "2020-01-02", "2020-01-02",
+                 "2020-01-03", "2020-01-03", "2020-01-04", "2020-01-04"],
+        "location": ["A", "B"] * 4,
+        "total_cases": [1, 10, 4, 15, 9, 15, 12, 20],
+        "total_deaths": [0, 1, 1, 2, 1, 4, 2, 4],
+        "new_cases": [1, 10, 3, 5, None, None, None, None],
+    })
+    expected = clean_dataset(raw.copy(), dataset_type="mpox").sort_index()
+
+    state = {}
+    chunks = [clean_dataset(raw.iloc[start:start + 4].copy(), dataset_type="mpox", state=state) for start in (0, 4)]
+    streamed = pd.concat(chunks).sort_index()
+
+    # new_cases est fourni par le fichier : il n'est pas recalculé pour le second chunk, vide
+    assert streamed["new_cases"].tolist() == expected["new_cases"].tolist() == [1, 10, 3, 5, 0, 0, 0, 0]
+    assert streamed["new_deaths"].tolist() == expected["new_deaths"].tolist()
+
+
+def test_normalize_dates_detects_format_and_falls_back():
+    """Test de la conversion vectorisée des dates avec repli ligne à ligne."""
+    values = pd.Series(["13/01/2020", "14/01/2020", "2020-01-15", None, "not a date"])
+    parsed = normalize_dates(values)
+
+    assert pd.api.types.is_datetime64_any_dtype(parsed)
+    assert parsed.iloc[:3].dt.strftime("%Y-%m-%d").tolist() == ["2020-01-13", "2020-01-14", "2020-01-15"]
+    assert parsed.iloc[3:].isna().all()
+    assert detect_date_format(pd.Series(["01/13/2020", "01/14/2020"])) == "%m/%d/%Y"
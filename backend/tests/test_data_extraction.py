@@ -0,0 +1,401 @@
+from datetime import date
+
+import backoff._sync
+import pandas as pd
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.models.base import (
+    Epidemic,
+    DailyStats,
+    DailyGlobalRollup,
+    Localisation,
+    DataSource,
+    DataSourceFile,
+    OverallStats,
+)
+from app.core.config.settings import settings
+from app.db.repositories.epidemic_repository import delete_epidemic
+from app.services import data_extraction
+from app.services.data_extraction import (
+    calculate_overall_stats,
+    insert_or_update_stats,
+    load_csv_file,
+    load_file_with_retries,
+    load_files_in_parallel,
+    process_generic_data,
+)
+from app.services import etl_profiler
+from app.services.etl_profiler import EtlProfiler
+from app.services.file_tracking import FILE_APPENDED, check_file
+from app.services.load_context import LoadContext
+from app.services.location_resolver import LocationResolver
+from app.services.stats_service import StatsService
+from app.utils.data_cleaning import clean_dataset
+
+
+def _create_references(db_session):
+    epidemic = Epidemic(name="ETL Epidemic")
+    location = Localisation(country="ETL Country")
+    source = DataSource(source_type="etl-test", url="http://example.com")
+    db_session.add_all([epidemic, location, source])
+    db_session.commit()
+    return epidemic, location, source
+
+
+def _stat(epidemic, location, source, day, cases):
+    return {
+        "id_epidemic": epidemic.id,
+        "id_source": source.id,
+        "id_loc": location.id,
+        "date": f"2020-01-{day:02d}",
+        "cases": cases,
+        "deaths": 1,
+    }
+
+
+def test_bulk_upsert_inserts_then_updates(db_session):
+    """Test de l'upsert groupé : insertion puis mise à jour sur la clé unique."""
+    epidemic, location, source = _create_references(db_session)
+
+    stats = [_stat(epidemic, location, source, day, day * 10) for day in range(1, 8)]
+    assert insert_or_update_stats(db_session, stats, batch_size=3) == 7
+
+    updated = [_stat(epidemic, location, source, 1, 999), _stat(epidemic, location, source, 8, 80)]
+    assert insert_or_update_stats(db_session, updated, batch_size=3) == 2
+
+    rows = db_session.query(DailyStats).filter(DailyStats.id_epidemic == epidemic.id).all()
+    assert len(rows) == 8
+    by_date = {row.date: row for row in rows}
+    assert by_date[date(2020, 1, 1)].cases == 999
+    assert by_date[date(2020, 1, 8)].cases == 80
+    assert by_date[date(2020, 1, 2)].recovered == 0
+
+
+def test_bulk_upsert_skips_invalid_rows(db_session):
+    """Test du rejet des lignes sans clé étrangère."""
+    epidemic, location, source = _create_references(db_session)
+
+    stats = [_stat(epidemic, location, source, 1, 10), {"id_epidemic": epidemic.id, "date": "2020-01-02"}]
+    assert insert_or_update_stats(db_session, stats) == 1
+
+
+def test_process_generic_data_resolves_locations_once(db_session):
+    """Test du chargement vectorisé d'un dataset nettoyé."""
+    _, _, source = _create_references(db_session)
+    data = clean_dataset(pd.DataFrame({
+        "date": ["2020-01-01", "2020-01-02", "2020-01-01", "2020-01-02"],
+        "location": ["Vectorland", "Vectorland", "Arrayland", "Arrayland"],
+        "total_cases": [1, 3, 5, 6],
+        "total_deaths": [0, 1, 0, 0],
+    }), dataset_type="mpox")
+
+    process_generic_data(db_session, data, source.id, "Vector Epidemic")
+
+    epidemic = db_session.query(Epidemic).filter(Epidemic.name == "Vector Epidemic").one()
+    rows = db_session.query(DailyStats).filter(DailyStats.id_epidemic == epidemic.id).all()
+    assert len(rows) == 4
+    assert db_session.query(Localisation).filter(Localisation.country.in_(["Vectorland", "Arrayland"])).count() == 2
+    assert sorted(row.cases for row in rows) == [1, 3, 5, 6]
+
+
+def test_location_resolver_reuses_known_locations(db_session):
+    """Test du cache de localisations : préchargement et création groupée."""
+    _, location, _ = _create_references(db_session)
+    resolver = LocationResolver(db_session)
+
+    data = pd.DataFrame({
+        "location": ["ETL Country", "Newland", None, "Newland"],
+        "iso_code": [None, "NWL", None, "NWL"],
+    })
+    ids = resolver.resolve(data)
+
+    assert ids.iloc[0] == location.id
+    assert ids.iloc[1] == ids.iloc[3]
+    newland = db_session.query(Localisation).filter(Localisation.country == "Newland").one()
+    assert newland.iso_code == "NWL"
+    assert db_session.query(Localisation).filter(Localisation.country == "Unknown").count() == 1
+
+    count = db_session.query(Localisation).count()
+    assert resolver.resolve(data).tolist() == ids.tolist()
+    assert db_session.query(Localisation).count() == count
+
+
+def test_load_csv_file_in_chunks(db_session, tmp_path):
+    """Test du chargement d'un CSV par chunks."""
+    _, _, source = _create_references(db_session)
+    csv_file = tmp_path / "chunked.csv"
+    pd.DataFrame({
+        "date": ["2021-03-01", "2021-03-02", "2021-03-03", "2021-03-04", "2021-03-05"],
+        "location": ["Chunkland"] * 5,
+        "total_cases": [1, 2, 4, 8, 16],
+        "total_deaths": [0, 0, 1, 1, 2],
+    }).to_csv(csv_file, index=False)
+
+    summary = load_csv_file(db_session, str(csv_file), "mpox", source.id, LoadContext(db_session), chunk_size=2)
+
+    assert summary["rows"] == summary["loaded"] == 5
+    assert summary["last_date"] == date(2021, 3, 5)
+    epidemic = db_session.query(Epidemic).filter(Epidemic.name == "mpox").one()
+    stats = db_session.query(DailyStats).filter(DailyStats.id_epidemic == epidemic.id).order_by(DailyStats.date).all()
+    assert [stat.new_cases for stat in stats] == [0, 1, 2, 4, 8]
+
+
+def test_load_file_profiled_per_stage(db_session, tmp_path):
+    """Test du profil par étape : durées, débit, requêtes SQL, fichier JSON et dump cProfile."""
+    _, _, source = _create_references(db_session)
+    csv_file = tmp_path / "profiled.csv"
+    pd.DataFrame({
+        "date": ["2021-05-01", "2021-05-02", "2021-05-03"],
+        "location": ["Profiland"] * 3,
+        "total_cases": [1, 2, 3],
+        "total_deaths": [0, 0, 1],
+    }).to_csv(csv_file, index=False)
+    profile_dir = tmp_path / "profiles"
+    context = LoadContext(db_session, profiler=EtlProfiler(str(profile_dir), cprofile_file="profiled.csv"))
+
+    with context.profiler.activate():
+        result = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context, chunk_size=2)
+
+    profile = result["profile"]
+    assert profile["file"] == "profiled.csv"
+    assert {"read_csv", "clean", "locations", "prepare", "db_write"} <= set(profile["stages"])
+    assert profile["stages"]["read_csv"] == {**profile["stages"]["read_csv"], "calls": 2, "rows": 3}
+    assert profile["stages"]["db_write"]["rows"] == 3
+    assert profile["db_round_trips"] > 0
+    assert profile["process_max_rss_mb"] > 0
+    assert (profile_dir / "profiled.csv.prof").exists()
+
+    summary = context.profiler.summary()
+    assert summary["db_round_trips"] >= profile["db_round_trips"]
+    path = context.profiler.write()
+    assert path.startswith(str(profile_dir)) and path.endswith(".json")
+
+
+def test_load_files_in_parallel(db_session, tmp_path):
+    """Test du nettoyage en pool de processus avec un seul écrivain."""
+    _, _, source = _create_references(db_session)
+    jobs = []
+    for index, country in enumerate(["Poolland", "Workerland"]):
+        csv_file = tmp_path / f"{country}.csv"
+        pd.DataFrame({
+            "date": ["2021-04-01", "2021-04-02"],
+            "location": [country, country],
+            "total_cases": [index + 1, index + 3],
+            "total_deaths": [0, 1],
+        }).to_csv(csv_file, index=False)
+        jobs.append(("mpox", source.id, str(csv_file)))
+    jobs.append(("mpox", source.id, str(tmp_path / "missing.csv")))
+
+    results = load_files_in_parallel(db_session, jobs, LoadContext(db_session), workers=2, max_retries=1)
+
+    statuses = sorted((result["file"], result["status"]) for result in results)
+    assert statuses == [("Poolland.csv", "success"), ("Workerland.csv", "success"), ("missing.csv", "error")]
+    epidemic = db_session.query(Epidemic).filter(Epidemic.name == "mpox").one()
+    assert db_session.query(DailyStats).filter(DailyStats.id_epidemic == epidemic.id).count() == 4
+
+
+def test_parallel_load_streams_chunks(db_session, tmp_path, monkeypatch):
+    """Test du mode parallèle : les chunks passent un par un par la file bornée des workers."""
+    monkeypatch.setattr(settings, "ETL_PARALLEL_QUEUE_CHUNKS", 1)
+    _, _, source = _create_references(db_session)
+    csv_file = tmp_path / "streamed.csv"
+    pd.DataFrame({
+        "date": [f"2021-06-{day:02d}" for day in range(1, 6)],
+        "location": ["Streamland"] * 5,
+        "total_cases": [1, 2, 4, 8, 16],
+    }).to_csv(csv_file, index=False)
+    context = LoadContext(db_session)
+
+    with context.profiler.activate():
+        results = load_files_in_parallel(
+            db_session, [("mpox", source.id, str(csv_file))], context, chunk_size=2, workers=2, max_retries=1
+        )
+
+    assert [(result["status"], result["rows"]) for result in results] == [("success", 5)]
+    assert results[0]["profile"]["stages"]["clean"]["calls"] == 3
+    tracked = db_session.query(DataSourceFile).filter(DataSourceFile.file_name == "streamed.csv").one()
+    assert (tracked.row_count, tracked.last_date) == (5, date(2021, 6, 5))
+
+
+def test_parallel_load_profiled_once_per_file(db_session, tmp_path, monkeypatch):
+    """Test du profil en mode parallèle : un seul profil par fichier, ouvert sur tous ses chunks."""
+    _, _, source = _create_references(db_session)
+    csv_file = tmp_path / "pooled.csv"
+    pd.DataFrame({
+        "date": [f"2021-07-{day:02d}" for day in range(1, 6)],
+        "location": ["Profilpool"] * 5,
+        "total_cases": [1, 2, 3, 4, 5],
+    }).to_csv(csv_file, index=False)
+    profile_dir = tmp_path / "profiles"
+    context = LoadContext(db_session, profiler=EtlProfiler(str(profile_dir), cprofile_file="pooled.csv"))
+    dumps = []
+    dump_cprofile = etl_profiler._dump_cprofile
+
+    def record_dump(profiler, path):
+        dumps.append(path)
+        dump_cprofile(profiler, path)
+
+    monkeypatch.setattr(etl_profiler, "_dump_cprofile", record_dump)
+
+    with context.profiler.activate():
+        results = load_files_in_parallel(
+            db_session, [("mpox", source.id, str(csv_file))], context, chunk_size=2, workers=2, max_retries=1
+        )
+
+    profile = results[0]["profile"]
+    assert profile["stages"]["read_csv"] == {**profile["stages"]["read_csv"], "calls": 3, "rows": 5}
+    assert profile["stages"]["db_write"]["rows"] == 5
+    assert profile["process_max_rss_mb"] > 0
+    assert dumps == [str(profile_dir / "pooled.csv.prof")]
+    assert (profile_dir / "pooled.csv.parse.prof").exists()
+
+
+def test_incremental_load_skips_unchanged_and_appends(db_session, tmp_path):
+    """Test du chargement incrémental : fichier inchangé ignoré, fichier complété repris."""
+    _, _, source = _create_references(db_session)
+    context = LoadContext(db_session)
+    csv_file = tmp_path / "incremental.csv"
+    pd.DataFrame({
+        "date": ["2021-05-01", "2021-05-02"],
+        "location": ["Deltaland", "Deltaland"],
+        "total_cases": [1, 2],
+    }).to_csv(csv_file, index=False)
+
+    first = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context)
+    second = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context)
+    assert (first["status"], first["rows"]) == ("success", 2)
+    assert second["status"] == "skipped"
+
+    with open(csv_file, "a") as handle:
+        handle.write("2021-05-03,Deltaland,5\n")
+    status, _, _ = check_file(db_session, source.id, str(csv_file))
+    assert status == FILE_APPENDED
+
+    third = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context)
+    assert (third["status"], third["rows"]) == ("success", 2)
+    tracked = db_session.query(DataSourceFile).filter(DataSourceFile.file_name == "incremental.csv").one()
+    assert (tracked.row_count, tracked.last_date) == (3, date(2021, 5, 3))
+
+
+def test_deleted_epidemic_reloaded_by_incremental_load(db_session, tmp_path):
+    """Test de la suppression d'une épidémie : le chargement incrémental suivant recharge ses fichiers."""
+    _, _, source = _create_references(db_session)
+    context = LoadContext(db_session)
+    csv_file = tmp_path / "deleted.csv"
+    pd.DataFrame({
+        "date": ["2021-06-01", "2021-06-02"],
+        "location": ["Eraseland", "Eraseland"],
+        "total_cases": [1, 2],
+    }).to_csv(csv_file, index=False)
+    assert load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context)["status"] == "success"
+    epidemic = db_session.query(Epidemic).filter(Epidemic.name == "mpox").one()
+
+    assert delete_epidemic(db_session, epidemic.id) is True
+    assert db_session.query(DataSourceFile).filter(DataSourceFile.id_source == source.id).count() == 0
+
+    reloaded = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context)
+    assert (reloaded["status"], reloaded["rows"]) == ("success", 2)
+    assert db_session.query(DailyStats).filter(DailyStats.id_source == source.id).count() == 2
+
+
+def test_failed_batches_leave_file_unrecorded(db_session, tmp_path, monkeypatch):
+    """Test d'un fichier dont tous les lots échouent : erreur, aucune empreinte, rechargé au run suivant."""
+    def failing_batch(db, rows):
+        raise SQLAlchemyError("lot refusé")
+
+    monkeypatch.setattr(backoff._sync.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(data_extraction, "sleep", lambda seconds: None)
+    monkeypatch.setattr(data_extraction, "upsert_stats_batch", failing_batch)
+    _, _, source = _create_references(db_session)
+    context = LoadContext(db_session)
+    csv_file = tmp_path / "failing.csv"
+    pd.DataFrame({
+        "date": ["2021-07-01", "2021-07-02"],
+        "location": ["Failland", "Failland"],
+        "total_cases": [1, 2],
+    }).to_csv(csv_file, index=False)
+
+    result = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context, max_retries=1)
+
+    assert result["status"] == "error"
+    assert db_session.query(DataSourceFile).filter(DataSourceFile.file_name == "failing.csv").count() == 0
+
+    monkeypatch.undo()
+    retried = load_file_with_retries(db_session, str(csv_file), "mpox", source.id, context)
+    assert (retried["status"], retried["rows"]) == ("success", 2)
+
+
+def test_overall_stats_maintained_from_batch_deltas(db_session):
+    """Test de la mise à jour incrémentale des OverallStats, identique à une reconstruction complète."""
+    epidemic, location, source = _create_references(db_session)
+
+    insert_or_update_stats(db_session, [_stat(epidemic, location, source, day, 10) for day in range(1, 4)], batch_size=2)
+    insert_or_update_stats(db_session, [_stat(epidemic, location, source, 2, 40)])
+
+    overall = db_session.query(OverallStats).filter(OverallStats.id_epidemic == epidemic.id).one()
+    assert (overall.total_cases, overall.total_deaths) == (60, 3)
+    assert overall.fatality_ratio == 5.0
+
+    calculate_overall_stats(db_session)
+    db_session.refresh(overall)
+    assert (overall.total_cases, overall.total_deaths) == (60, 3)
+
+
+def test_daily_rollup_refreshed_for_loaded_dates(db_session):
+    """Test du rafraîchissement de daily_global_rollup pour les dates chargées."""
+    _, _, source = _create_references(db_session)
+    data = clean_dataset(pd.DataFrame({
+        "date": ["2020-02-01", "2020-02-01", "2020-02-02"],
+        "location": ["Rollupland", "Sumland", "Rollupland"],
+        "total_cases": [2, 3, 7],
+        "new_cases": [2, 3, 5],
+    }), dataset_type="mpox")
+
+    process_generic_data(db_session, data, source.id, "Rollup Epidemic")
+
+    epidemic = db_session.query(Epidemic).filter(Epidemic.name == "Rollup Epidemic").one()
+    rollup = db_session.query(DailyGlobalRollup)\
+        .filter(DailyGlobalRollup.id_epidemic == epidemic.id)\
+        .order_by(DailyGlobalRollup.date)\
+        .all()
+    assert [(row.date, row.new_cases) for row in rollup] == [(date(2020, 2, 1), 5), (date(2020, 2, 2), 5)]
+
+    evolution = StatsService(db_session)._get_daily_evolution()
+    assert [day["new_cases"] for day in evolution if day["date"].startswith("2020-02")] == [5, 5]
+
+
+def test_epidemic_totals_denormalized_after_load(db_session):
+    """Test des totaux dénormalisés de l'épidémie, alignés avec OverallStats après chargement et reconstruction."""
+    _, _, source = _create_references(db_session)
+    data = clean_dataset(pd.DataFrame({
+        "date": ["2020-03-01", "2020-03-02", "2020-03-01", "2020-03-02"],
+        "location": ["Totalland", "Totalland", "Sumland", "Sumland"],
+        "total_cases": [10, 20, 5, 10],
+        "total_deaths": [1, 2, 0, 1],
+    }), dataset_type="mpox")
+
+    process_generic_data(db_session, data, source.id, "Totals Epidemic")
+
+    epidemic = db_session.query(Epidemic).filter(Epidemic.name == "Totals Epidemic").one()
+    db_session.refresh(epidemic)
+    overall = db_session.query(OverallStats).filter(OverallStats.id_epidemic == epidemic.id).one()
+    assert (epidemic.total_cases, epidemic.total_deaths) == (45, 4)
+    assert (overall.total_cases, overall.total_deaths) == (45, 4)
+    assert epidemic.mortality_rate == pytest.approx(4 / 45 * 100)
+    assert overall.fatality_ratio == pytest.approx(epidemic.mortality_rate)
+
+    # Un second lot ne fait que corriger les valeurs existantes : seule la variation est appliquée
+    process_generic_data(db_session, data.assign(cases=data["cases"] * 2), source.id, "Totals Epidemic")
+    db_session.refresh(epidemic)
+    assert (epidemic.total_cases, epidemic.total_deaths) == (90, 4)
+    assert epidemic.mortality_rate == pytest.approx(4 / 90 * 100)
+
+    db_session.query(Epidemic).filter(Epidemic.id == epidemic.id).update({"total_cases": 0, "mortality_rate": 0})
+    db_session.commit()
+    calculate_overall_stats(db_session)
+    db_session.refresh(epidemic)
+    assert (epidemic.total_cases, epidemic.mortality_rate) == (90, pytest.approx(4 / 90 * 100))
+    # transmission_rate n'est recalculé que par la reconstruction
+    # new_cases * 100 / cases : 0 et 25 % pour chaque localisation (cas doublés par le second lot)
+    assert epidemic.transmission_rate == pytest.approx(12.5)
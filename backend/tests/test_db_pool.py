@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.core.config.settings import settings
+from app.db.pool import PoolMetrics
+from app.db.session import create_db_engine
+
+
+def test_pool_metrics_record_checkouts_and_timeouts(monkeypatch):
+    """Test des métriques du pool : checkouts comptés, timeout compté quand le pool est saturé."""
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 1)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 0.05)
+    metrics = PoolMetrics("test")
+    engine = create_db_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'pool.db')}", metrics=metrics)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = metrics.snapshot(engine.pool)
+    assert (stats["checkouts"], stats["timeouts"]) == (1, 1)
+    assert stats["wait_max"] >= 0.05
+    assert (stats["size"], stats["checked_out"]) == (1, 0)
+    engine.dispose()
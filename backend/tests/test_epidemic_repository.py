@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app.db.models.base import DailyGlobalRollup, DailyStats, DataSource, Epidemic, Localisation, OverallStats
+from app.db.repositories.epidemic_repository import delete_epidemics, get_detailed_epidemic_data, get_epidemic_aggregates
+
+
+def _count_statements(db_session, func):
+    statements = []
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db_session.bind, "before_cursor_execute", listener)
+    try:
+        return func(), statements
+    finally:
+        event.remove(db_session.bind, "before_cursor_execute", listener)
+
+
+def test_detailed_epidemic_data_is_batched(db_session):
+    """Test des données détaillées : 30 dernières stats par épidémie, en un nombre fixe de requêtes."""
+    source = DataSource(source_type="repo-test", url="http://example.com")
+    paris = Localisation(country="Detail Country", region="Paris")
+    lyon = Localisation(country="Detail Country", region="Lyon")
+    first = Epidemic(name="Detail A")
+    second = Epidemic(name="Detail B")
+    db_session.add_all([source, paris, lyon, first, second])
+    db_session.flush()
+
+    start = date(2021, 1, 1)
+    db_session.add_all([
+        DailyStats(id_epidemic=first.id, id_source=source.id, id_loc=(paris if day % 2 else lyon).id,
+                   date=start + timedelta(days=day), cases=day)
+        for day in range(35)
+    ])
+    db_session.add(DailyStats(id_epidemic=second.id, id_source=source.id, id_loc=paris.id, date=start, cases=7))
+    db_session.add(OverallStats(id_epidemic=first.id, total_cases=34, total_deaths=1, fatality_ratio=2.9))
+    db_session.flush()
+
+    data, statements = _count_statements(db_session, lambda: get_detailed_epidemic_data(db_session, skip=0, limit=1000))
+    assert len(statements) == 4
+
+    by_name = {item["name"]: item for item in data}
+    detail_a, detail_b = by_name["Detail A"], by_name["Detail B"]
+    assert [stat["cases"] for stat in detail_a["daily_stats"]] == list(range(34, 4, -1))
+    assert detail_a["daily_stats"][0]["location"]["region"] == "Lyon"
+    assert {loc["region"] for loc in detail_a["affected_locations"]} == {"Paris", "Lyon"}
+    assert detail_a["overall_stats"]["total_cases"] == 34
+    assert [stat["cases"] for stat in detail_b["daily_stats"]] == [7]
+    assert detail_b["overall_stats"] == {"total_cases": 0, "total_deaths": 0, "fatality_ratio": 0.0}
+
+
+def test_epidemic_aggregates_in_one_statement(db_session):
+    """Test des agrégats (total, actives, taux moyens) calculés en une requête, sans limite de 1000."""
+    db_session.add_all([
+        Epidemic(name=f"Aggregate {index}", type="aggregate-test", transmission_rate=index % 3,
+                 mortality_rate=2.0, total_cases=10, end_date=date(2020, 1, 1) if index % 4 == 0 else None)
+        for index in range(1200)
+    ])
+    db_session.flush()
+
+    aggregates, statements = _count_statements(
+        db_session, lambda: get_epidemic_aggregates(db_session, {"type": "aggregate-test"})
+    )
+
+    assert len(statements) == 1
+    assert aggregates["total"] == 1200
+    assert aggregates["active"] == 900
+    assert aggregates["average_transmission_rate"] == sum(index % 3 for index in range(1200)) / 1200
+    assert aggregates["average_mortality_rate"] == 2.0
+    assert aggregates["total_cases"] == 12000
+
+
+def test_delete_epidemics_removes_dependent_rows(db_session):
+    """Test de la suppression groupée : épidémies filtrées et leurs statistiques, les autres sont conservées."""
+    source = DataSource(source_type="delete-test", url="http://example.com")
+    location = Localisation(country="Delete Country")
+    doomed = [Epidemic(name=f"Doomed {index}", type="delete-test") for index in range(3)]
+    kept = Epidemic(name="Kept", type="keep-test")
+    db_session.add_all([source, location, kept, *doomed])
+    db_session.flush()
+    for epidemic in (kept, *doomed):
+        db_session.add_all([
+            DailyStats(id_epidemic=epidemic.id, id_source=source.id, id_loc=location.id, date=date(2021, 1, 1), cases=1),
+            OverallStats(id_epidemic=epidemic.id, total_cases=1),
+            DailyGlobalRollup(id_epidemic=epidemic.id, date=date(2021, 1, 1), new_cases=1)
+        ])
+    db_session.flush()
+    doomed_ids = [epidemic.id for epidemic in doomed]
+
+    deleted = delete_epidemics(db_session, {"type": "delete-test"})
+
+    assert deleted == 3
+    assert db_session.query(Epidemic).filter(Epidemic.id.in_(doomed_ids)).count() == 0
+    for model in (DailyStats, OverallStats, DailyGlobalRollup):
+        assert db_session.query(model).filter(model.id_epidemic.in_(doomed_ids)).count() == 0
+        assert db_session.query(model).filter(model.id_epidemic == kept.id).count() == 1
@@ -0,0 +1,56 @@
+import threading
+import time
+
+from app.services.etl_jobs import JOB_CANCELLED, JOB_SUCCEEDED, EtlJobManager
+
+
+class _FakeSession:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _wait_for(job, statuses, timeout=5):
+    deadline = time.monotonic() + timeout
+    while job.status not in statuses and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+
+def test_etl_job_reports_progress():
+    """Test d'un job ETL : retour immédiat, puis avancement par fichier et résultat."""
+    manager = EtlJobManager(max_workers=1, history=5, session_factory=_FakeSession)
+
+    def run(db, job):
+        job.file_started("a.csv")
+        job.rows_parsed("a.csv", 10)
+        job.rows_loaded("a.csv", 8)
+        job.file_finished("a.csv", "success")
+        return ["ok"]
+
+    job = manager.submit(run, {"reset": False})
+    assert _wait_for(job, (JOB_SUCCEEDED,)) == JOB_SUCCEEDED
+
+    data = manager.get(job.id).to_dict()
+    assert data["result"] == ["ok"]
+    assert (data["rows_parsed"], data["rows_loaded"]) == (10, 8)
+    assert data["files"][0]["status"] == "success"
+
+
+def test_etl_job_cancellation():
+    """Test de l'annulation d'un job ETL en cours au prochain point de contrôle."""
+    manager = EtlJobManager(max_workers=1, history=5, session_factory=_FakeSession)
+    started = threading.Event()
+
+    def run(db, job):
+        started.set()
+        while True:
+            job.check_cancelled()
+            time.sleep(0.01)
+
+    job = manager.submit(run)
+    assert started.wait(5)
+    manager.cancel(job.id)
+    assert _wait_for(job, (JOB_CANCELLED,)) == JOB_CANCELLED
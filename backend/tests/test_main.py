@@ -1,4 +1,6 @@
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Ajouter le chemin parent au sys.path pour que Python trouve `main.py`
@@ -9,14 +11,17 @@ from app.main import app  # noqa: E402
 from fastapi.testclient import TestClient
 import pytest
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.db.models.base import Base
 
 # Configuration de la base de données de test
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Base SQLite dans un fichier temporaire, partagée par les moteurs synchrone et asynchrone
+SQLALCHEMY_DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLALCHEMY_DATABASE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -26,6 +31,10 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Moteur asynchrone des routes de lecture ; NullPool car chaque requête du TestClient a sa propre boucle
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{SQLALCHEMY_DATABASE_PATH}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Création des tables
 Base.metadata.create_all(bind=engine)
 
@@ -36,8 +45,13 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
@@ -45,6 +59,8 @@ client = TestClient(app)
 @pytest.fixture
 def test_client():
     """Fixture pour créer un client de test."""
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     return TestClient(app)
 
 
@@ -113,3 +129,155 @@ def test_etl_data_integrity():
     """Test de l'intégrité des données ETL."""
     from app.services.data_extraction import extract_and_load_datasets
     assert extract_and_load_datasets is not None
+
+
+def _create_daily_stats(name, iso_code):
+    """Crée une épidémie avec trois jours de statistiques et retourne son id."""
+    from datetime import date
+    from app.db.models.base import DailyStats, DataSource, Epidemic, Localisation
+
+    db_session = TestingSessionLocal()
+    epidemic = Epidemic(name=name, type="VIRAL")
+    location = Localisation(country=name, iso_code=iso_code)
+    source = DataSource(source_type="CSV", url=f"{name}.csv")
+    db_session.add_all([epidemic, location, source])
+    db_session.flush()
+    db_session.add_all([
+        DailyStats(id_epidemic=epidemic.id, id_source=source.id, id_loc=location.id,
+                   date=date(2020, 1, day), cases=day)
+        for day in range(1, 4)
+    ])
+    db_session.commit()
+    epidemic_id = epidemic.id
+    db_session.close()
+    return epidemic_id
+
+
+def test_daily_stats_cursor_and_stream(test_client):
+    """Test de la pagination par curseur, de la projection et de l'export NDJSON."""
+    epidemic_id = _create_daily_stats("Stream", "STR")
+
+    params = {"epidemic_id": epidemic_id, "fields": "date,cases", "limit": 2}
+    response = test_client.get("/api/v1/daily-stats", params=params)
+    assert response.json() == [{"date": "2020-01-01", "cases": 1}, {"date": "2020-01-02", "cases": 2}]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = test_client.get("/api/v1/daily-stats", params={**params, "cursor": cursor})
+    assert response.json() == [{"date": "2020-01-03", "cases": 3}]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = test_client.get("/api/v1/daily-stats", params={"epidemic_id": epidemic_id, "fields": "cases", "format": "ndjson"})
+    assert response.text.splitlines() == ['{"cases": 1}', '{"cases": 2}', '{"cases": 3}']
+
+    assert test_client.get("/api/v1/daily-stats", params={"fields": "inconnu"}).status_code == 400
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_daily_stats_export(test_client, format):
+    """Test de l'export Parquet / Arrow IPC de daily_stats."""
+    import io
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    epidemic_id = _create_daily_stats(f"Export {format}", f"EX{format[0].upper()}")
+
+    response = test_client.get("/api/v1/daily-stats/export", params={"format": format, "epidemic_id": epidemic_id})
+    assert response.status_code == 200
+    if format == "parquet":
+        table = pq.read_table(io.BytesIO(response.content))
+    else:
+        table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("cases").to_pylist() == [1, 2, 3]
+    assert table.column("epidemic").to_pylist() == [f"Export {format}"] * 3
+
+
+def test_metrics_endpoint(test_client):
+    """Test des métriques par route : latence et nombre de requêtes SQL au format Prometheus."""
+    test_client.get("/api/v1/dashboard/trends")
+
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    labels = 'method="GET",route="/api/v1/dashboard/trends",status="200"'
+    assert f'http_request_duration_seconds_count{{{labels}}}' in response.text
+    assert f'http_request_sql_statements_bucket{{{labels},le="1"}}' in response.text
+    assert f'http_request_db_seconds_total{{{labels}}}' in response.text
+
+
+def test_metrics_count_queries_of_streamed_responses(test_client):
+    """Test des métriques d'une réponse en flux : les requêtes SQL émises pendant l'envoi sont comptées."""
+    from app.services.request_metrics import request_metrics
+
+    epidemic_id = _create_daily_stats("Metrics Stream", "MST")
+    request_metrics.reset()
+
+    response = test_client.get("/api/v1/daily-stats", params={"epidemic_id": epidemic_id, "format": "ndjson"})
+    assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+
+    metrics = test_client.get("/metrics").text
+    labels = 'method="GET",route="/api/v1/daily-stats",status="200"'
+    assert f'http_request_sql_statements_count{{{labels}}} 1' in metrics
+    sql_sum = next(line for line in metrics.splitlines() if line.startswith(f"http_request_sql_statements_sum{{{labels}}}"))
+    assert float(sql_sum.rsplit(" ", 1)[1]) >= 1
+
+
+def test_daily_stats_update_refreshes_epidemic_totals(test_client):
+    """Test de la mise à jour d'une statistique : totaux de l'épidémie et OverallStats recalculés."""
+    from app.db.models.base import DailyStats, Epidemic, OverallStats
+
+    epidemic_id = _create_daily_stats("Totals", "TOT")
+    db_session = TestingSessionLocal()
+    stat = db_session.query(DailyStats).filter(DailyStats.id_epidemic == epidemic_id).order_by(DailyStats.date).first()
+    payload = {"id_epidemic": epidemic_id, "id_source": stat.id_source, "id_loc": stat.id_loc,
+               "date": "2020-01-01", "cases": 11, "deaths": 1}
+
+    response = test_client.put(f"/api/v1/daily-stats/{stat.id}", json=payload)
+
+    assert response.status_code == 200
+    epidemic = db_session.get(Epidemic, epidemic_id)
+    overall = db_session.query(OverallStats).filter(OverallStats.id_epidemic == epidemic_id).one()
+    assert (epidemic.total_cases, epidemic.total_deaths) == (16, 1)
+    assert (overall.total_cases, overall.total_deaths) == (16, 1)
+    db_session.close()
+
+
+def test_daily_stats_update_refreshes_daily_rollup(test_client):
+    """Test de la mise à jour d'une statistique : cumul quotidien de l'ancienne et de la nouvelle date."""
+    from datetime import date
+    from app.db.models.base import DailyGlobalRollup, DailyStats
+
+    epidemic_id = _create_daily_stats("Rollup", "ROL")
+    db_session = TestingSessionLocal()
+    stat = db_session.query(DailyStats).filter(DailyStats.id_epidemic == epidemic_id).order_by(DailyStats.date).first()
+    db_session.add(DailyGlobalRollup(id_epidemic=epidemic_id, date=date(2020, 1, 1), new_cases=0, new_deaths=0, active=0))
+    db_session.commit()
+    payload = {"id_epidemic": epidemic_id, "id_source": stat.id_source, "id_loc": stat.id_loc,
+               "date": "2020-01-05", "cases": 7, "new_cases": 7, "new_deaths": 2, "active": 5}
+
+    response = test_client.put(f"/api/v1/daily-stats/{stat.id}", json=payload)
+
+    assert response.status_code == 200
+    rollup = db_session.query(DailyGlobalRollup)\
+        .filter(DailyGlobalRollup.id_epidemic == epidemic_id)\
+        .order_by(DailyGlobalRollup.date)\
+        .all()
+    assert [(row.date, row.new_cases, row.new_deaths, row.active) for row in rollup] == [(date(2020, 1, 5), 7, 2, 5)]
+    db_session.close()
+
+
+def test_extract_data_reloads_every_file_by_default(test_client, monkeypatch):
+    """Test de GET /admin/extract-data : rechargement complet sauf demande explicite."""
+    from app.api.endpoints import admin
+    from app.services.etl_jobs import EtlJob
+
+    submitted = []
+
+    def submit(run, params=None):
+        submitted.append(params)
+        return EtlJob(params or {})
+
+    monkeypatch.setattr(admin.etl_jobs, "submit", submit)
+
+    assert test_client.get("/api/v1/admin/extract-data").status_code == 202
+    assert test_client.get("/api/v1/admin/extract-data?incremental=true").status_code == 202
+    assert submitted == [{"incremental": False}, {"incremental": True}]
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app.db.models.base import Base
+from app.db.partitioning import (
+    apply_daily_stats_partitioning,
+    daily_key_includes_source,
+    date_partition_clause,
+    extend_date_partitions_statement,
+    partitioning_statements,
+    truncate_source_partition,
+)
+
+
+def test_date_partition_clause_is_monthly():
+    """Test des partitions mensuelles : p_past, un mois par partition, p_future."""
+    clause = date_partition_clause(date(2020, 1, 22), date(2020, 3, 5))
+
+    assert clause.startswith("PARTITION BY RANGE COLUMNS(date)")
+    assert "PARTITION p_past VALUES LESS THAN ('2020-01-01')" in clause
+    assert "PARTITION p202001 VALUES LESS THAN ('2020-02-01')" in clause
+    assert "PARTITION p202003 VALUES LESS THAN ('2020-04-01')" in clause
+    assert "p202004" not in clause
+    assert clause.rstrip(")\n").endswith("PARTITION p_future VALUES LESS THAN (MAXVALUE")
+
+
+def test_partitioning_statements_respect_mysql_constraints():
+    """Test du DDL : clés étrangères supprimées, colonne de partitionnement dans les clés uniques."""
+    date_statements = partitioning_statements(
+        "date", ["fk_daily_stats_epidemic"], start=date(2020, 1, 1), until=date(2020, 1, 31)
+    )
+    assert date_statements[0] == "ALTER TABLE daily_stats DROP FOREIGN KEY fk_daily_stats_epidemic"
+    assert "ADD PRIMARY KEY (id, date)" in date_statements[1]
+
+    source_statements = partitioning_statements("source", [], source_ids=[3, 1, 3])
+    assert "ADD PRIMARY KEY (id, id_source)" in source_statements[0]
+    assert "idx_unique_daily (id_epidemic, id_loc, date, id_source)" in source_statements[0]
+    assert "PARTITION p_src_1 VALUES IN (1),\n    PARTITION p_src_3 VALUES IN (3)" in source_statements[1]
+
+    with pytest.raises(ValueError):
+        partitioning_statements("hash", [])
+
+
+def test_extend_date_partitions_statement():
+    """Test de l'ajout des mois manquants par découpage de p_future."""
+    names = ["p_past", "p202001", "p202002", "p_future"]
+
+    assert extend_date_partitions_statement(names, date(2020, 2, 10)) is None
+    statement = extend_date_partitions_statement(names, date(2020, 4, 1))
+    assert statement.startswith("ALTER TABLE daily_stats REORGANIZE PARTITION p_future INTO")
+    assert "p202003" in statement and "p202004" in statement
+    assert "p202002" not in statement
+
+
+def test_partitioning_is_noop_outside_mysql(tmp_path, db_session):
+    """Test du mode partitionné sur SQLite : table inchangée, suppression classique."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'partitioning.db'}")
+    Base.metadata.create_all(bind=engine)
+
+    assert apply_daily_stats_partitioning(engine, mode="date") is None
+    assert inspect(engine).get_pk_constraint("daily_stats")["constrained_columns"] == ["id"]
+    assert truncate_source_partition(db_session, epidemic_id=1, source_id=1) is False
+    assert daily_key_includes_source(db_session) is False
+    with pytest.raises(ValueError):
+        apply_daily_stats_partitioning(engine, mode="hash")
+    engine.dispose()
@@ -1,14 +1,20 @@
+import os
+import tempfile
+
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
 from app.main import app
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.db.models.base import Base
 
 # Configuration de la base de données de test
-SQLALCHEMY_DATABASE_URL = "sqlite://"
+# Base SQLite dans un fichier temporaire, partagée par les moteurs synchrone et asynchrone
+SQLALCHEMY_DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{SQLALCHEMY_DATABASE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
@@ -18,6 +24,10 @@ engine = create_engine(
 
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Moteur asynchrone des routes de lecture ; NullPool car chaque requête du TestClient a sa propre boucle
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{SQLALCHEMY_DATABASE_PATH}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Création des tables pour les tests
 Base.metadata.create_all(bind=engine)
 
@@ -28,8 +38,13 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 